@@ -0,0 +1,163 @@
+"""
+Benchmark Runner
+================
+
+Usage::
+
+    python benchmark.py [pattern] [--save] [--strict] [--tolerance=0.25]
+
+The runner reports the number of operations per second and the memory allocated by one operation of each benchmark
+in ``benchmarkcase/bench_*.py``. The result is compared to the baseline stored in ``data/benchmark_baseline.json``
+and the regressions, i.e., the benchmarks slower or allocating more than the tolerance allows, are reported. With
+``--strict``, the runner also exits with the status 1 on any regression.
+
+As the throughput depends on the machine, the baseline is not shipped (see ``.gitignore``). The first run saves its
+result as the baseline of the machine. With ``--save``, the result is stored as the new baseline.
+
+.. note:: The allocation is only measured with Python 3.4+ (``tracemalloc``).
+"""
+
+import gc
+import json
+import logging
+import os
+import sys
+import time
+
+from importlib import import_module
+
+try:
+    import tracemalloc
+except ImportError as exception:
+    tracemalloc = None
+
+import bootstrap
+
+from tori import common
+
+from benchmarkcase import Benchmark
+
+baseline_path = os.path.join(bootstrap.app_path, 'data', 'benchmark_baseline.json')
+case_path     = os.path.join(bootstrap.app_path, 'benchmarkcase')
+
+minimum_round_time = 0.2
+number_of_rounds   = 3
+
+def discover(pattern):
+    for file_name in sorted(os.listdir(case_path)):
+        if not file_name.startswith('bench_') or not file_name.endswith('.py') or pattern not in file_name:
+            continue
+
+        module_name = file_name[:-3]
+        module      = import_module('benchmarkcase.' + module_name)
+
+        for name in sorted(dir(module)):
+            cls = getattr(module, name)
+
+            if not isinstance(cls, type) or not issubclass(cls, Benchmark) or cls is Benchmark:
+                continue
+
+            for method_name in sorted(dir(cls)):
+                if method_name.startswith('bench_'):
+                    yield '{}.{}.{}'.format(module_name, name, method_name[6:]), cls(), method_name
+
+def run_round(case, method, iterations):
+    elapsed = 0
+
+    for i in range(iterations):
+        case.setUp()
+
+        started_at = time.time()
+        method()
+        elapsed   += time.time() - started_at
+
+    return elapsed
+
+def measure_throughput(case, method):
+    iterations = 1
+
+    # Calibrate the number of iterations per round.
+    while run_round(case, method, iterations) < minimum_round_time and iterations < 1000000:
+        iterations *= 2
+
+    best_elapsed = min([run_round(case, method, iterations) for i in range(number_of_rounds)])
+
+    return iterations / best_elapsed
+
+def measure_allocation(case, method):
+    if not tracemalloc:
+        return None
+
+    case.setUp()
+    gc.collect()
+
+    tracemalloc.start()
+
+    method()
+
+    size, peak_size = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    return peak_size
+
+def main(arguments):
+    pattern   = ([argument for argument in arguments if not argument.startswith('--')] or [''])[0]
+    save      = '--save' in arguments or not os.path.exists(baseline_path)
+    strict    = '--strict' in arguments
+    tolerance = 0.25
+
+    for argument in arguments:
+        if argument.startswith('--tolerance='):
+            tolerance = float(argument.split('=', 1)[1])
+
+    baseline = {}
+    results  = {}
+    failures = []
+
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as fp:
+            baseline = json.load(fp)
+
+    print('{:<60} {:>14} {:>14}  {}'.format('Benchmark', 'ops/sec', 'peak bytes', 'vs baseline'))
+
+    for name, case, method_name in discover(pattern):
+        method     = getattr(case, method_name)
+        throughput = measure_throughput(case, method)
+        allocation = measure_allocation(case, method)
+        comparison = ''
+
+        results[name] = {'ops': throughput, 'allocation': allocation}
+
+        if name in baseline:
+            expected    = baseline[name]
+            speed_ratio = throughput / expected['ops']
+            comparison  = '{:+.1f}%'.format((speed_ratio - 1) * 100)
+
+            if speed_ratio < 1 - tolerance:
+                failures.append('{} is slower ({:.1f} ops/sec expected)'.format(name, expected['ops']))
+
+            if allocation and expected['allocation'] and allocation > expected['allocation'] * (1 + tolerance):
+                failures.append('{} allocates more ({} bytes expected)'.format(name, expected['allocation']))
+
+        print('{:<60} {:>14.1f} {:>14}  {}'.format(name, throughput, allocation or 'n/a', comparison))
+
+    if save:
+        baseline.update(results)
+
+        with open(baseline_path, 'w') as fp:
+            json.dump(baseline, fp, indent=4, sort_keys=True)
+
+        print('Saved the baseline to {}'.format(baseline_path))
+
+        return 0
+
+    for failure in failures:
+        print('REGRESSION: ' + failure)
+
+    return 1 if failures and strict else 0
+
+if __name__ == '__main__':
+    common.default_logging_level = logging.ERROR
+
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,14 @@
+"""
+Benchmark Cases
+===============
+
+Each module ``bench_*.py`` in this package contains subclasses of :class:`Benchmark`. Every method prefixed with
+``bench_`` is a benchmark where ``setUp`` is called before each iteration and is not included in the measurement.
+
+The database benchmarks use :class:`tori.db.mochi.Mochi` instead of MongoDB so that they are reproducible without
+any network.
+"""
+
+class Benchmark(object):
+    def setUp(self):
+        pass
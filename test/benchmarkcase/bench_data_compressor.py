@@ -0,0 +1,16 @@
+import codecs
+import os
+
+import bootstrap
+
+from tori.data.compressor import minify_css
+
+from benchmarkcase import Benchmark
+
+class CompressorBenchmark(Benchmark):
+    def __init__(self):
+        with codecs.open(os.path.join(bootstrap.app_path, 'data', 'test.css'), 'r', 'utf-8') as fp:
+            self.stylesheet = fp.read()
+
+    def bench_minify_css(self):
+        minify_css(self.stylesheet)
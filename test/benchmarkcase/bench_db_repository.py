@@ -0,0 +1,54 @@
+from tori.db.common import ProxyFactory
+from tori.db.entity import entity
+from tori.db.mapper import link, AssociationType, CascadingType
+from tori.db.mochi import Mochi
+from tori.db.session import Session
+
+from benchmarkcase import Benchmark
+
+number_of_records = 100
+
+@entity('bench_repository_tags')
+class Tag(object):
+    def __init__(self, name):
+        self.name = name
+
+@link('tags', Tag, association=AssociationType.MANY_TO_MANY, cascading=[CascadingType.PERSIST])
+@entity('bench_repository_posts')
+class Post(object):
+    def __init__(self, title, tags=[]):
+        self.title = title
+        self.tags  = tags
+
+registered_types = {
+    'bench_repository_tags':  Tag,
+    'bench_repository_posts': Post
+}
+
+# Prepare the shared data set once.
+database = Mochi()['benchmark']
+
+Session(0, database, dict(registered_types)).collection(Post).post(
+    Post('post', [Tag('tag {}'.format(i)) for i in range(number_of_records)])
+)
+
+class RepositoryBenchmark(Benchmark):
+    def setUp(self):
+        self.session = Session(0, database, dict(registered_types))
+
+        self.posts = self.session.collection(Post)
+        self.tags  = self.session.collection(Tag)
+
+    def bench_find_hydration(self):
+        self.tags.find(self.tags.new_criteria())
+
+    def bench_proxy_dereference(self):
+        guide = Post.__relational_map__['tags']
+
+        for tag_id in database['bench_repository_tags']:
+            ProxyFactory.make(self.session, tag_id, guide).name
+
+    def bench_many_to_many_loading(self):
+        post = self.posts.filter_one({'title': 'post'})
+
+        len(post.tags)
@@ -0,0 +1,48 @@
+from bson import ObjectId
+from tori.db.common import Serializer
+from tori.db.entity import entity
+
+from benchmarkcase import Benchmark
+
+@entity('bench_wide_entities')
+class WideEntity(object):
+    def __init__(self, **attributes):
+        for name in attributes:
+            self.__setattr__(name, attributes[name])
+
+@entity('bench_deep_entities')
+class DeepEntity(object):
+    def __init__(self, name, tree, references):
+        self.name       = name
+        self.tree       = tree
+        self.references = references
+
+def make_tree(depth, width):
+    if not depth:
+        return 'leaf'
+
+    return dict([('node{}'.format(i), [make_tree(depth - 1, width)]) for i in range(width)])
+
+class SerializerBenchmark(Benchmark):
+    def __init__(self):
+        self.serializer = Serializer(0)
+
+        self.wide_entity    = WideEntity(**dict([('attribute{}'.format(i), i) for i in range(100)]))
+        self.wide_entity.id = ObjectId()
+
+        references = []
+
+        for i in range(50):
+            reference    = WideEntity(name=i)
+            reference.id = ObjectId()
+
+            references.append(reference)
+
+        self.deep_entity    = DeepEntity('deep', make_tree(4, 4), references)
+        self.deep_entity.id = ObjectId()
+
+    def bench_encode_wide(self):
+        self.serializer.encode(self.wide_entity)
+
+    def bench_encode_deep(self):
+        self.serializer.encode(self.deep_entity)
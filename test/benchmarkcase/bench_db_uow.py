@@ -0,0 +1,107 @@
+from tori.db.entity import entity
+from tori.db.mapper import link, AssociationType, CascadingType
+from tori.db.mochi import Mochi
+from tori.db.session import Session
+
+from benchmarkcase import Benchmark
+
+number_of_records = 100
+
+@link('next', association=AssociationType.ONE_TO_ONE, cascading=[CascadingType.PERSIST])
+@entity('bench_uow_nodes')
+class Node(object):
+    def __init__(self, name, next=None):
+        self.name = name
+        self.next = next
+
+@entity('bench_uow_leaves')
+class Leaf(object):
+    def __init__(self, name, weight=0):
+        self.name   = name
+        self.weight = weight
+
+@link('leaves', Leaf, association=AssociationType.ONE_TO_MANY, cascading=[CascadingType.PERSIST])
+@entity('bench_uow_hubs')
+class Hub(object):
+    def __init__(self, name, leaves=[]):
+        self.name   = name
+        self.leaves = leaves
+
+registered_types = {
+    'bench_uow_nodes':  Node,
+    'bench_uow_leaves': Leaf,
+    'bench_uow_hubs':   Hub
+}
+
+class CommitBenchmark(Benchmark):
+    """ UnitOfWork.commit with the different statuses and shapes of graphs """
+    def setUp(self):
+        self.database = Mochi()['benchmark']
+        self.session  = Session(0, self.database, dict(registered_types))
+
+    def _load_leaves(self):
+        self.database['bench_uow_leaves'].insert([
+            {'name': 'leaf {}'.format(i), 'weight': i}
+            for i in range(number_of_records)
+        ])
+
+        return self.session.collection(Leaf).filter()
+
+class NewRecordBenchmark(CommitBenchmark):
+    def bench_commit_new_flat(self):
+        self.session.persist(*[Leaf('leaf {}'.format(i)) for i in range(number_of_records)])
+        self.session.flush()
+
+    def bench_commit_new_chain(self):
+        node = None
+
+        for i in range(number_of_records):
+            node = Node('node {}'.format(i), node)
+
+        self.session.persist(node)
+        self.session.flush()
+
+    def bench_commit_new_star(self):
+        hub = Hub('hub', [Leaf('leaf {}'.format(i)) for i in range(number_of_records)])
+
+        self.session.persist(hub)
+        self.session.flush()
+
+class DirtyRecordBenchmark(CommitBenchmark):
+    def setUp(self):
+        CommitBenchmark.setUp(self)
+
+        for leaf in self._load_leaves():
+            leaf.weight += 1
+
+            self.session.persist(leaf)
+
+    def bench_commit_dirty(self):
+        self.session.flush()
+
+class DeletedRecordBenchmark(CommitBenchmark):
+    def setUp(self):
+        CommitBenchmark.setUp(self)
+
+        self.session.delete(*self._load_leaves())
+
+    def bench_commit_deleted(self):
+        self.session.flush()
+
+class ChangeSetBenchmark(CommitBenchmark):
+    def setUp(self):
+        CommitBenchmark.setUp(self)
+
+        self.database['bench_uow_leaves'].insert({'name': 'leaf', 'weight': 0})
+
+        leaf = self.session.collection(Leaf).filter_one({'name': 'leaf'})
+
+        leaf.weight = 1
+        leaf.extra  = 'extra'
+
+        self.session.persist(leaf)
+
+        self.record = self.session._uow.retrieve_record(leaf)
+
+    def bench_compute_change_set(self):
+        self.session._uow._compute_change_set(self.record)
@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from tori.cache.memory import Memory
+
+class TestCacheMemory(TestCase):
+    def test_size_bound(self):
+        cache = Memory(max_size=10)
+
+        cache.set('a', b'12345')
+        cache.set('b', b'12345')
+
+        self.assertEqual(10, cache.size)
+
+        # "a" becomes the most recently used.
+        self.assertEqual(b'12345', cache.get('a'))
+
+        cache.set('c', b'123')
+
+        self.assertTrue(cache.has('a'))
+        self.assertFalse(cache.has('b'))
+        self.assertTrue(cache.has('c'))
+        self.assertEqual(8, cache.size)
+
+        # The data larger than the limit is not cached at all.
+        cache.set('d', b'12345678901')
+
+        self.assertFalse(cache.has('d'))
+        self.assertEqual(8, cache.size)
+
+    def test_count_bound(self):
+        cache = Memory(max_count=2)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(2, cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_replace_and_delete(self):
+        cache = Memory()
+
+        cache.set('a', b'123')
+        cache.set('a', b'12', size=5)
+
+        self.assertEqual(5, cache.size)
+
+        cache.delete('a')
+        cache.delete('unknown')
+
+        self.assertEqual(0, cache.size)
+        self.assertEqual('default', cache.get('a', 'default'))
+
+    def test_ttl(self):
+        cache = Memory()
+
+        with patch('tori.cache.memory.time', return_value=100):
+            cache.set('a', 'page', ttl=10)
+            cache.set('b', 'page')
+
+        with patch('tori.cache.memory.time', return_value=109):
+            self.assertEqual('page', cache.get('a'))
+
+        with patch('tori.cache.memory.time', return_value=110):
+            self.assertFalse(cache.has('a'))
+            self.assertEqual(None, cache.get('a'))
+            self.assertEqual('page', cache.get('b'))
+
+        self.assertEqual(4, cache.size)
+
+    def test_invalidate(self):
+        cache = Memory()
+
+        cache.set('a', 'news', tags=['news'])
+        cache.set('b', 'news and sports', tags=['news', 'sports'])
+        cache.set('c', 'sports', tags=['sports'])
+
+        cache.invalidate('news')
+
+        self.assertFalse(cache.has('a'))
+        self.assertFalse(cache.has('b'))
+        self.assertTrue(cache.has('c'))
+
+        cache.invalidate('sports')
+        cache.invalidate('unknown')
+
+        self.assertFalse(cache.has('c'))
+        self.assertEqual(0, cache.size)
+
+    def test_statistics(self):
+        cache = Memory(max_count=1)
+
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.set('b', 2)
+
+        self.assertEqual(
+            {'hits': 1, 'misses': 1, 'evictions': 1, 'count': 1, 'size': cache.size},
+            cache.statistics
+        )
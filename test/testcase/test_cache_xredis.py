@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+try:
+    from unittest.mock import MagicMock, call
+except ImportError:
+    from mock import MagicMock, call
+
+from tori.cache.xredis import Redis
+from tori.exception    import InvalidInput
+
+class TestCacheRedis(TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.cache  = Redis(redis_client=self.client, scan_count=2)
+
+        # The first pipeline reads the tag sets and the second one writes.
+        self.reader = MagicMock()
+        self.writer = MagicMock()
+
+        self.client.pipeline.side_effect = [self.reader, self.writer]
+
+    def test_raw_content(self):
+        self.client.pipeline.side_effect  = None
+        self.client.pipeline.return_value = self.writer
+
+        self.cache.set('page', u'<p>é</p>')
+
+        self.writer.set.assert_called_once_with('tori/cache/data/page', b'u<p>\xc3\xa9</p>')
+
+        self.client.get.return_value = b'u<p>\xc3\xa9</p>'
+
+        self.assertEqual(u'<p>é</p>', self.cache.get('page'))
+
+        self.client.get.return_value = b'b\x00\x01'
+
+        self.assertEqual(b'\x00\x01', self.cache.get('page'))
+
+        self.client.get.return_value = None
+
+        self.assertEqual('x', self.cache.get('page', 'x'))
+        self.assertEqual({'hits': 2, 'misses': 1, 'evictions': 0}, self.cache.statistics)
+
+        # Anything else would need a serializer.
+        self.assertRaises(InvalidInput, self.cache.set, 'page', {'a': 1})
+
+    def test_tag_lifespan(self):
+        # "new" does not exist, "short" expires sooner, "long" later and "forever" never.
+        self.reader.execute.return_value = [False, -2, True, 10, True, 120, True, -1]
+
+        self.cache.set('page', 'content', ttl=60, tags=['new', 'short', 'long', 'forever'])
+
+        self.assertEqual(
+            [
+                call.set('tori/cache/data/page', b'ucontent'),
+                call.expire('tori/cache/data/page', 60),
+                call.sadd('tori/cache/tag/new', 'tori/cache/data/page'),
+                call.expire('tori/cache/tag/new', 60),
+                call.sadd('tori/cache/tag/short', 'tori/cache/data/page'),
+                call.expire('tori/cache/tag/short', 60),
+                call.sadd('tori/cache/tag/long', 'tori/cache/data/page'),
+                call.sadd('tori/cache/tag/forever', 'tori/cache/data/page'),
+                call.execute()
+            ],
+            self.writer.mock_calls
+        )
+
+    def test_tag_without_ttl(self):
+        self.client.pipeline.side_effect  = None
+        self.client.pipeline.return_value = self.writer
+
+        self.cache.set('page', 'content', tags=['news'])
+
+        self.assertEqual(
+            [
+                call.set('tori/cache/data/page', b'ucontent'),
+                call.sadd('tori/cache/tag/news', 'tori/cache/data/page'),
+                call.persist('tori/cache/tag/news'),
+                call.execute()
+            ],
+            self.writer.mock_calls
+        )
+
+    def test_clear_with_scan(self):
+        self.client.scan_iter.return_value = iter(['tori/cache/data/a', 'tori/cache/data/b', 'tori/cache/tag/c'])
+
+        self.cache.clear()
+
+        self.client.scan_iter.assert_called_once_with(match='tori/cache/*', count=2)
+        self.assertEqual(
+            [call('tori/cache/data/a', 'tori/cache/data/b'), call('tori/cache/tag/c')],
+            self.client.delete.call_args_list
+        )
+        self.assertFalse(self.client.keys.called)
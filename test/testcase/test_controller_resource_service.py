@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+import datetime
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from tori.cache.memory    import Memory
+from tori.controller      import ResourceService
+from tori.data.base       import ResourceEntity
+from tori.data.compressor import CSSCompressor, JSCompressor
+
+class FakeRequest(object):
+    def __init__(self, headers=None):
+        self.uri     = '/resources/test'
+        self.headers = headers or {}
+
+class HeaderRecordingResourceService(ResourceService):
+    """ Resource service without the connection """
+    def __init__(self, resource=None, headers=None):
+        self.request  = FakeRequest(headers)
+        self.resource = resource
+        self.headers  = {}
+        self.status   = 200
+        self.body     = None
+        self.finished = False
+
+    def _retrieve_resource_entity(self):
+        return self.resource
+
+    def set_header(self, name, value):
+        self.headers[name] = value
+
+    def set_status(self, status_code):
+        self.status = status_code
+
+    def finish(self, chunk=None):
+        self.body     = chunk
+        self.finished = True
+
+class TestControllerResourceService(TestCase):
+    def setUp(self):
+        self.service = HeaderRecordingResourceService()
+
+    def test_head_of_transformed_content(self):
+        self.service._finish_content(u'a{content:"é"}', False)
+
+        self.assertTrue(self.service.finished)
+        self.assertEqual(None, self.service.body)
+        self.assertEqual(15, self.service.headers['Content-Length']) # in UTF-8
+
+    def test_get_of_transformed_content(self):
+        self.service._finish_content(b'a{color:red}', True)
+
+        self.assertEqual(b'a{color:red}', self.service.body)
+        self.assertFalse('Content-Length' in self.service.headers)
+
+    def test_plugin_fingerprint(self):
+        css = self.service._fingerprint_plugins([CSSCompressor()])
+
+        # The fingerprint only depends on the classes of the plugins and their order.
+        self.assertEqual(css, self.service._fingerprint_plugins([CSSCompressor()]))
+        self.assertNotEqual(css, self.service._fingerprint_plugins([CSSCompressor(), JSCompressor()]))
+        self.assertNotEqual(
+            self.service._fingerprint_plugins([CSSCompressor(), JSCompressor()]),
+            self.service._fingerprint_plugins([JSCompressor(), CSSCompressor()])
+        )
+
+class TestControllerResourceServiceValidation(TestCase):
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.path      = os.path.join(self.base_path, 'note.txt')
+
+        with open(self.path, 'wb') as f:
+            f.write(b'0123456789')
+
+        self.resource       = ResourceEntity(self.path)
+        self.original_state = (ResourceService._plugins, ResourceService._plugins_registered, ResourceService._cache)
+
+        ResourceService._plugins            = []
+        ResourceService._plugins_registered = True
+        ResourceService._cache              = Memory()
+
+    def tearDown(self):
+        ResourceService._plugins, ResourceService._plugins_registered, ResourceService._cache = self.original_state
+
+        shutil.rmtree(self.base_path)
+
+    def serve(self, include_body=True, **headers):
+        service = HeaderRecordingResourceService(self.resource, headers)
+
+        service._serve(include_body)
+
+        return service
+
+    def test_parse_byte_range(self):
+        parse = ResourceService._parse_byte_range
+
+        self.assertEqual((2, 5), parse('bytes=2-5', 10))
+        self.assertEqual((2, 9), parse('bytes=2-20', 10))
+
+        # Open-ended
+        self.assertEqual((7, 9), parse('bytes=7-', 10))
+
+        # Suffix
+        self.assertEqual((7, 9), parse('bytes=-3', 10))
+        self.assertEqual((0, 9), parse('bytes=-30', 10))
+
+        # Unsatisfiable
+        self.assertFalse(parse('bytes=10-', 10))
+        self.assertFalse(parse('bytes=-0', 10))
+        self.assertFalse(parse('bytes=-3', 0))
+
+        # The whole content is sent for multiple, invalid or unknown ranges.
+        self.assertEqual(None, parse('bytes=0-1,5-6', 10))
+        self.assertEqual(None, parse('bytes=5-2', 10))
+        self.assertEqual(None, parse('bytes=a-b', 10))
+        self.assertEqual(None, parse('items=0-1', 10))
+        self.assertEqual(None, parse(None, 10))
+
+    def test_is_not_modified_with_entity_tag(self):
+        etag          = '"a-1"'
+        last_modified = datetime.datetime(2013, 1, 1)
+
+        for value, expected in [
+            ('"a-1"', True),
+            ('"b-2", "a-1"', True),
+            ('W/"a-1"', True),
+            ('*', True),
+            ('"b-2"', False),
+        ]:
+            service = HeaderRecordingResourceService(headers={'If-None-Match': value})
+
+            self.assertEqual(expected, service._is_not_modified(etag, last_modified), value)
+
+        # If-None-Match takes precedence over If-Modified-Since.
+        service = HeaderRecordingResourceService(headers={
+            'If-None-Match':     '"b-2"',
+            'If-Modified-Since': 'Wed, 02 Jan 2013 00:00:00 GMT'
+        })
+
+        self.assertFalse(service._is_not_modified(etag, last_modified))
+
+    def test_is_not_modified_since(self):
+        last_modified = datetime.datetime(2013, 1, 1, 12, 0, 0)
+
+        for value, expected in [
+            ('Tue, 01 Jan 2013 12:00:00 GMT', True),
+            ('Wed, 02 Jan 2013 00:00:00 GMT', True),
+            ('Tue, 01 Jan 2013 11:59:59 GMT', False),
+            ('yesterday', False),
+        ]:
+            service = HeaderRecordingResourceService(headers={'If-Modified-Since': value})
+
+            self.assertEqual(expected, service._is_not_modified('"a-1"', last_modified), value)
+
+        self.assertFalse(HeaderRecordingResourceService()._is_not_modified('"a-1"', last_modified))
+
+    def test_serve_whole_content(self):
+        service = self.serve()
+
+        self.assertEqual(200, service.status)
+        self.assertEqual(b'0123456789', service.body)
+        self.assertEqual(10, service.headers['Content-Length'])
+        self.assertEqual('bytes', service.headers['Accept-Ranges'])
+
+    def test_serve_partial_content(self):
+        service = self.serve(Range='bytes=-3')
+
+        self.assertEqual(206, service.status)
+        self.assertEqual(b'789', service.body)
+        self.assertEqual('bytes 7-9/10', service.headers['Content-Range'])
+        self.assertEqual(3, service.headers['Content-Length'])
+
+        service = self.serve(False, Range='bytes=2-5')
+
+        self.assertEqual(206, service.status)
+        self.assertEqual(None, service.body)
+        self.assertEqual('bytes 2-5/10', service.headers['Content-Range'])
+        self.assertEqual(4, service.headers['Content-Length'])
+
+    def test_serve_unsatisfiable_range(self):
+        service = self.serve(Range='bytes=10-')
+
+        self.assertEqual(416, service.status)
+        self.assertEqual(None, service.body)
+        self.assertEqual('bytes */10', service.headers['Content-Range'])
+
+    def test_serve_not_modified(self):
+        etag = self.serve().headers['Etag']
+
+        service = self.serve(**{'If-None-Match': etag, 'Range': 'bytes=2-5'})
+
+        self.assertEqual(304, service.status)
+        self.assertEqual(None, service.body)
+        self.assertTrue(service.finished)
+        self.assertEqual(etag, service.headers['Etag'])
+        self.assertFalse('Content-Range' in service.headers)
+
+class TestControllerResourceServiceEncoding(TestCase):
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.path      = os.path.join(self.base_path, 'main.css')
+        self.content   = b'a { color: red; }\n' * 32
+
+        with open(self.path, 'wb') as f:
+            f.write(self.content)
+
+        os.utime(self.path, (1357041600, 1357041600))
+
+        self.resource       = ResourceEntity(self.path, True)
+        self.original_state = (ResourceService._plugins, ResourceService._plugins_registered, ResourceService._cache)
+
+        ResourceService._plugins            = []
+        ResourceService._plugins_registered = True
+        ResourceService._cache              = Memory()
+
+    def tearDown(self):
+        ResourceService._plugins, ResourceService._plugins_registered, ResourceService._cache = self.original_state
+
+        shutil.rmtree(self.base_path)
+
+    def create_service(self, accept_encoding=None):
+        headers = {'Accept-Encoding': accept_encoding} if accept_encoding is not None else {}
+        service = HeaderRecordingResourceService(self.resource, headers)
+
+        # The encoder of Brotli is optional.
+        service._encodings = dict(ResourceService._encodings)
+        service._encodings['br'] = ('.br', lambda content: b'br:' + content)
+
+        return service
+
+    def create_sibling(self, modified_time):
+        sibling_path = self.path + '.gz'
+
+        with open(sibling_path, 'wb') as f:
+            f.write(b'precompressed')
+
+        os.utime(sibling_path, (modified_time, modified_time))
+
+    def test_select_encoding(self):
+        for accept_encoding, expected in [
+            ('', None),
+            ('identity', None),
+            ('gzip', 'gzip'),
+            ('GZIP, deflate', 'gzip'),
+            ('gzip;q=0.5', 'gzip'),
+            ('gzip; q=0.001', 'gzip'),
+            ('gzip;q=0', None),
+            ('gzip; q=0.0, deflate', None),
+            ('gzip;q=high', None),
+            # The server prefers Brotli to gzip whenever both are acceptable.
+            ('gzip, br', 'br'),
+            ('gzip;q=1.0, br;q=0.1', 'br'),
+            ('gzip, br;q=0', 'gzip'),
+        ]:
+            self.assertEqual(expected, self.create_service(accept_encoding)._select_encoding(), accept_encoding)
+
+        # Without the encoder, Brotli is never selected.
+        service = self.create_service('br, gzip')
+
+        del service._encodings['br']
+
+        self.assertEqual('gzip', service._select_encoding())
+
+    def test_serve_encoded_content(self):
+        identity_etag = self.create_service()._get_validators(self.path)[1]
+
+        service = self.create_service('gzip')
+        service._serve(True)
+
+        self.assertEqual('gzip', service.headers['Content-Encoding'])
+        self.assertEqual('Accept-Encoding', service.headers['Vary'])
+        self.assertEqual('"%s-gzip"' % identity_etag[1:-1], service.headers['Etag'])
+        self.assertEqual(self.content, gzip.GzipFile(fileobj=io.BytesIO(service.body)).read())
+
+        service = self.create_service('br')
+        service._serve(True)
+
+        self.assertEqual('br', service.headers['Content-Encoding'])
+        self.assertEqual('"%s-br"' % identity_etag[1:-1], service.headers['Etag'])
+        self.assertEqual(b'br:' + self.content, service.body)
+
+        # The identity representation varies with the header too.
+        service = self.create_service()
+        service._serve(True)
+
+        self.assertFalse('Content-Encoding' in service.headers)
+        self.assertEqual('Accept-Encoding', service.headers['Vary'])
+        self.assertEqual(identity_etag, service.headers['Etag'])
+        self.assertEqual(self.content, service.body)
+
+    def test_not_modified_per_encoding(self):
+        etag = self.create_service('gzip')._get_validators(self.path)[1]
+
+        service = HeaderRecordingResourceService(self.resource, {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        service._serve(True)
+
+        # The entity tag of the identity content does not validate the encoded one.
+        self.assertEqual(200, service.status)
+
+        service = HeaderRecordingResourceService(self.resource, {
+            'Accept-Encoding': 'gzip',
+            'If-None-Match':   service.headers['Etag']
+        })
+        service._serve(True)
+
+        self.assertEqual(304, service.status)
+        self.assertEqual(None, service.body)
+
+    def test_up_to_date_precompressed_sibling(self):
+        self.create_sibling(1357041600)
+
+        service = self.create_service('gzip')
+        service._serve(True)
+
+        self.assertEqual(b'precompressed', service.body)
+        self.assertEqual('gzip', service.headers['Content-Encoding'])
+
+    def test_outdated_precompressed_sibling(self):
+        self.create_sibling(1357041599)
+
+        service = self.create_service('gzip')
+        service._serve(True)
+
+        self.assertEqual(self.content, gzip.GzipFile(fileobj=io.BytesIO(service.body)).read())
+
+    def test_load_encoded_content_once(self):
+        service = self.create_service('gzip')
+        etag    = service._get_validators(self.path)[1]
+        content = service._load_encoded_content(self.resource, [], etag, 'gzip')
+
+        # The sibling created afterwards is not used until the file is modified.
+        self.create_sibling(1357041600)
+
+        self.assertEqual(content, service._load_encoded_content(self.resource, [], etag, 'gzip'))
+        self.assertEqual(b'precompressed', service._load_encoded_content(self.resource, [], '"modified"', 'gzip'))
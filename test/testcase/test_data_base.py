@@ -0,0 +1,23 @@
+import gzip
+import unittest
+
+from io import BytesIO
+
+from tori.data.base import ResourceEntity, compress_with_gzip
+
+class TestDataBase(unittest.TestCase):
+    def test_compress_with_gzip(self):
+        content    = b'body { color: #fff; }\n' * 100
+        compressed = compress_with_gzip(content)
+
+        self.assertTrue(len(compressed) < len(content))
+        self.assertEqual(compressed, compress_with_gzip(content), 'The output should be deterministic.')
+
+        with gzip.GzipFile(fileobj=BytesIO(compressed)) as f:
+            self.assertEqual(content, f.read())
+
+    def test_resource_entity(self):
+        entity = ResourceEntity('data/test.css')
+
+        self.assertTrue(entity.exists)
+        self.assertEqual('text/css', entity.kind)
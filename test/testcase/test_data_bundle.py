@@ -0,0 +1,38 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from tori.data.bundle     import AssetManifest, Bundle
+from tori.data.compressor import CSSCompressor
+
+class TestDataBundle(unittest.TestCase):
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+
+        os.makedirs(os.path.join(self.base_path, 'css'))
+
+        for name, content in [('reset.css', 'a {\n  color : red;\n}\n'), ('main.css', 'b {\n  margin : 0;\n}\n')]:
+            with open(os.path.join(self.base_path, 'css', name), 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_path)
+
+    def test_build(self):
+        bundle = Bundle('app.css', self.base_path, ['css/reset.css', 'css/main.css'], 'bundles', '/static/')
+
+        self.assertEqual('/static/bundles/app.css', bundle.url)
+
+        fingerprinted_url = bundle.build([CSSCompressor()])
+
+        self.assertTrue(re.match('^/static/bundles/app\\.[0-9a-f]{10}\\.css$', fingerprinted_url))
+        self.assertEqual(fingerprinted_url, AssetManifest.instance().get('/static/bundles/app.css'))
+        self.assertEqual('/static/unknown.css', AssetManifest.instance().get('/static/unknown.css'))
+
+        with open(os.path.join(self.base_path, 'bundles', fingerprinted_url.split('/')[-1])) as f:
+            self.assertEqual('a{color:red}b{margin:0}', f.read())
+
+        # The fingerprint only depends on the content.
+        self.assertEqual(fingerprinted_url, bundle.build([CSSCompressor()]))
@@ -0,0 +1,149 @@
+import base64
+
+from unittest import TestCase
+
+try:
+    from unittest.mock import Mock, MagicMock, patch # Python 3.3
+except ImportError as exception:
+    from mock import Mock, MagicMock, patch # Python 2.7
+
+from collections import OrderedDict
+from bson import ObjectId
+from tori.db.criteria import Criteria, Order, QueryPlan
+from tori.db.exception import InvalidKeysetToken
+from tori.db.inspector import QueryInspector
+
+class TestDbCriteria(TestCase):
+    def test_legacy_plan_with_collection_scan(self):
+        plan = QueryPlan({
+            'cursor':          'BasicCursor',
+            'n':               2,
+            'nscanned':        1000,
+            'nscannedObjects': 1000,
+            'scanAndOrder':    True,
+            'millis':          12
+        })
+
+        self.assertFalse(plan.uses_index)
+        self.assertTrue(plan.sorted_in_memory)
+        self.assertEqual(1000, plan.scanned_documents)
+        self.assertEqual(2, plan.returned_documents)
+        self.assertEqual(0.002, plan.efficiency)
+        self.assertEqual('COLLECTION SCAN SCANNED 1000 KEYS SCANNED 1000 DOCUMENTS RETURNED 2 DOCUMENTS SORTED IN MEMORY IN 12 MS', str(plan))
+
+    def test_legacy_plan_with_index(self):
+        plan = QueryPlan({'cursor': 'BtreeCursor name_1', 'n': 1, 'nscanned': 1, 'nscannedObjects': 1, 'millis': 0})
+
+        self.assertTrue(plan.uses_index)
+        self.assertEqual('name_1', plan.index_name)
+        self.assertFalse(plan.sorted_in_memory)
+
+    def test_query_planner_plan(self):
+        plan = QueryPlan({
+            'queryPlanner': {
+                'winningPlan': {
+                    'stage': 'SORT',
+                    'inputStage': {
+                        'stage': 'FETCH',
+                        'inputStage': {'stage': 'IXSCAN', 'indexName': 'name_1'}
+                    }
+                }
+            },
+            'executionStats': {
+                'nReturned':           3,
+                'totalKeysExamined':   3,
+                'totalDocsExamined':   3,
+                'executionTimeMillis': 1
+            }
+        })
+
+        self.assertEqual('name_1', plan.index_name)
+        self.assertTrue(plan.sorted_in_memory)
+        self.assertEqual(3, plan.returned_documents)
+
+    def test_shape_ignores_values(self):
+        a = Criteria({'name': 'a', 'age': 1}, {'name': Order.ASC})
+        b = Criteria({'age': 2, 'name': 'b'}, {'name': Order.DESC})
+
+        self.assertEqual(a.shape, b.shape)
+
+    def test_inspector_explains_each_shape_once(self):
+        repository = MagicMock()
+        repository.name = 'dummy'
+        repository.api.find.return_value.explain.return_value = {'cursor': 'BasicCursor', 'n': 0}
+
+        inspector = QueryInspector(slow_threshold=1000)
+
+        inspector.inspect(repository, Criteria({'name': 'a'}), 1)
+        inspector.inspect(repository, Criteria({'name': 'b'}), 1)
+
+        self.assertEqual(1, repository.api.find.return_value.explain.call_count)
+        self.assertFalse(inspector.explained_plans['dummy/name/'].uses_index)
+
+    def test_inspector_skips_full_scan(self):
+        repository = MagicMock()
+        repository.name = 'dummy'
+
+        inspector = QueryInspector(slow_threshold=1000)
+
+        inspector.inspect(repository, Criteria(), 1)
+
+        self.assertFalse(repository.api.find.called)
+
+    def test_first_page_is_ordered_by_id(self):
+        criteria = Criteria({'active': True}, {'name': Order.DESC}, offset=10, limit=20).after()
+
+        self.assertEqual({'active': True}, criteria.condition)
+        self.assertEqual([('name', Order.DESC), ('_id', Order.DESC)], criteria.ordering_sequence)
+        self.assertEqual(0, criteria.offset)
+        self.assertEqual(20, criteria.limit)
+
+    def test_keyset_token_round_trip(self):
+        object_id = ObjectId()
+        criteria  = Criteria({'active': True}, OrderedDict([('name', Order.ASC), ('age', Order.DESC)]), limit=20)
+        token     = criteria.keyset_token({'_id': object_id, 'name': 'a', 'age': 3, 'active': True})
+
+        next_criteria = criteria.after(token)
+
+        self.assertEqual(
+            {
+                '$and': [
+                    {'active': True},
+                    {
+                        '$or': [
+                            {'name': {'$gt': 'a'}},
+                            {'name': 'a', '$or': [{'age': {'$lt': 3}}, {'age': None}]},
+                            {'name': 'a', 'age': 3, '_id': {'$lt': object_id}}
+                        ]
+                    }
+                ]
+            },
+            next_criteria.condition
+        )
+
+    def test_keyset_token_for_another_ordering(self):
+        token = Criteria(order_by={'name': Order.ASC}).keyset_token({'_id': 1, 'name': 'a'})
+
+        with self.assertRaises(InvalidKeysetToken):
+            Criteria().after(token)
+
+        with self.assertRaises(InvalidKeysetToken):
+            Criteria().after('not a token')
+
+        # Well-formed but not a list of the values
+        with self.assertRaises(InvalidKeysetToken):
+            Criteria().after(base64.urlsafe_b64encode(b'1').decode('ascii'))
+
+    def test_keyset_token_with_null(self):
+        criteria = Criteria(order_by=OrderedDict([('name', Order.ASC), ('age', Order.DESC)]))
+        token    = criteria.keyset_token({'_id': 1})
+
+        self.assertEqual(
+            {
+                '$or': [
+                    {'name': {'$ne': None}},
+                    {'name': None, 'age': None, '_id': {'$lt': 1}}
+                ]
+            },
+            criteria.after(token).condition
+        )
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import Mock # Python 3.3
+except ImportError as exception:
+    from mock import Mock # Python 2.7
+
+from tori.db import instrument
+from tori.db.entity import entity
+from tori.db.mochi import Mochi
+from tori.db.session import Session
+
+@entity('test_tori_db_instrument')
+class Note(object):
+    def __init__(self, content):
+        self.content = content
+
+class TestDbInstrument(TestCase):
+    def setUp(self):
+        self.session    = Session(0, Mochi()['test'], {'test_tori_db_instrument': Note})
+        self.repository = self.session.collection(Note)
+
+    def tearDown(self):
+        instrument.deactivate()
+
+    def test_session_profile(self):
+        self.session.persist(Note('a'), Note('b'))
+        self.session.flush()
+
+        profile = self.session.profile
+
+        self.assertEqual(1, profile.count('commit'))
+        self.assertEqual(2, profile.count('commit.graph')) # entities and associations
+        self.assertEqual(2, profile.count('commit.order'))
+        self.assertEqual(2, profile.count('commit.change_set'))
+        self.assertEqual(2, profile.count('commit.synchronize'))
+        self.assertEqual(1, profile.count('commit.records'))
+        self.assertEqual(2, profile.query_count)
+
+        self.repository.find(self.repository.new_criteria())
+        self.repository.count(self.repository.new_criteria())
+
+        self.assertEqual(1, profile.count('repository.find'))
+        self.assertEqual(1, profile.count('repository.count'))
+        self.assertEqual(4, profile.query_count)
+        self.assertTrue(profile.query_time >= 0)
+
+    def test_active_profile_and_listener(self):
+        active   = instrument.Profile()
+        listener = Mock()
+
+        instrument.activate(active)
+        instrument.add_listener(listener)
+
+        try:
+            self.repository.find(self.repository.new_criteria())
+        finally:
+            instrument.remove_listener(listener)
+
+        self.assertIs(active, instrument.active_profile())
+        self.assertEqual(1, active.count('repository.find'))
+        self.assertEqual(1, self.session.profile.count('repository.find'))
+        self.assertEqual('repository.find', listener.call_args[0][0])
+        self.assertEqual({'collection': 'test_tori_db_instrument'}, listener.call_args[0][2])
+
+    def test_merge(self):
+        profile = instrument.Profile()
+        other   = instrument.Profile()
+
+        profile.record('repository.get', 1)
+        other.record('repository.get', 2)
+        other.record('commit', 3)
+
+        profile.merge(other)
+
+        self.assertEqual(2, profile.count('repository.get'))
+        self.assertEqual(3, profile.duration('repository.get'))
+        self.assertEqual(1, profile.count('commit'))
+        self.assertEqual('2 queries in 3.0 ms', str(profile))
@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import Mock, MagicMock, patch # Python 3.3
+except ImportError as exception:
+    from mock import Mock, MagicMock, patch # Python 2.7
+
+import pymongo
+
+from pymongo import ReadPreference
+from tori.db.criteria import Criteria
+from tori.db.manager import Manager, connection_options
+
+class TestDbManager(TestCase):
+    @patch('pymongo.version_tuple', (2, 8, 0))
+    @patch('pymongo.MongoClient')
+    def test_connection_pool_options(self, client_class):
+        manager = Manager('test_tori_db_manager', pool_size=20, wait_queue_timeout=500, socket_timeout=1000)
+
+        client_class.assert_called_with(
+            'localhost', 27017,
+            max_pool_size=20,
+            waitQueueTimeoutMS=500,
+            socketTimeoutMS=1000
+        )
+
+        self.assertEqual(client_class.return_value, manager.connection)
+
+    def test_connection_options_per_version(self):
+        options = {'pool_size': 20, 'wait_queue_timeout': 500, 'wait_queue_multiple': 2}
+
+        self.assertEqual({'max_pool_size': 20}, connection_options((2, 5), **options))
+        self.assertEqual(
+            {'maxPoolSize': 20, 'waitQueueTimeoutMS': 500, 'waitQueueMultiple': 2},
+            connection_options((3, 7), **options)
+        )
+        self.assertEqual({'maxPoolSize': 20, 'waitQueueTimeoutMS': 500}, connection_options((4, 0), **options))
+
+    @patch('pymongo.version_tuple', (2, 5, 0))
+    @patch('pymongo.MongoReplicaSetClient', create=True)
+    def test_replica_set_with_pymongo_2(self, client_class):
+        manager = Manager('test_tori_db_manager', host='db1', replica_set='rs0', pool_size=20)
+
+        client_class.assert_called_with('db1:27017', replicaSet='rs0', max_pool_size=20)
+
+        self.assertEqual(client_class.return_value, manager.connection)
+
+    @patch('pymongo.version_tuple', (4, 0, 0))
+    @patch('pymongo.MongoClient')
+    def test_replica_set(self, client_class):
+        Manager('test_tori_db_manager', host='mongodb://db1,db2/', replica_set='rs0', pool_size=20)
+
+        client_class.assert_called_with('mongodb://db1,db2/', replicaSet='rs0', maxPoolSize=20)
+
+    def test_given_connection(self):
+        connection = MagicMock()
+        manager    = Manager('test_tori_db_manager', connection, pool_size=20)
+
+        self.assertEqual(connection, manager.connection)
+        connection.__getitem__.assert_called_with('test_tori_db_manager')
+
+    def test_read_preference_per_query(self):
+        if pymongo.version_tuple[0] < 3:
+            self.skipTest('The collection options require PyMongo 3+.')
+
+        # The client does not connect until the query is executed.
+        repository     = Mock()
+        repository.api = pymongo.MongoClient(connect=False)['test_tori_db_manager']['data']
+
+        cursor = Criteria({'name': 'a'}, read_preference='secondary').build_cursor(repository)
+
+        self.assertEqual(ReadPreference.SECONDARY, cursor.collection.read_preference)
+        self.assertEqual(ReadPreference.PRIMARY, repository.api.read_preference)
+
+    def test_read_preference_per_query_with_pymongo_2(self):
+        repository     = Mock()
+        repository.api = Mock(spec=['find'])
+
+        Criteria({'name': 'a'}, read_preference='secondary').build_cursor(repository)
+
+        repository.api.find.assert_called_with({'name': 'a'}, read_preference=ReadPreference.SECONDARY)
+
+    def test_default_read_preference(self):
+        repository = MagicMock()
+
+        Criteria({'name': 'a'}).build_cursor(repository)
+
+        repository.api.find.assert_called_with({'name': 'a'})
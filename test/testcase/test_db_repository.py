@@ -7,14 +7,22 @@ except ImportError as exception:
 
 from bson import ObjectId
 from tori.db.common import PseudoObjectId
+from tori.db.criteria import Order
 from tori.db.entity import entity
 from tori.db.exception import MissingObjectIdException, EntityAlreadyRecognized, EntityNotRecognized
+from tori.db.mochi import Mochi
 from tori.db.repository import Repository
 from tori.db.session import Session
 
 @entity('test_tori_db_repository_data')
 class Data(object): pass
 
+@entity('test_tori_db_repository_rank')
+class Rank(object):
+    def __init__(self, name, score):
+        self.name  = name
+        self.score = score
+
 class TestDbRepository(TestCase):
     def setUp(self):
         pass
@@ -107,4 +115,68 @@ class TestDbRepository(TestCase):
         a.__session__ = True
 
         with self.assertRaises(EntityNotRecognized):
-            repository.put(a)
\ No newline at end of file
+            repository.put(a)
+
+    @patch('tori.db.session.Session')
+    def test_commit_with_write_concern(self, session):
+        repository = Repository(session, Data)
+
+        repository.commit('safe')
+
+        session.flush.assert_called_with('safe')
+
+class TestDbRepositoryPage(TestCase):
+    def setUp(self):
+        self.session    = Session(0, Mochi()['test'], {'test_tori_db_repository_rank': Rank})
+        self.repository = self.session.collection(Rank)
+
+        # The scores are duplicate or missing in places.
+        for name, score in [('a', 3), ('b', 1), ('c', None), ('d', 2), ('e', 3), ('f', None), ('g', 1)]:
+            self.session.persist(Rank(name, score))
+
+        self.session.flush()
+
+    def walk(self, order):
+        criteria  = self.repository.new_criteria(order_by={'score': order}, limit=2)
+        page_list = []
+        token     = None
+
+        while True:
+            entity_list, token = self.repository.page(criteria, after=token)
+
+            page_list.append([entity.name for entity in entity_list])
+
+            if not token:
+                return page_list
+
+    def test_page_ascending(self):
+        page_list = self.walk(Order.ASC)
+        names     = [name for page in page_list for name in page]
+
+        self.assertEqual([2, 2, 2, 1], [len(page) for page in page_list])
+        self.assertEqual(['c', 'f'], sorted(names[:2])) # null first
+        self.assertEqual(['b', 'g'], sorted(names[2:4]))
+        self.assertEqual('d', names[4])
+        self.assertEqual(['a', 'e'], sorted(names[5:]))
+
+    def test_page_descending(self):
+        page_list = self.walk(Order.DESC)
+        names     = [name for page in page_list for name in page]
+
+        self.assertEqual([2, 2, 2, 1], [len(page) for page in page_list])
+        self.assertEqual(['a', 'e'], sorted(names[:2]))
+        self.assertEqual('d', names[2])
+        self.assertEqual(['b', 'g'], sorted(names[3:5]))
+        self.assertEqual(['c', 'f'], sorted(names[5:])) # null last
+
+    def test_page_without_deleted_entities(self):
+        criteria = self.repository.new_criteria({'name': 'd'})
+
+        self.session.delete(self.repository.find(criteria)[0])
+
+        page_list = self.walk(Order.ASC)
+        names     = [name for page in page_list for name in page]
+
+        # The page of "d" is shorter but the walk goes on.
+        self.assertEqual([2, 2, 1, 1], [len(page) for page in page_list])
+        self.assertEqual(['a', 'b', 'c', 'e', 'f', 'g'], sorted(names))
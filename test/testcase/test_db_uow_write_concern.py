@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import Mock, MagicMock, patch # Python 3.3
+except ImportError as exception:
+    from mock import Mock, MagicMock, patch # Python 2.7
+
+from bson import ObjectId
+from tori.db.entity import entity
+from tori.db.session import Session
+from tori.db.uow import WriteConcern
+
+@entity('test_tori_db_uow_write_concern')
+class Hit(object):
+    def __init__(self, path):
+        self.path = path
+
+class TestDbUowWriteConcern(TestCase):
+    def setUp(self):
+        self.database = MagicMock()
+        self.session  = Session(0, self.database, {'test_tori_db_uow_write_concern': Hit})
+        self.api      = self.session.collection(Hit).api
+
+    def test_profiles(self):
+        self.assertEqual({'w': 0}, WriteConcern.resolve('unacknowledged').options)
+        self.assertEqual({'w': 'majority'}, WriteConcern.resolve('majority').options)
+        self.assertEqual({'w': 1, 'j': True, 'wtimeout': 100}, WriteConcern(journaled=True, timeout=100).options)
+
+        with self.assertRaises(ValueError):
+            WriteConcern.resolve('unknown')
+
+    def test_flush_with_unknown_profile(self):
+        self.api.insert.return_value = ObjectId()
+
+        self.session.persist(Hit('/'))
+
+        with self.assertRaises(ValueError):
+            self.session.flush('unknown')
+
+        # The session is not locked by the failed flush.
+        self.session.flush()
+
+        self.assertEqual(1, self.api.insert.call_count)
+
+    def test_flush_with_write_concern(self):
+        object_id = ObjectId()
+
+        self.api.insert.return_value = object_id
+
+        hit = Hit('/')
+
+        self.session.persist(hit)
+        self.session.flush('majority')
+
+        self.api.insert.assert_called_once_with({'path': '/'}, w='majority')
+        self.assertEqual(object_id, hit.id)
+
+    def test_flush_with_unordered_batch(self):
+        object_ids = [ObjectId(), ObjectId()]
+
+        self.api.insert.return_value = object_ids
+
+        hits = [Hit('/a'), Hit('/b')]
+
+        self.session.persist(*hits)
+        self.session.flush('bulk')
+
+        self.assertEqual(1, self.api.insert.call_count)
+
+        change_sets, = self.api.insert.call_args[0]
+
+        self.assertEqual(2, len(change_sets))
+        self.assertEqual({'continue_on_error': True, 'w': 0}, self.api.insert.call_args[1])
+
+        # The IDs are assigned in the same order as the inserted documents.
+        for index in range(len(change_sets)):
+            self.assertEqual(change_sets[index]['path'], [hit.path for hit in hits if hit.id == object_ids[index]][0])
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from tori.navigation import RoutingEngine
+
+class TestNavigationRoutingEngine(TestCase):
+    def setUp(self):
+        self.engine = RoutingEngine()
+
+        for pattern in [
+            '/',
+            '/about',
+            '/blog/(\\d+)',
+            '/blog/(?P<slug>[a-z]+)',
+            '/blog/new',
+            '/(.*)/edit',
+            '/resources(/.*)',
+            '/docs/?',
+            '/repeat/(?P<digit>\\d)(?P=digit)',
+            '/twice/(\\d)\\1',
+            '(?i)/insensitive'
+        ]:
+            self.engine.add(pattern, pattern)
+
+    def assertRoute(self, expected_pattern, path, expected_groups=()):
+        pattern, matches = self.engine.match(path)
+
+        self.assertEqual(expected_pattern, pattern)
+
+        if expected_pattern:
+            self.assertEqual(expected_groups, matches.groups())
+
+    def test_literal(self):
+        self.assertRoute('/', '/')
+        self.assertRoute('/about', '/about')
+        self.assertRoute(None, '/about/')
+
+    def test_prefix_tree(self):
+        self.assertRoute('/blog/(\\d+)', '/blog/123', ('123',))
+        self.assertRoute('/blog/(?P<slug>[a-z]+)', '/blog/tori', ('tori',))
+        self.assertRoute('/(.*)/edit', '/blog/123/edit', ('blog/123',))
+        self.assertRoute('/resources(/.*)', '/resources/css/main.css', ('/css/main.css',))
+        self.assertRoute('/docs/?', '/docs')
+        self.assertRoute('/docs/?', '/docs/')
+
+    def test_registration_order(self):
+        # The wildcard pattern is registered before the literal pattern.
+        self.assertRoute('/blog/(?P<slug>[a-z]+)', '/blog/new', ('new',))
+
+    def test_standalone_patterns(self):
+        self.assertRoute('/repeat/(?P<digit>\\d)(?P=digit)', '/repeat/11', ('1',))
+        self.assertRoute(None, '/repeat/12')
+        self.assertRoute('/twice/(\\d)\\1', '/twice/22', ('2',))
+        self.assertRoute('(?i)/insensitive', '/INSENSITIVE')
+
+    def test_alternation_with_literal_parentheses(self):
+        engine = RoutingEngine()
+
+        engine.add('/a/[^)]+|/bb', 'class')
+        engine.add('/c/\\(|/dd', 'escape')
+        engine.add('/e/[]|]+', 'bracket')
+
+        self.assertEqual('class', engine.match('/a/x')[0])
+        self.assertEqual('class', engine.match('/bb')[0])
+        self.assertEqual('escape', engine.match('/c/(')[0])
+        self.assertEqual('escape', engine.match('/dd')[0])
+        self.assertEqual('bracket', engine.match('/e/|')[0])
+
+    def test_many_patterns(self):
+        engine = RoutingEngine()
+
+        for index in range(300):
+            engine.add('/section/(\\w+)/(\\d+)/{}'.format(index), index)
+
+        self.assertEqual(0, engine.match('/section/a/1/0')[0])
+        self.assertEqual(299, engine.match('/section/a/1/299')[0])
+        self.assertEqual(None, engine.match('/section/a/1/300')[0])
+
+    def test_unanchored(self):
+        engine = RoutingEngine(anchored=False)
+
+        engine.add('/static(/.*)', 'static')
+        engine.add('/about', 'about')
+
+        self.assertEqual('static', engine.match('/static/main.css')[0])
+        self.assertEqual('about', engine.match('/about/team')[0])
@@ -1,9 +1,13 @@
 #-*- coding: utf-8 -*-
 
+import os
+import shutil
+import tempfile
 import unittest
 
-from jinja2 import FileSystemLoader, PackageLoader
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader, PackageLoader
 
+from tori.centre             import settings as AppSettings
 from tori.template.renderer  import DefaultRenderer
 from tori.exception import *
 
@@ -62,3 +66,28 @@ class TestDefaultRenderer(unittest.TestCase):
     def test_dynamic_template(self):
         r = DefaultRenderer('data')
         self.assertEqual(r.render('dynamic_template.html', name='Juti'), u'Hello, Juti.');
+
+    def test_stream(self):
+        r = DefaultRenderer('data')
+        self.assertEqual(u''.join(r.stream('dynamic_template.html', name='Juti')), u'Hello, Juti.');
+
+    def test_precompile(self):
+        r = DefaultRenderer('data')
+
+        self.assertEqual(3, r.precompile(['html']))
+
+    def test_bytecode_cache(self):
+        cache_path = os.path.join(tempfile.mkdtemp(), 'bytecode')
+
+        AppSettings['template_bytecode_cache'] = cache_path
+
+        try:
+            r = DefaultRenderer('data')
+
+            self.assertIsInstance(r.storage.bytecode_cache, FileSystemBytecodeCache)
+            self.assertEqual(r.render('basic_template.html'), u'Hello, world.')
+            self.assertTrue(os.listdir(cache_path), 'The compiled template should be cached.')
+        finally:
+            del AppSettings['template_bytecode_cache']
+
+            shutil.rmtree(os.path.dirname(cache_path))
@@ -4,7 +4,7 @@ import unittest
 
 from tori.exception       import *
 from tori.data.base       import ResourceEntity
-from tori.data.compressor import CSSCompressor
+from tori.data.compressor import CSSCompressor, minify_css, collapse_script_whitespaces, collapse_html_whitespaces
 
 class TestDefaultRenderer(unittest.TestCase):
     """ Test the CSS compressor """
@@ -25,4 +25,50 @@ class TestDefaultRenderer(unittest.TestCase):
         #print '%.3f%% reduced' % ((original_size - updated_size) * 100.0 / original_size)
         #print '%.3f KB reduced' % ((original_size - updated_size) / 1024.0)
 
-        self.assertTrue(original_size > updated_size, 'The data should be smaller.')
\ No newline at end of file
+        self.assertTrue(original_size > updated_size, 'The data should be smaller.')
+
+    def test_css_selectors(self):
+        self.assertEqual(
+            'a :hover,b>c+d~e{color:red;margin:0 auto}',
+            minify_css('a :hover , b > c + d ~ e { color : red ; margin : 0 auto ; }')
+        )
+
+    def test_css_strings_and_comments(self):
+        self.assertEqual(
+            'div{content:"a */ b ; }";font-family:\'x , y\'}',
+            minify_css('/* comment */ div { content: "a */ b ; }"; font-family: \'x , y\'; }')
+        )
+
+    def test_css_urls_and_expressions(self):
+        self.assertEqual(
+            'a{background:url( a/b.png ) no-repeat;width:calc(100% - 2px)}',
+            minify_css('a { background : url( a/b.png ) no-repeat ; width : calc( 100% - 2px ) }')
+        )
+
+    def test_css_at_rules(self):
+        self.assertEqual(
+            '@media screen and (max-width:100px){a :first-child{color:red}}',
+            minify_css('@media screen and (max-width : 100px) {\n  a :first-child { color : red; }\n}')
+        )
+
+    def test_css_simple_and_complex_rules(self):
+        self.assertEqual(
+            'a:not(.b){color:red}.c>.d,.e :hover{margin:0;padding:1px 2px}@media print{.f{display:none}}',
+            minify_css(
+                'a:not(.b) { color : red ; }\n'
+                '.c > .d , .e :hover { margin : 0 ; padding : 1px 2px ; }\n'
+                '@media print { .f { display : none } }'
+            )
+        )
+
+    def test_script_compressor(self):
+        self.assertEqual(
+            "var a = 1;\nvar b = 'x\\\n   y';\nf()",
+            collapse_script_whitespaces("  var a = 1;\n\n   var b = 'x\\\n   y';\n   f()  \n")
+        )
+
+    def test_html_compressor(self):
+        self.assertEqual(
+            '<div>\n<p>a b</p>\n<pre>  x\n   y</pre>\n</div>',
+            collapse_html_whitespaces('<div>\n   <p>a    b</p>\n <pre>  x\n   y</pre>\n</div>  ')
+        )
@@ -0,0 +1,74 @@
+import pickle
+
+from unittest import TestCase
+
+from tori.exception     import SessionError
+from tori.session.codec import JSONCodec, LazyData, PickleCodec, Serializer
+
+class TestSessionCodec(TestCase):
+    def test_json(self):
+        serializer = Serializer(JSONCodec())
+        data       = serializer.encode({'user': 'juti', 'roles': ['admin']})
+
+        self.assertEqual(b'\x01\x01', data[:2])
+        self.assertEqual({'user': 'juti', 'roles': ['admin']}, serializer.decode(data))
+
+    def test_compression(self):
+        serializer = Serializer(JSONCodec(), compression_threshold=64)
+        content    = 'tori' * 100
+        data       = serializer.encode(content)
+
+        self.assertEqual(b'\x01\x81', data[:2])
+        self.assertTrue(len(data) < len(content))
+        self.assertEqual(content, serializer.decode(data))
+
+    def test_codec_migration(self):
+        data = Serializer(JSONCodec()).encode([1, 2])
+
+        # The data encoded with the previous codec is still readable.
+        self.assertEqual([1, 2], Serializer(PickleCodec()).decode(data))
+
+        # The pickled data is only decoded by the serializer using the pickle codec.
+        data = Serializer(PickleCodec()).encode((1, 2))
+
+        self.assertEqual((1, 2), Serializer(PickleCodec()).decode(data))
+        self.assertRaises(SessionError, Serializer(JSONCodec()).decode, data)
+
+    def test_legacy_pickle(self):
+        data = pickle.dumps({'user': 'juti'})
+
+        # The legacy data is only decoded on request.
+        self.assertRaises(SessionError, Serializer(JSONCodec()).decode, data)
+        self.assertEqual({'user': 'juti'}, Serializer(JSONCodec(), legacy_pickle=True).decode(data))
+
+    def test_lazy_data(self):
+        serializer = Serializer(JSONCodec())
+        data       = LazyData({'a': serializer.encode(1), 'b': b'\x01\x01invalid'}, serializer)
+
+        # Only the accessed data is decoded.
+        self.assertEqual(1, data['a'])
+        self.assertEqual(1, data.get('a'))
+        self.assertEqual(None, data.get('c'))
+
+        data['b'] = 2
+
+        self.assertEqual([('a', 1), ('b', 2)], sorted(data.items()))
+
+    def test_lazy_data_without_encoded_data(self):
+        serializer = Serializer(JSONCodec())
+        encoded    = dict([(key, serializer.encode(key.upper())) for key in 'abcd'])
+
+        self.assertEqual({'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D'}, dict(LazyData(encoded, serializer)))
+        self.assertEqual({'a': 'A', 'b': 'B', 'c': 'C', 'd': 'D'}, LazyData(encoded, serializer).copy())
+
+        data = LazyData(encoded, serializer)
+
+        self.assertEqual('A', data.pop('a'))
+        self.assertEqual('B', data.setdefault('b', 'x'))
+        self.assertEqual('x', data.setdefault('e', 'x'))
+
+        del data['c']
+
+        self.assertEqual(['b', 'd', 'e'], sorted(data))
+        self.assertEqual(3, len(data))
+        self.assertFalse('c' in data)
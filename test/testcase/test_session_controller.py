@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from tori.session.controller        import Controller
+from tori.session.repository.memory import Memory
+
+class CountingMemory(Memory):
+    def __init__(self):
+        Memory.__init__(self)
+
+        self.load_count = 0
+        self.save_count = 0
+
+    def load(self, id):
+        self.load_count += 1
+
+        return Memory.load(self, id)
+
+    def save(self, id, data, deleted_keys=[]):
+        self.save_count += 1
+
+        Memory.save(self, id, data, deleted_keys)
+
+class TestSessionController(TestCase):
+    def setUp(self):
+        self.repository = CountingMemory()
+
+        self.repository.set('abc', 'user', 'shiroyuki')
+        self.repository.set('abc', 'theme', 'dark')
+
+    def test_load_once(self):
+        session = Controller(self.repository, 'abc')
+
+        self.assertEqual('shiroyuki', session.get('user'))
+        self.assertEqual('shiroyuki', session.get('user'))
+        self.assertEqual('dark', session.get('theme'))
+        self.assertEqual(None, session.get('unknown'))
+        self.assertEqual(1, self.repository.load_count)
+
+        # Nothing is saved without changes.
+        session.flush()
+
+        self.assertEqual(0, self.repository.save_count)
+
+    def test_write_back(self):
+        session = Controller(self.repository, 'abc')
+
+        session.set('user', 'juti')
+        session.set('cart', [1, 2])
+        session.delete('theme')
+
+        self.assertTrue(session.modified)
+        self.assertEqual('juti', session.get('user'))
+        self.assertEqual(None, session.get('theme'))
+
+        # The repository is not changed until the session is flushed.
+        self.assertEqual('shiroyuki', self.repository.get('abc', 'user'))
+        self.assertEqual('dark', self.repository.get('abc', 'theme'))
+
+        session.flush()
+
+        self.assertFalse(session.modified)
+        self.assertEqual(1, self.repository.save_count)
+        self.assertEqual({'user': 'juti', 'cart': [1, 2]}, self.repository.load('abc'))
+
+    def test_write_through(self):
+        session = Controller(self.repository, 'abc', False)
+
+        session.set('user', 'juti')
+        session.delete('theme')
+
+        self.assertFalse(session.modified)
+        self.assertEqual(2, self.repository.save_count)
+        self.assertEqual({'user': 'juti'}, self.repository.load('abc'))
+
+    def test_reset(self):
+        session = Controller(self.repository, 'abc')
+
+        session.set('user', 'juti')
+        session.reset()
+
+        self.assertEqual(None, session.get('user'))
+        self.assertFalse(session.modified)
+        self.assertFalse(self.repository.registered('abc'))
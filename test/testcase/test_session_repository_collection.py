@@ -0,0 +1,104 @@
+from datetime import datetime
+from unittest import TestCase
+
+try:
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    from mock import MagicMock, patch
+
+from pymongo.errors import OperationFailure
+
+from tori.db.mochi                      import Mochi
+from tori.db.session                    import Session
+from tori.session.entity.document       import Document
+from tori.session.repository.collection import Collection
+
+class TestSessionRepositoryCollection(TestCase):
+    def setUp(self):
+        self.session    = Session(0, Mochi()['test'])
+        self.api        = self.session.collection(Document).api
+        self.repository = Collection(self.session.collection(Document), ttl=3600)
+
+    def test_indexes(self):
+        self.assertEqual(
+            [
+                ([('session_id', 1), ('key', 1)], {'unique': True}),
+                ('updated_at', {'expireAfterSeconds': 3600})
+            ],
+            self.api._indexes
+        )
+
+    def test_ttl_index_change(self):
+        collection = MagicMock()
+
+        collection.api.name                     = 'session'
+        collection.api.ensure_index.side_effect = [None, OperationFailure('The index exists with different options.')]
+
+        Collection(collection, ttl=60)
+
+        collection.api.database.command.assert_called_once_with(
+            'collMod',
+            'session',
+            index={'keyPattern': {'updated_at': 1}, 'expireAfterSeconds': 60}
+        )
+
+    def test_set_extends_session(self):
+        with patch('tori.session.repository.collection.datetime') as mocked_datetime:
+            mocked_datetime.utcnow.return_value = datetime(2013, 1, 1, 0, 0, 0)
+
+            self.repository.set('abc', 'user', 'juti')
+            self.repository.set('abc', 'theme', 'dark')
+
+            mocked_datetime.utcnow.return_value = datetime(2013, 1, 1, 0, 30, 0)
+
+            self.repository.set('abc', 'user', 'shiroyuki')
+
+        self.assertEqual(
+            [datetime(2013, 1, 1, 0, 30, 0)] * 2,
+            [data['updated_at'] for data in self.api.find({'session_id': 'abc'})]
+        )
+
+    def test_upsert(self):
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.set('abc', 'user', 'shiroyuki')
+        self.repository.set('def', 'user', 'tori')
+
+        self.assertEqual(2, self.api.count())
+        self.assertEqual('shiroyuki', self.repository.get('abc', 'user'))
+        self.assertEqual(None, self.repository.get('abc', 'theme'))
+        self.assertTrue(self.repository.registered('abc'))
+        self.assertFalse(self.repository.registered('ghi'))
+
+    def test_save_and_load(self):
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.set('abc', 'theme', 'dark')
+        self.repository.save('abc', {'cart': [1, 2], 'user': 'shiroyuki'}, ['theme'])
+
+        self.assertEqual({'cart': [1, 2], 'user': 'shiroyuki'}, self.repository.load('abc'))
+
+        self.repository.delete('abc', 'cart')
+        self.repository.reset('def')
+
+        self.assertEqual({'user': 'shiroyuki'}, self.repository.load('abc'))
+
+        self.repository.reset('abc')
+
+        self.assertEqual({}, self.repository.load('abc'))
+        self.assertEqual(0, self.api.count())
+
+    def test_write_count(self):
+        collection = MagicMock()
+
+        Collection(collection).set('abc', 'user', 'juti')
+
+        self.assertEqual(1, collection.api.update.call_count)
+
+        collection = MagicMock()
+
+        Collection(collection, ttl=60).set('abc', 'user', 'juti')
+
+        self.assertEqual(2, collection.api.update.call_count)
+        self.assertEqual(
+            {'session_id': 'abc', 'key': {'$nin': ['user']}},
+            collection.api.update.call_args[0][0]
+        )
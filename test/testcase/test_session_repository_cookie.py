@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from tori.exception                  import SessionError
+from tori.session.codec              import JSONCodec, Serializer
+from tori.session.controller         import Controller
+from tori.session.repository.cookie  import Cookie
+from tori.session.repository.memory  import Memory
+
+class FakeHandler(object):
+    """ Request handler keeping the cookies without signing """
+    def __init__(self, cookies=None):
+        self.cookies          = cookies or {}
+        self._headers_written = False
+
+    def get_secure_cookie(self, name, max_age_days=31):
+        return self.cookies.get(name)
+
+    def set_secure_cookie(self, name, value, expires_days=30):
+        self.cookies[name] = value
+
+    def clear_cookie(self, name):
+        self.cookies.pop(name, None)
+
+class TestSessionRepositoryCookie(TestCase):
+    def setUp(self):
+        self.fallback   = Memory()
+        self.repository = Cookie(max_size=200, fallback=self.fallback, serializer=Serializer(JSONCodec()))
+
+    def test_round_trip(self):
+        handler = FakeHandler()
+        session = self.repository.bind(handler)
+
+        session.save('abc', {'user': 'juti', 'theme': 'dark'})
+        session.delete('abc', 'theme')
+
+        # The next request
+        session = self.repository.bind(FakeHandler(handler.cookies))
+
+        self.assertTrue(session.registered('abc'))
+        self.assertEqual('juti', session.get('abc', 'user'))
+        self.assertEqual({'user': 'juti'}, session.load('abc'))
+        self.assertFalse(self.fallback.registered('abc'))
+
+    def test_fallback(self):
+        handler = FakeHandler()
+        session = self.repository.bind(handler)
+
+        session.set('abc', 'data', 'x' * 300)
+
+        self.assertEqual({'data': 'x' * 300}, self.fallback.load('abc'))
+
+        # The data is back in the cookie once it is small enough.
+        session = self.repository.bind(FakeHandler(handler.cookies))
+
+        self.assertEqual('x' * 300, session.get('abc', 'data'))
+
+        session.set('abc', 'data', 'x')
+
+        self.assertFalse(self.fallback.registered('abc'))
+        self.assertEqual('x', self.repository.bind(FakeHandler(handler.cookies)).get('abc', 'data'))
+
+    def test_size_limit_without_fallback(self):
+        repository = Cookie(max_size=200, serializer=Serializer(JSONCodec()))
+        session    = repository.bind(FakeHandler())
+
+        self.assertRaises(SessionError, session.set, 'abc', 'data', 'x' * 300)
+
+    def test_invalid_cookie(self):
+        session = self.repository.bind(FakeHandler({'session': b'invalid'}))
+
+        self.assertFalse(session.registered('abc'))
+        self.assertEqual(None, session.get('abc', 'user'))
+
+    def test_headers_written(self):
+        handler = FakeHandler()
+        session = self.repository.bind(handler)
+
+        handler._headers_written = True
+
+        self.assertRaises(SessionError, session.set, 'abc', 'user', 'juti')
+
+    def test_flush_after_headers_written(self):
+        handler = FakeHandler()
+        session = Controller(self.repository.bind(handler), 'abc')
+
+        session.set('user', 'juti')
+
+        # e.g., the output is streamed before the request is finished.
+        handler._headers_written = True
+
+        self.assertRaises(SessionError, session.flush)
+
+        # The error page does not fail on the same changes again.
+        self.assertFalse(session.modified)
+
+        session.flush()
+
+    def test_unbound(self):
+        self.assertRaises(SessionError, self.repository.get, 'abc', 'user')
@@ -0,0 +1,116 @@
+from datetime import datetime
+from unittest import TestCase
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from sqlalchemy import text
+
+from tori.db.wrapper                  import Repository
+from tori.session.codec               import JSONCodec, Serializer
+from tori.session.repository.database import Database
+
+class TestSessionRepositoryDatabase(TestCase):
+    def setUp(self):
+        self.db         = Repository('sqlite:///:memory:')
+        self.repository = Database(self.db, Serializer(JSONCodec()))
+
+    def test_upsert(self):
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.set('abc', 'user', 'shiroyuki')
+        self.repository.set('def', 'user', 'tori')
+
+        self.assertEqual('shiroyuki', self.repository.get('abc', 'user'))
+        self.assertEqual(None, self.repository.get('abc', 'theme'))
+        self.assertTrue(self.repository.registered('abc'))
+        self.assertFalse(self.repository.registered('ghi'))
+        self.assertEqual(2, self._count())
+
+    def test_upsert_without_native_support(self):
+        del self.repository._prepare()['upsert']
+
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.set('abc', 'user', 'shiroyuki')
+
+        self.assertEqual('shiroyuki', self.repository.get('abc', 'user'))
+        self.assertEqual(1, self._count())
+
+    def test_save_and_load(self):
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.set('abc', 'theme', 'dark')
+        self.repository.set('abc', 'lang', 'ja')
+        self.repository.save('abc', {'cart': [1, 2], 'user': 'shiroyuki'}, ['theme', 'lang'])
+
+        self.assertEqual({'cart': [1, 2], 'user': 'shiroyuki'}, dict(self.repository.load('abc').items()))
+
+        self.repository.delete('abc', 'cart')
+
+        self.assertEqual({'user': 'shiroyuki'}, dict(self.repository.load('abc').items()))
+
+        self.repository.reset('abc')
+
+        self.assertEqual({}, self.repository.load('abc'))
+        self.assertEqual(0, self._count())
+
+    def test_ttl(self):
+        repository = Database(self.db, Serializer(JSONCodec()), ttl=60)
+
+        with patch('tori.session.repository.database.datetime') as mocked_datetime:
+            mocked_datetime.utcnow.return_value = datetime(2013, 1, 1, 0, 0, 0)
+
+            repository.set('abc', 'user', 'juti')
+
+            mocked_datetime.utcnow.return_value = datetime(2013, 1, 1, 0, 0, 30)
+
+            repository.set('def', 'user', 'shiroyuki')
+
+            mocked_datetime.utcnow.return_value = datetime(2013, 1, 1, 0, 1, 10)
+
+            self.assertEqual(None, repository.get('abc', 'user'))
+            self.assertFalse(repository.registered('abc'))
+            self.assertEqual('shiroyuki', repository.get('def', 'user'))
+            self.assertEqual(1, repository.sweep())
+
+        self.assertEqual(1, self._count())
+
+    def test_falsy_data(self):
+        for key, content in [('zero', 0), ('empty', ''), ('list', []), ('flag', False)]:
+            self.repository.set('abc', key, content)
+
+            self.assertEqual(content, self.repository.get('abc', key))
+
+    def test_migration(self):
+        serializer = Serializer(JSONCodec())
+
+        # The table made by the previous versions
+        with self.db.engine.begin() as connection:
+            connection.execute(text(
+                'CREATE TABLE tori_session'
+                ' (id INTEGER PRIMARY KEY, _session_id VARCHAR(128), "key" VARCHAR(128), content BLOB)'
+            ))
+            connection.execute(text('CREATE INDEX ix_tori_session__session_id ON tori_session (_session_id)'))
+            connection.execute(
+                text('INSERT INTO tori_session (_session_id, "key", content) VALUES (:session_id, :key, :content)'),
+                [
+                    {'session_id': 'abc', 'key': 'user', 'content': serializer.encode('juti')},
+                    {'session_id': 'abc', 'key': 'user', 'content': serializer.encode('shiroyuki')},
+                    {'session_id': 'abc', 'key': 'theme', 'content': serializer.encode('dark')}
+                ]
+            )
+
+        repository = Database(self.db, serializer, ttl=60)
+
+        self.assertEqual('shiroyuki', repository.get('abc', 'user'))
+
+        repository.set('abc', 'user', 'tori')
+        repository.set('def', 'user', 'juti')
+
+        self.assertEqual({'user': 'tori', 'theme': 'dark'}, dict(repository.load('abc').items()))
+        self.assertEqual(3, self._count())
+        self.assertEqual(0, repository.sweep())
+
+    def _count(self):
+        with self.db.engine.begin() as connection:
+            return connection.execute(text('SELECT COUNT(*) FROM tori_session')).first()[0]
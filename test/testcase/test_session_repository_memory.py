@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from tori.session.repository.memory import Memory
+
+class TestSessionRepositoryMemory(TestCase):
+    def test_idle_ttl(self):
+        repository = Memory(idle_ttl=10, sweep_interval=None)
+
+        with patch('tori.session.repository.memory.time', return_value=100):
+            repository.set('a', 'user', 'juti')
+            repository.set('b', 'user', 'shiroyuki')
+
+        # The access extends the lifespan.
+        with patch('tori.session.repository.memory.time', return_value=105):
+            self.assertEqual('juti', repository.get('a', 'user'))
+
+        with patch('tori.session.repository.memory.time', return_value=110):
+            self.assertTrue(repository.registered('a'))
+            self.assertFalse(repository.registered('b'))
+            self.assertEqual(None, repository.get('b', 'user'))
+
+        with patch('tori.session.repository.memory.time', return_value=115):
+            self.assertEqual(1, repository.sweep())
+            self.assertEqual({}, repository.load('a'))
+
+        self.assertEqual(0, repository.statistics['size'])
+        self.assertEqual(2, repository.statistics['expirations'])
+
+    def test_absolute_ttl(self):
+        repository = Memory(absolute_ttl=10, sweep_interval=None)
+
+        with patch('tori.session.repository.memory.time', return_value=100):
+            repository.set('a', 'user', 'juti')
+
+        with patch('tori.session.repository.memory.time', return_value=109):
+            self.assertEqual('juti', repository.get('a', 'user'))
+
+        with patch('tori.session.repository.memory.time', return_value=110):
+            self.assertEqual(None, repository.get('a', 'user'))
+
+    def test_count_bound(self):
+        repository = Memory(max_count=2)
+
+        repository.set('a', 'user', 'juti')
+        repository.set('b', 'user', 'shiroyuki')
+
+        # "a" becomes the most recently used.
+        repository.get('a', 'user')
+        repository.set('c', 'user', 'tori')
+
+        self.assertTrue(repository.registered('a'))
+        self.assertFalse(repository.registered('b'))
+        self.assertTrue(repository.registered('c'))
+        self.assertEqual(1, repository.statistics['evictions'])
+
+    def test_size_bound(self):
+        repository = Memory()
+
+        repository.set('a', 'data', 'x' * 100)
+
+        size       = repository.statistics['size']
+        repository = Memory(max_size=size * 2)
+
+        repository.set('a', 'data', 'x' * 100)
+        repository.set('b', 'data', 'x' * 100)
+        repository.set('c', 'data', 'x' * 100)
+
+        self.assertFalse(repository.registered('a'))
+        self.assertEqual(2, repository.statistics['count'])
+        self.assertEqual(size * 2, repository.statistics['size'])
+
+    def test_save_and_reset(self):
+        repository = Memory()
+
+        repository.set('a', 'user', 'juti')
+        repository.save('a', {'theme': 'dark'}, ['user'])
+
+        self.assertEqual({'theme': 'dark'}, repository.load('a'))
+
+        repository.reset('a')
+        repository.reset('unknown')
+
+        self.assertFalse(repository.registered('a'))
+        self.assertEqual(0, repository.statistics['size'])
@@ -0,0 +1,114 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import MagicMock, call, patch
+except ImportError:
+    from mock import MagicMock, call, patch
+
+from tori.session.codec              import JSONCodec, Serializer
+from tori.session.repository.xredis import Redis
+
+class TestSessionRepositoryRedis(TestCase):
+    def setUp(self):
+        self.serializer = Serializer(JSONCodec())
+        self.client     = MagicMock()
+        self.pipeline   = self.client.pipeline.return_value
+        self.repository = Redis(redis_client=self.client, ttl=60, serializer=self.serializer)
+
+    def test_save(self):
+        self.repository.save('abc', {'user': 'juti'}, ['theme'])
+
+        self.assertEqual(
+            [
+                call.hdel('tori/session/abc', 'theme'),
+                call.hset('tori/session/abc', mapping={'user': self.serializer.encode('juti')}),
+                call.expire('tori/session/abc', 60),
+                call.execute()
+            ],
+            self.pipeline.mock_calls
+        )
+
+    def test_save_with_legacy_client(self):
+        with patch('tori.session.repository.xredis._hset_with_mapping', False):
+            self.repository.save('abc', {'user': 'juti'})
+
+        self.assertEqual(
+            [
+                call.hmset('tori/session/abc', {'user': self.serializer.encode('juti')}),
+                call.expire('tori/session/abc', 60),
+                call.execute()
+            ],
+            self.pipeline.mock_calls
+        )
+
+    def test_load(self):
+        self.pipeline.execute.return_value = [
+            {b'user': self.serializer.encode('juti'), b'theme': b'\x01\x01invalid'},
+            True
+        ]
+
+        data = self.repository.load('abc')
+
+        # Only the accessed data is decoded.
+        self.assertEqual('juti', data['user'])
+        self.assertEqual(['theme', 'user'], sorted(data))
+        self.assertEqual(
+            [call.hgetall('tori/session/abc'), call.expire('tori/session/abc', 60), call.execute()],
+            self.pipeline.mock_calls
+        )
+
+    def test_get(self):
+        self.pipeline.execute.return_value = [self.serializer.encode(0), True]
+
+        self.assertEqual(0, self.repository.get('abc', 'count'))
+
+        self.pipeline.execute.return_value = [None, True]
+
+        self.assertEqual(None, self.repository.get('abc', 'unknown'))
+        self.assertEqual(
+            [
+                call.hget('tori/session/abc', 'count'),
+                call.expire('tori/session/abc', 60),
+                call.execute(),
+                call.hget('tori/session/abc', 'unknown'),
+                call.expire('tori/session/abc', 60),
+                call.execute()
+            ],
+            self.pipeline.mock_calls
+        )
+
+    def test_set_and_delete(self):
+        self.repository.set('abc', 'user', 'juti')
+        self.repository.delete('abc', 'user')
+
+        self.assertEqual(
+            [
+                call.hset('tori/session/abc', 'user', self.serializer.encode('juti')),
+                call.expire('tori/session/abc', 60),
+                call.execute(),
+                call.hdel('tori/session/abc', 'user'),
+                call.expire('tori/session/abc', 60),
+                call.execute()
+            ],
+            self.pipeline.mock_calls
+        )
+
+    def test_without_ttl(self):
+        repository = Redis(redis_client=self.client, serializer=self.serializer)
+
+        repository.set('abc', 'user', 'juti')
+
+        self.assertEqual(
+            [call.hset('tori/session/abc', 'user', self.serializer.encode('juti')), call.execute()],
+            self.pipeline.mock_calls
+        )
+
+    def test_registered_and_reset(self):
+        self.client.exists.return_value = 1
+
+        self.assertTrue(self.repository.registered('abc'))
+
+        self.repository.reset('abc')
+
+        self.client.exists.assert_called_once_with('tori/session/abc')
+        self.client.delete.assert_called_once_with('tori/session/abc')
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from tori.exception                 import SessionError
+from tori.session.codec             import JSONCodec, Serializer
+from tori.session.repository.cookie import Cookie
+from tori.socket.websocket          import WebSocket
+
+class FakeApplication(object):
+    settings = {'cookie_secret': 'secret'}
+
+class FakeWebSocket(WebSocket):
+    """ Web socket handler after the handshake keeping the cookies without signing """
+    def __init__(self, cookie_jar=None):
+        self._session         = None
+        self._headers_written = True
+
+        self.application = FakeApplication()
+        self.cookie_jar  = cookie_jar or {}
+
+    def get_secure_cookie(self, name, value=None, max_age_days=31):
+        return self.cookie_jar.get(name)
+
+    def set_secure_cookie(self, name, value, expires_days=30):
+        self.cookie_jar[name] = value
+
+    def clear_cookie(self, name):
+        self.cookie_jar.pop(name, None)
+
+class TestSocketWebSocket(TestCase):
+    def setUp(self):
+        self.repository = Cookie(serializer=Serializer(JSONCodec()))
+
+    @patch('tori.socket.websocket.services')
+    def test_cookie_session(self, services):
+        services.has.return_value = True
+        services.get.return_value = self.repository
+
+        socket = FakeWebSocket({
+            'ssid':    'abc',
+            'session': self.repository.encode({'user': 'juti'})
+        })
+
+        self.assertEqual('abc', socket.session.id)
+        self.assertEqual('juti', socket.session.get('user'))
+
+        # The cookie cannot be sent after the handshake.
+        self.assertRaises(SessionError, socket.session.set, 'user', 'shiroyuki')
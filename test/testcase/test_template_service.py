@@ -0,0 +1,43 @@
+import threading
+import time
+import unittest
+
+from tori.template.renderer import Renderer
+from tori.template.service  import RenderingService
+
+class SlowRenderer(Renderer):
+    instance_count = 0
+
+    def __init__(self, name):
+        SlowRenderer.instance_count += 1
+
+        self.name = 'slow:{}'.format(name)
+
+        # Widen the window for the race condition.
+        time.sleep(0.01)
+
+class TestRenderingService(unittest.TestCase):
+    def setUp(self):
+        SlowRenderer.instance_count = 0
+
+    def test_obtain_once(self):
+        service   = RenderingService(Renderer)
+        renderers = []
+        threads   = [
+            threading.Thread(target=lambda: renderers.append(service.obtain('app.views', SlowRenderer)))
+            for i in range(8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, SlowRenderer.instance_count)
+        self.assertEqual(8, len(renderers))
+        self.assertTrue(all([renderer is renderers[0] for renderer in renderers]))
+
+        # The renderer is also available by its own name.
+        self.assertIs(renderers[0], service.use('slow:app.views'))
+        self.assertIs(renderers[0], service.obtain('app.views'))
@@ -35,6 +35,45 @@ from tori.data.base  import resolve_file_path
 from tori.exception  import *
 from tori.navigation import *
 
+class RoutingEngineMixin(object):
+    """
+    Mixin to let a Tornado application find the handler with :class:`tori.navigation.RoutingEngine` instead of
+    testing every handler in turn.
+
+    When no handler matches, all handlers are given back to Tornado so that Tornado responds as usual, e.g., with
+    HTTP 404.
+    """
+
+    def _get_host_handlers(self, request):
+        handlers = super(RoutingEngineMixin, self)._get_host_handlers(request)
+
+        if not handlers:
+            return handlers
+
+        if '_routing_engines' not in self.__dict__:
+            self._routing_engines = {}
+
+        # The handlers of each host are indexed once (and again if more handlers are added).
+        key = id(handlers)
+
+        if key not in self._routing_engines or self._routing_engines[key][0] != len(handlers):
+            engine = RoutingEngine()
+
+            for spec in handlers:
+                engine.add(spec.regex.pattern, spec)
+
+            self._routing_engines[key] = (len(handlers), engine)
+
+        spec, matches = self._routing_engines[key][1].match(request.path)
+
+        return [spec] if spec else handlers
+
+class TornadoRoutingApplication(RoutingEngineMixin, TornadoNormalApplication):
+    """ Tornado application with :class:`RoutingEngineMixin` """
+
+class TornadoRoutingWSGIApplication(RoutingEngineMixin, TornadoWSGIApplication):
+    """ Tornado WSGI application with :class:`RoutingEngineMixin` """
+
 class BaseApplication(object):
     """
     Interface to bootstrap a WSGI application with Tornado Web Server/Framework.
@@ -91,7 +130,7 @@ class BaseApplication(object):
         AppSettings.update(self._settings)
 
         # Instantiate the backend application.
-        self._backend_app = TornadoNormalApplication(self._routes, **self._settings)
+        self._backend_app = TornadoRoutingApplication(self._routes, **self._settings)
 
     def listen(self, port_number=None, bind_address=None):
         """
@@ -141,7 +180,8 @@ class Application(BaseApplication):
     _default_services         = [
         ('finder', 'tori.common.Finder', [], {}),
         ('renderer', 'tori.template.service.RenderingService', [], {}),
-        ('session', 'tori.session.repository.memory.Memory', [], {}),
+        ('session', 'tori.session.repository.memory.Memory', [], {'idle_ttl': 86400}),
+        ('output_cache', 'tori.cache.memory.Memory', [], {'max_size': 67108864}),
         ('routing_map', 'tori.navigation.RoutingMap', [], {})
     ]
     _data_transformer         = ImaginationTransformer(ImaginationLocator())
@@ -194,9 +234,29 @@ class Application(BaseApplication):
 
         # Normal procedure
         self._update_routes(self._routing_map.export())
+        self._prepare_renderers()
         self.listen(self._port)
         self._activate()
 
+    def _prepare_renderers(self):
+        """
+        Instantiate the renderers of the controllers decorated with :func:`tori.decorator.controller.renderer`.
+
+        The renderers are shared by the controllers with the same templates and are not instantiated on the first
+        requests.
+        """
+        rendering_service = AppServices.get('renderer')
+
+        for route in self._routes:
+            controller = route[1]
+
+            if not getattr(controller, '_template_base_path', None) or not hasattr(controller, 'resolve_renderer'):
+                continue
+
+            controller.resolve_renderer(rendering_service)
+
+            self._logger.debug('Prepared the renderer for {}.'.format(controller.__name__))
+
     def _configure(self, configuration, config_path=None):
         if len(configuration.children('server')) > 1:
             raise InvalidConfigurationError('Too many server configuration.')
@@ -347,7 +407,7 @@ class WSGIApplication(Application):
         AppSettings.update(self._settings)
 
         # Instantiate the backend application.
-        self._backend_app = TornadoWSGIApplication(self._routes, **self._settings)
+        self._backend_app = TornadoRoutingWSGIApplication(self._routes, **self._settings)
 
     def start(self):
         """
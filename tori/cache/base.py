@@ -0,0 +1,86 @@
+from tori.exception import *
+
+class Base(object):
+    """ The Base Cache Storage
+
+        Every storage reports the number of hits, misses and evictions via :attr:`statistics`.
+    """
+
+    def __init__(self):
+        self._hits      = 0
+        self._misses    = 0
+        self._evictions = 0
+
+    @property
+    def statistics(self):
+        """ Statistics of the storage
+
+            :rtype: dict
+        """
+        return {
+            'hits':      self._hits,
+            'misses':    self._misses,
+            'evictions': self._evictions
+        }
+
+    def clear(self):
+        """
+        Remove all data from the storage.
+
+        .. note:: This method is not implemented in :class:`tori.cache.base.Base`.
+        """
+        raise FutureFeatureException
+
+    def delete(self, key):
+        """
+        Delete the cached data.
+
+        :param `key`: cache key
+
+        .. note:: This method is not implemented in :class:`tori.cache.base.Base`.
+        """
+        raise FutureFeatureException
+
+    def get(self, key, default=None):
+        """
+        Get the cached data.
+
+        :param `key`:     cache key
+        :param `default`: the data returned on a miss
+        :return:          the cached data
+
+        .. note:: This method is not implemented in :class:`tori.cache.base.Base`.
+        """
+        raise FutureFeatureException
+
+    def has(self, key):
+        """
+        Check if the data is cached.
+
+        :param `key`: cache key
+        :return:      ``True`` if the data is cached.
+        """
+        return self.get(key) is not None
+
+    def invalidate(self, tag):
+        """
+        Delete all data cached with the given tag.
+
+        :param `tag`: cache tag
+
+        .. note:: This method is not implemented in :class:`tori.cache.base.Base`.
+        """
+        raise FutureFeatureException
+
+    def set(self, key, content, ttl=None, tags=None):
+        """
+        Cache the given content.
+
+        :param `key`:     cache key
+        :param `content`: the data being cached
+        :param `ttl`:     the lifespan of the data in seconds (unlimited if ``None``)
+        :param `tags`:    the list of tags used to invalidate the data
+
+        .. note:: This method is not implemented in :class:`tori.cache.base.Base`.
+        """
+        raise FutureFeatureException
@@ -0,0 +1,144 @@
+import sys
+
+from collections import OrderedDict
+from threading   import RLock
+from time        import time
+
+from tori.cache.base import Base
+
+class Memory(Base):
+    """ In-memory Least-recently-used Cache Storage
+
+        :param max_size:  the maximum total size of the cached data in bytes (unlimited if ``None``)
+        :type  max_size:  int
+        :param max_count: the maximum number of the cached data (unlimited if ``None``)
+        :type  max_count: int
+
+        The size of each data is its length (e.g., for strings) or, otherwise, the size reported by
+        :func:`sys.getsizeof` unless the size is given on :meth:`set`. Any data larger than ``max_size`` is not cached.
+    """
+
+    def __init__(self, max_size=None, max_count=None):
+        Base.__init__(self)
+
+        self._max_size  = max_size
+        self._max_count = max_count
+        self._size      = 0
+        self._storage   = OrderedDict() # key => (content, size, expiry time, tags) from the least recently used
+        self._tag_map   = {}            # tag => set of keys
+        self._lock      = RLock()
+
+    @property
+    def size(self):
+        """ The total size of the cached data in bytes """
+        return self._size
+
+    @property
+    def statistics(self):
+        statistics = Base.statistics.fget(self)
+
+        statistics.update({
+            'count': len(self._storage),
+            'size':  self._size
+        })
+
+        return statistics
+
+    def clear(self):
+        with self._lock:
+            self._storage.clear()
+            self._tag_map.clear()
+
+            self._size = 0
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._storage:
+                return
+
+            content, size, expiry_time, tags = self._storage.pop(key)
+
+            self._size -= size
+
+            for tag in tags:
+                self._tag_map[tag].discard(key)
+
+                if not self._tag_map[tag]:
+                    del self._tag_map[tag]
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._storage:
+                self._misses += 1
+
+                return default
+
+            entry = self._storage[key]
+
+            if entry[2] is not None and entry[2] <= time():
+                self.delete(key)
+
+                self._misses += 1
+
+                return default
+
+            # Mark the data as the most recently used.
+            del self._storage[key]
+
+            self._storage[key] = entry
+            self._hits += 1
+
+            return entry[0]
+
+    def has(self, key):
+        entry = self._storage.get(key)
+
+        return entry is not None and (entry[2] is None or entry[2] > time())
+
+    def invalidate(self, tag):
+        with self._lock:
+            for key in list(self._tag_map.get(tag, [])):
+                self.delete(key)
+
+    def set(self, key, content, ttl=None, tags=None, size=None):
+        """
+        Cache the given content.
+
+        :param `key`:     cache key
+        :param `content`: the data being cached
+        :param `ttl`:     the lifespan of the data in seconds (unlimited if ``None``)
+        :param `tags`:    the list of tags used to invalidate the data
+        :param `size`:    the size of the data in bytes (optional)
+        """
+        if size is None:
+            size = len(content) if isinstance(content, (bytes, str)) else sys.getsizeof(content)
+
+        tags = tuple(tags or [])
+
+        with self._lock:
+            self.delete(key)
+
+            if self._max_size is not None and size > self._max_size:
+                return
+
+            self._storage[key] = (content, size, time() + ttl if ttl else None, tags)
+            self._size        += size
+
+            for tag in tags:
+                if tag not in self._tag_map:
+                    self._tag_map[tag] = set()
+
+                self._tag_map[tag].add(key)
+
+            self._evict()
+
+    def _evict(self):
+        while self._storage and (
+            (self._max_size is not None and self._size > self._max_size)
+            or (self._max_count is not None and len(self._storage) > self._max_count)
+        ):
+            key = next(iter(self._storage))
+
+            self.delete(key)
+
+            self._evictions += 1
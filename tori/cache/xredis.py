@@ -0,0 +1,168 @@
+import redis
+
+from tori.cache.base import Base
+from tori.exception  import *
+
+try:
+    text_type = unicode
+except NameError: # Python 3
+    text_type = str
+
+class Redis(Base):
+    """ Redis Cache Storage
+
+        :param prefix: the prefix of the keys
+        :type  prefix: str
+        :param redis_client: the Redis client (PIP: redis)
+        :type  redis_client: redis.Redis
+        :param use_localhost_as_fallback: the flag to connect to the local server if the client is not given
+        :type  use_localhost_as_fallback: bool
+        :param scan_count: the number of keys examined in each iteration of :meth:`clear`
+        :type  scan_count: int
+
+        Only the rendered output (``str`` or ``bytes``) is cached. It is stored as it is (the text in UTF-8) with a
+        one-byte type marker and never unpickled as the server may be shared.
+
+        The tags are kept as sets of keys so that the data can be invalidated by tag across processes. Each tag set
+        lives at least as long as its longest-living data.
+    """
+    text_flag  = b'u'
+    bytes_flag = b'b'
+
+    def __init__(self, prefix='tori/cache', redis_client=None, use_localhost_as_fallback=True, scan_count=500):
+        Base.__init__(self)
+
+        self._redis      = redis_client
+        self._prefix     = prefix
+        self._scan_count = scan_count
+
+        self._use_localhost_as_fallback = use_localhost_as_fallback
+
+    @property
+    def __api(self):
+        if not self._redis and not self._use_localhost_as_fallback:
+            raise InvalidInput('The Redis API (PIP: redis) must be provided.')
+        elif not self._redis and self._use_localhost_as_fallback:
+            pool        = redis.ConnectionPool(host='localhost', port=6379, db=0)
+            self._redis = redis.Redis(connection_pool=pool)
+
+        return self._redis
+
+    def __compose_key(self, key):
+        return '/'.join([self._prefix, 'data', key])
+
+    def __compose_tag_key(self, tag):
+        return '/'.join([self._prefix, 'tag', tag])
+
+    def __encode(self, content):
+        if isinstance(content, text_type):
+            return self.text_flag + content.encode('utf-8')
+
+        if isinstance(content, bytes):
+            return self.bytes_flag + content
+
+        raise InvalidInput('Only the rendered output (str or bytes) can be cached in Redis.')
+
+    def __decode(self, data):
+        flag, content = data[:1], data[1:]
+
+        return content.decode('utf-8') if flag == self.text_flag else content
+
+    def clear(self):
+        """ Remove all data and tags with the prefix.
+
+            The keys are iterated with ``SCAN`` (Redis 2.8+) so that the server is not blocked by ``KEYS``.
+        """
+        api = self.__api
+
+        if not hasattr(api, 'scan_iter'): # redis-py before 2.9
+            keys = api.keys('{}/*'.format(self._prefix))
+
+            if keys:
+                api.delete(*keys)
+
+            return
+
+        keys = []
+
+        for key in api.scan_iter(match='{}/*'.format(self._prefix), count=self._scan_count):
+            keys.append(key)
+
+            if len(keys) >= self._scan_count:
+                api.delete(*keys)
+
+                keys = []
+
+        if keys:
+            api.delete(*keys)
+
+    def delete(self, key):
+        self.__api.delete(self.__compose_key(key))
+
+    def get(self, key, default=None):
+        content = self.__api.get(self.__compose_key(key))
+
+        if content is None:
+            self._misses += 1
+
+            return default
+
+        self._hits += 1
+
+        return self.__decode(content)
+
+    def has(self, key):
+        return bool(self.__api.exists(self.__compose_key(key)))
+
+    def invalidate(self, tag):
+        tag_key = self.__compose_tag_key(tag)
+        keys    = self.__api.smembers(tag_key)
+
+        pipeline = self.__api.pipeline()
+
+        if keys:
+            pipeline.delete(*keys)
+
+        pipeline.delete(tag_key)
+        pipeline.execute()
+
+    def set(self, key, content, ttl=None, tags=None):
+        actual_key = self.__compose_key(key)
+        tag_keys   = [self.__compose_tag_key(tag) for tag in tags or []]
+        ttl        = int(ttl) if ttl else None
+        lifespans  = []
+
+        # The remaining lifespans of the tag sets are needed to only extend them.
+        if tag_keys and ttl:
+            pipeline = self.__api.pipeline(transaction=False)
+
+            for tag_key in tag_keys:
+                pipeline.exists(tag_key)
+                pipeline.ttl(tag_key)
+
+            results   = pipeline.execute()
+            lifespans = [(results[index * 2], results[index * 2 + 1]) for index in range(len(tag_keys))]
+
+        pipeline = self.__api.pipeline()
+
+        pipeline.set(actual_key, self.__encode(content))
+
+        if ttl:
+            pipeline.expire(actual_key, ttl)
+
+        for index, tag_key in enumerate(tag_keys):
+            pipeline.sadd(tag_key, actual_key)
+
+            if not ttl:
+                # The data lives until it is invalidated.
+                pipeline.persist(tag_key)
+
+                continue
+
+            exists, remaining = lifespans[index]
+
+            # The remaining lifespan is None or negative if the tag set never expires.
+            if not exists or remaining is not None and 0 <= remaining < ttl:
+                pipeline.expire(tag_key, ttl)
+
+        pipeline.execute()
@@ -7,18 +7,32 @@ This package contains an abstract controller (based on
 :class:`tornado.web.RequestHandler`) and built-in controllers.
 """
 
+import datetime
+import hashlib
 import logging
+import os
 
 from base64 import b64decode
+from email.utils import parsedate
 from os import path as p
-from re import match, sub
+from re import compile as RegExp, sub
 
-from tornado.web import HTTPError, RequestHandler
+from tornado.escape import utf8
+from tornado.web    import HTTPError, RequestHandler, asynchronous
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from tori.cache.memory       import Memory as MemoryCache
 from tori.centre             import services
+from tori.centre             import settings as AppSettings
 from tori.common             import get_logger
-from tori.data.base          import ResourceEntity, resolve_file_path
+from tori.data.base          import ResourceEntity, compress_with_gzip, resolve_file_path
+from tori.db                 import instrument
 from tori.exception          import *
+from tori.navigation         import RoutingEngine
 from tori.template.renderer  import DefaultRenderer
 from tori.session.generator  import GuidGenerator
 from tori.session.controller import Controller as SessionController
@@ -29,14 +43,56 @@ class Controller(RequestHandler):
     engine instead of the default one that comes with Tornado.
     """
 
-    _guid_generator  = GuidGenerator()
-    _template_engine = None
+    _guid_generator       = GuidGenerator()
+    _template_engine      = None
+    _logger               = get_logger('%s.Controller' % (__name__))
+    _db_logger            = get_logger('%s.Controller' % (__name__))
+    _default_output_cache = None
+
+    _default_output_cache_size = 67108864
+    _stream_buffer_size        = 8192
 
 
     def __init__(self, *args, **kwargs):
         RequestHandler.__init__(self, *args, **kwargs)
 
-        self._session = None
+        self._session    = None
+        self._db_profile = instrument.Profile()
+
+        instrument.activate(self._db_profile)
+
+    @property
+    def db_profile(self):
+        """ Profile of the database operations done while handling the request
+
+        :rtype: tori.db.instrument.Profile
+
+        .. note::
+
+            The operations are only attributed to the request while the request is handled synchronously, i.e.,
+            until :meth:`on_finish` without yielding to the I/O loop.
+        """
+        return self._db_profile
+
+    def finish(self, chunk=None):
+        # Save the changes of the session at once (before the headers are sent for the cookie sessions). The failure
+        # is only logged as the response must still be finished.
+        if self._session:
+            try:
+                self._session.flush()
+            except Exception as exception:
+                self._logger.error('Unable to save the session {} ({}).'.format(self._session.id, exception))
+
+        RequestHandler.finish(self, chunk)
+
+    def on_finish(self):
+        if instrument.active_profile() is self._db_profile:
+            instrument.deactivate()
+
+        if not self._db_profile.counters:
+            return
+
+        self._db_logger.info('%s %s: %s' % (self.request.method, self.request.uri, self._db_profile))
 
     @property
     def is_xhr(self):
@@ -85,7 +141,7 @@ class Controller(RequestHandler):
             else:
                 self.set_cookie(cookie_key, ssid)
 
-        self._session = SessionController(self.component('session'), ssid)
+        self._session = SessionController(self.component('session').bind(self), ssid)
 
         return self._session
 
@@ -102,40 +158,174 @@ class Controller(RequestHandler):
         """
         return 'cookie_secret' in self.settings and self.settings['cookie_secret']
 
-    def render_template(self, template_name, **contexts):
+    def _prepare_template_contexts(self, contexts):
         """
-        Render the template with the given contexts.
+        Prepare the contexts for the template engine.
 
-        See :meth:`tori.renderer.Renderer.render` for more information.
+        :param contexts: the contexts given by the controller
+        :type  contexts: dict
+        :rtype: dict
         """
-
         # If the rendering source isn't set, break the code.
         if not self._template_base_path:
             raise RenderingSourceMissingError('The source of template is not identified. This method is disabled.')
 
-        # If the rendering engine is not specified, use the default one.
-        if not self._template_engine:
-            self._template_engine = DefaultRenderer
-
         contexts['app'] = {
-            'request': self.request,
-            'session': self.session.get
+            'request':  self.request,
+            'session':  self.session.get,
+            'fragment': self.render_fragment
         }
 
-        output = self.template_engine.render(template_name, **contexts)
+        return contexts
+
+    def render_template(self, template_name, **contexts):
+        """
+        Render the template with the given contexts.
+
+        See :meth:`tori.renderer.Renderer.render` for more information.
+        """
+        output = self.template_engine.render(template_name, **self._prepare_template_contexts(contexts))
 
         if not output:
             raise UnexpectedComputationError('Detected the rendering service malfunctioning.')
 
         return output
 
-    def render(self, template_name, **contexts):
+    def stream_template(self, template_name, **contexts):
+        """
+        Render the template with the given contexts progressively.
+
+        See :meth:`tori.renderer.Renderer.stream` for more information.
+
+        :rtype: generator
+        """
+        return self.template_engine.stream(template_name, **self._prepare_template_contexts(contexts))
+
+    def render_stream(self, template_name, buffer_size=None, **contexts):
+        """
+        Render the template with the given contexts and flush the output to the client as it is produced.
+
+        The beginning of the page (e.g., ``<head>`` and the critical stylesheets) reaches the browser while the rest
+        of the page is still being rendered.
+
+        :param buffer_size: the number of characters buffered before each flush (by default, the setting
+                            ``template_stream_buffer_size`` or 8192)
+        :type  buffer_size: int
+
+        .. warning::
+            As the headers are sent on the first flush, they must be set before calling this method and an error
+            raised while rendering cannot change the response status.
+        """
+        buffer_size = buffer_size or int(AppSettings.get('template_stream_buffer_size', self._stream_buffer_size))
+        chunks      = []
+        length      = 0
+
+        for chunk in self.stream_template(template_name, **contexts):
+            chunks.append(chunk)
+
+            length += len(chunk)
+
+            if length < buffer_size:
+                continue
+
+            self.write(''.join(chunks))
+            self.flush()
+
+            chunks = []
+            length = 0
+
+        # The rest is sent on finish.
+        if chunks:
+            self.write(''.join(chunks))
+
+    def render(self, template_name, cache_key=None, ttl=None, tags=None, vary_on=None, **contexts):
         """
         Render the template with the given contexts and push the output buffer.
 
         See :meth:`tori.renderer.Renderer.render` for more information.
+
+        :param cache_key: the key to cache the output (the output is not cached if ``None``)
+        :type  cache_key: str
+        :param ttl: the lifespan of the cached output in seconds (unlimited if ``None``)
+        :type  ttl: int
+        :param tags: the list of tags to invalidate the cached output with :meth:`invalidate_output`
+        :type  tags: list
+        :param vary_on: the list of ``user``, ``session`` or names of request headers to cache the output separately
+        :type  vary_on: list
+
+        For example,
+
+        .. code-block:: python
+
+            self.render('index.html', cache_key='home', ttl=60, tags=['news'], vary_on=['Accept-Language'])
+        """
+        if cache_key is None:
+            return self.write(self.render_template(template_name, **contexts))
+
+        self.write(self.render_fragment(cache_key, template_name, ttl, tags, vary_on, **contexts))
+
+    def render_fragment(self, name, template_name, ttl=None, tags=None, vary_on=None, **contexts):
+        """
+        Render the template as a named fragment and cache the output.
+
+        The fragment is also available to the templates as ``app.fragment``, e.g.,
+        ``{{ app.fragment('sidebar', 'sidebar.html', ttl=300) }}``.
+
+        See :meth:`render` for the parameters.
+
+        :rtype: str
+        """
+        key    = self._compose_output_key(name, vary_on or [])
+        output = self.output_cache.get(key)
+
+        if output is None:
+            output = self.render_template(template_name, **contexts)
+
+            self.output_cache.set(key, output, ttl=ttl, tags=tags)
+
+        return output
+
+    def invalidate_output(self, *tags):
+        """
+        Invalidate the cached output with any of the given tags.
+
+        :param tags: the tags given on :meth:`render` or :meth:`render_fragment`
+        """
+        for tag in tags:
+            self.output_cache.invalidate(tag)
+
+    @property
+    def output_cache(self):
+        """ Output Cache
+
+        The storage is the service ``output_cache`` (in-memory by default).
+
+        :rtype: tori.cache.base.Base
         """
-        self.write(self.render_template(template_name, **contexts))
+        output_cache = self.component('output_cache')
+
+        if output_cache:
+            return output_cache
+
+        if not Controller._default_output_cache:
+            Controller._default_output_cache = MemoryCache(self._default_output_cache_size)
+
+        return Controller._default_output_cache
+
+    def _compose_output_key(self, name, vary_on):
+        parts = ['output', name]
+
+        for criterion in vary_on:
+            if criterion == 'user':
+                value = self.current_user
+            elif criterion == 'session':
+                value = self.session.id if self.session else None
+            else:
+                value = self.request.headers.get(criterion)
+
+            parts.append('{}={}'.format(criterion, value if value is not None else ''))
+
+        return '/'.join(parts)
 
     @property
     def template_engine(self):
@@ -144,20 +334,30 @@ class Controller(RequestHandler):
         :rtype: tori.template.renderer.Renderer
         """
 
-        # If the rendering engine is not specified, use the default one.
-        if not self._template_engine:
-            self._template_engine = DefaultRenderer
+        return self.resolve_renderer(self.component('renderer'))
 
-        try:
-            return self.component('renderer').use(self._template_base_path)
-        except RendererNotFoundError:
-            # When the renderer is not found. It is possible that the renderer is not yet
-            # instantiated. This block of the code will do the lazy loading.
-            renderer = self._template_engine(self._template_base_path)
+    @classmethod
+    def resolve_renderer(cls, rendering_service):
+        """ Resolve the renderer of the controller class
+
+        The renderer is cached on the class so that the lookup is done once per class. Normally, the renderers are
+        resolved by :class:`tori.application.Application` on start.
+
+        :param rendering_service: the rendering service
+        :type  rendering_service: tori.template.service.RenderingService
+        :rtype: tori.template.renderer.Renderer
+        """
+        # Only use the renderer resolved for this class as the subclasses may use the different templates.
+        resolved = cls.__dict__.get('_resolved_renderer')
 
-            self.component('renderer').register(renderer)
+        if resolved and resolved[0] is rendering_service:
+            return resolved[1]
 
-            return renderer
+        renderer = rendering_service.obtain(cls._template_base_path, cls._template_engine or DefaultRenderer)
+
+        cls._resolved_renderer = (rendering_service, renderer)
+
+        return renderer
 
 class RestController(Controller):
     """
@@ -238,14 +438,34 @@ class ResourceService(RequestHandler):
         'AAMAAAABAAAAAAAA'
     ]))
 
-    _patterns      = {}
-    _pattern_order = []
-    _cache_objects = {}
+    _patterns       = {}
+    _pattern_order  = []
+    _pattern_engine = None
 
     _plugins            = {}
     _plugins_tag_name   = 'resource-service-plugin'
     _plugins_registered = False
 
+    _validators            = {}
+    _chunk_size            = 65536
+    _fingerprinted_max_age = 31536000
+    _re_fingerprint        = RegExp('[.-][0-9a-f]{8,}\\.[^.]+$')
+
+    _encodings            = {'gzip': ('.gz', compress_with_gzip)}
+    _encoding_order       = ['br', 'gzip']
+    _compressible_types   = [
+        'application/javascript', 'application/x-javascript', 'application/json', 'application/xml',
+        'image/svg+xml'
+    ]
+    _min_compressed_size  = 256
+
+    if brotli:
+        _encodings['br'] = ('.br', brotli.compress)
+
+    _cache                   = None
+    _default_cache_size      = 33554432
+    _max_cached_content_size = 1048576
+
     @staticmethod
     def add_pattern(pattern, base_path, enable_cache=False):
         """
@@ -263,61 +483,389 @@ class ResourceService(RequestHandler):
             'cacheable': enable_cache
         }
         ResourceService._pattern_order.append(pattern)
+        ResourceService._pattern_engine = None
+
+    @staticmethod
+    def cache():
+        """
+        Get the cache of the resources shared by all handlers.
+
+        The cached content is keyed on the path of the file and invalidated when the file is modified. The total size
+        is limited by the setting ``resource_cache_size`` (in bytes, 32 MB by default) by discarding the least recently
+        used content. Only the resources whose pattern enables the cache and whose size is at most 1 MB are cached.
+
+        :rtype: tori.cache.memory.Memory
+        """
+        if not ResourceService._cache:
+            max_size = AppSettings.get('resource_cache_size', ResourceService._default_cache_size)
+
+            ResourceService._cache = MemoryCache(int(max_size))
+
+        return ResourceService._cache
 
+    @asynchronous
     def get(self, path=None):
         """
         Get a particular resource.
 
         :param path: blocks of path used to composite an actual path.
 
-        .. note::
-            This method requires refactoring.
+        The response can be validated with ``If-None-Match`` or ``If-Modified-Since`` and, unless the resource is
+        modified by a plugin, partially requested with a single byte range. Large files are streamed in chunks.
+        """
+        self._serve(True)
+
+    @asynchronous
+    def head(self, path=None):
         """
+        Get the headers of a particular resource.
+
+        :param path: blocks of path used to composite an actual path.
+        """
+        self._serve(False)
+
+    def on_connection_close(self):
+        self._close_stream()
+
+    def on_finish(self):
+        self._close_stream()
+
+    def _serve(self, include_body):
         resource = self._retrieve_resource_entity()
 
         if isinstance(resource, str):
             self.set_header('Content-Type', 'image/vnd.microsoft.icon')
             return self.finish(resource)
-        elif resource.exists and resource.cacheable:
-            self._cache_objects[self.request.uri] = resource
         elif not resource.exists:
             # Return HTTP 404 if the content is not found.
             self._logger.error('%s could not be found.' % resource.path)
 
             raise HTTPError(404)
 
-        # Get the content type.
-        self.set_header("Content-Type", resource.kind or 'text/plain')
+        size, etag, last_modified = self._get_validators(resource.path)
 
         # Retrieve the plugins if registered.
-        if not ResourceService._plugins and not ResourceService._plugins_registered:
+        if not ResourceService._plugins_registered:
             ResourceService._plugins = services.find_by_tag(
                 ResourceService._plugins_tag_name
             )
 
-        # Apply the plugin.
-        for plugin in ResourceService._plugins:
-            if plugin.expect(resource):
+            ResourceService._plugins_registered = True
+
+        plugins      = [plugin for plugin in ResourceService._plugins if plugin.expect(resource)]
+        cacheable    = resource.cacheable and size <= self._max_cached_content_size
+        compressible = cacheable and size >= self._min_compressed_size and self._is_compressible(resource.kind)
+        encoding     = self._select_encoding() if compressible else None
+
+        # The content modified by another chain of plugins is a different representation of the resource.
+        if plugins:
+            etag = '"%s-%s"' % (etag[1:-1], self._fingerprint_plugins(plugins))
+
+        identity_etag = etag
+
+        # Each encoded variant is a different representation of the resource.
+        if encoding:
+            etag = '"%s-%s"' % (etag[1:-1], encoding)
+
+        # Get the content type.
+        self.set_header("Content-Type", resource.kind or 'text/plain')
+        self.set_header('Etag', etag)
+        self.set_header('Last-Modified', last_modified)
+
+        if compressible:
+            self.set_header('Vary', 'Accept-Encoding')
+
+        if self._re_fingerprint.search(p.basename(resource.path)):
+            self.set_header('Cache-Control', 'public, max-age=%d' % self._fingerprinted_max_age)
+
+        if self._is_not_modified(etag, last_modified):
+            self.set_status(304)
+
+            return self.finish()
+
+        content = None
+
+        if encoding:
+            content = self._load_encoded_content(resource, plugins, identity_etag, encoding)
+
+            self.set_header('Content-Encoding', encoding)
+
+            return self._finish_content(content, include_body)
+        elif cacheable:
+            content = self._load_content(resource, plugins, etag)
+        elif plugins and size <= self._max_cached_content_size:
+            content = self._transform(resource, plugins, etag)
+        elif plugins:
+            # Apply the plugin.
+            for plugin in plugins:
                 resource = plugin.execute(resource)
-            # End the iteration
 
-        # Return the content.
+            content = resource.content
+
+        # The content modified by the plugins has to be sent as a whole.
+        if plugins:
+            # Return the content.
+            try:
+                return self._finish_content(content, include_body)
+            except Exception as e:
+                raise HTTPError(500)
+
+        self.set_header('Accept-Ranges', 'bytes')
+
+        start, end = 0, size - 1
+        byte_range = self._parse_byte_range(self.request.headers.get('Range'), size)
+
+        if byte_range is False:
+            self.set_status(416)
+            self.set_header('Content-Range', 'bytes */%d' % size)
+
+            return self.finish()
+        elif byte_range:
+            start, end = byte_range
+
+            self.set_status(206)
+            self.set_header('Content-Range', 'bytes %d-%d/%d' % (start, end, size))
+
+        self.set_header('Content-Length', end - start + 1)
+
+        if not include_body or end < start:
+            return self.finish()
+
+        if content is not None:
+            return self.finish(content[start:end + 1])
+
+        self._stream        = open(resource.path, 'rb')
+        self._stream_length = end - start + 1
+
+        self._stream.seek(start)
+
+        self._send_next_chunk()
+
+    def _finish_content(self, content, include_body):
+        """ Finish the response with the whole content or only with its length for ``HEAD``. """
+        if include_body:
+            return self.finish(content)
+
+        self.set_header('Content-Length', len(utf8(content)))
+
+        self.finish()
+
+    def _fingerprint_plugins(self, plugins):
+        """ Fingerprint the chain of plugins by their classes so that the entity tag is the same on every server. """
+        chain = ','.join(['%s.%s' % (type(plugin).__module__, type(plugin).__name__) for plugin in plugins])
+
+        return hashlib.md5(chain.encode('utf-8')).hexdigest()[:8]
+
+    def _get_cached_content(self, key, etag):
+        """ Get the cached content of the file unless the file is modified since it is cached. """
+        cached = self.cache().get(key)
+
+        if cached is None:
+            return None
+
+        cached_etag, content = cached
+
+        if cached_etag != etag:
+            self.cache().delete(key)
+
+            return None
+
+        return content
+
+    def _load_content(self, resource, plugins, etag):
+        """ Load the content of the cacheable resource. """
+        content = self._get_cached_content(resource.path, etag)
+
+        if content is not None:
+            return content
+
+        if plugins:
+            return self._transform(resource, plugins, etag)
+
+        with open(resource.path, 'rb') as f:
+            content = f.read()
+
+        self.cache().set(resource.path, (etag, content), size=len(content))
+
+        return content
+
+    def _transform(self, resource, plugins, etag):
+        """ Apply the plugins to the resource only once per version of the file and chain of plugins. """
+        # The plugins are the instances shared through the service container.
+        key     = (resource.path, tuple([id(plugin) for plugin in plugins]))
+        content = self._get_cached_content(key, etag)
+
+        if content is not None:
+            return content
+
+        # Apply the plugin.
+        for plugin in plugins:
+            resource = plugin.execute(resource)
+
+        content = resource.content
+
+        self.cache().set(key, (etag, content), size=len(content))
+
+        return content
+
+    def _load_encoded_content(self, resource, plugins, etag, encoding):
+        """
+        Load the encoded content of the cacheable resource.
+
+        :param etag: the entity tag of the original content
+
+        The content is only encoded on the first request. If the file is not modified by the plugins, the encoded file
+        next to it (e.g., ``main.css.gz`` for ``main.css``) is used instead when it is not older than the original file.
+        """
+        key     = (resource.path, encoding)
+        content = self._get_cached_content(key, etag)
+
+        if content is not None:
+            return content
+
+        precompressed_path = resource.path + self._encodings[encoding][0]
+
+        if not plugins and p.exists(precompressed_path) and p.getmtime(precompressed_path) >= p.getmtime(resource.path):
+            with open(precompressed_path, 'rb') as f:
+                content = f.read()
+        else:
+            content = self._load_content(resource, plugins, etag)
+
+            if not isinstance(content, bytes):
+                content = content.encode('utf-8')
+
+            content = self._encodings[encoding][1](content)
+
+        self.cache().set(key, (etag, content), size=len(content))
+
+        return content
+
+    def _is_compressible(self, kind):
+        return kind is not None and (kind.startswith('text/') or kind in self._compressible_types)
+
+    def _select_encoding(self):
+        """ Select the most preferred encoding accepted by the client. """
+        accepted_encodings = {}
+
+        for accepted_encoding in self.request.headers.get('Accept-Encoding', '').split(','):
+            name, separator, parameter = accepted_encoding.partition(';')
+
+            name       = name.strip().lower()
+            parameter  = parameter.replace(' ', '')
+            preference = 1.0
+
+            if parameter.startswith('q='):
+                try:
+                    preference = float(parameter[2:])
+                except ValueError:
+                    continue
+
+            accepted_encodings[name] = preference
+
+        for encoding in self._encoding_order:
+            if encoding in self._encodings and accepted_encodings.get(encoding, 0) > 0:
+                return encoding
+
+        return None
+
+    def _send_next_chunk(self):
+        if not self._stream:
+            return
+
+        chunk = self._stream.read(min(self._chunk_size, self._stream_length))
+
+        self._stream_length -= len(chunk)
+
+        if not chunk or self._stream_length <= 0:
+            self._close_stream()
+
+            return self.finish(chunk)
+
+        # Only read the next chunk when the previous one is sent to keep the memory usage constant.
+        self.write(chunk)
+        self.flush(callback=self._send_next_chunk)
+
+    def _close_stream(self):
+        if '_stream' not in self.__dict__ or not self._stream:
+            return
+
+        self._stream.close()
+        self._stream = None
+
+    def _get_validators(self, path):
+        """ Get the size, entity tag and last modified time of the file, computed once per modification. """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise HTTPError(404)
+
+        key = (stat.st_mtime, stat.st_size)
+
+        if path not in self._validators or self._validators[path][0] != key:
+            last_modified = datetime.datetime.utcfromtimestamp(int(stat.st_mtime))
+            etag          = '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+
+            self._validators[path] = (key, (stat.st_size, etag, last_modified))
+
+        return self._validators[path][1]
+
+    def _is_not_modified(self, etag, last_modified):
+        if_none_match = self.request.headers.get('If-None-Match')
+
+        # If-None-Match takes precedence over If-Modified-Since.
+        if if_none_match:
+            candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+
+            return '*' in candidates or etag in candidates or 'W/' + etag in candidates
+
+        if_modified_since = self.request.headers.get('If-Modified-Since')
+
+        if not if_modified_since:
+            return False
+
+        since = parsedate(if_modified_since)
+
+        return since is not None and datetime.datetime(*since[:6]) >= last_modified
+
+    @staticmethod
+    def _parse_byte_range(header, size):
+        """
+        Parse the value of the Range header.
+
+        :returns: the first and last positions, ``None`` if the whole content is sent or ``False`` if unsatisfiable.
+        """
+        if not header or not header.startswith('bytes=') or ',' in header:
+            # Multiple ranges are not supported. The whole content is sent instead.
+            return None
+
+        first, separator, last = header[6:].strip().partition('-')
+
         try:
-            self.finish(resource.content)
-        except Exception as e:
-            raise HTTPError(500)
+            if not first:
+                # Suffix range, e.g., the last 500 bytes
+                length = int(last)
+
+                return (max(size - length, 0), size - 1) if length > 0 and size > 0 else False
+
+            first = int(first)
+            last  = min(int(last), size - 1) if last else size - 1
+        except ValueError:
+            return None
+
+        if first >= size:
+            return False
+
+        # An invalid range is ignored.
+        return (first, last) if first <= last else None
 
     def _retrieve_resource_entity(self):
         request_uri = self.request.uri
         path        = sub('\?.*$', '', request_uri)
 
-        if request_uri in self._cache_objects:
-            return self._cache_objects[request_uri]
-
         # If the request URI is already pre-calculated or fixed, load the
         # entity from the corresponding path.
-        elif request_uri in ResourceService._patterns:
-            pattern = ResourceService._patterns[request_uri]
+        if path in ResourceService._patterns:
+            pattern = ResourceService._patterns[path]
 
             return self._create_resource_entity(pattern['base_path'], pattern['cacheable'])
 
@@ -330,29 +878,32 @@ class ResourceService(RequestHandler):
         return ResourceEntity(real_path, cachable)
 
     def _get_resource_on_non_precalculated_pattern(self, request_uri):
-        for pattern in ResourceService._pattern_order:
-            pattern_info = ResourceService._patterns[pattern]
+        if not ResourceService._pattern_engine:
+            ResourceService._pattern_engine = RoutingEngine(anchored=False)
 
-            base_path = pattern_info['base_path']
-            cachable  = pattern_info['cacheable']
+            for pattern in ResourceService._pattern_order:
+                ResourceService._pattern_engine.add(pattern, pattern)
 
-            self._logger.debug('Comparing Pattern: %s' % pattern)
+        pattern, matches = ResourceService._pattern_engine.match(request_uri)
 
-            matches = match(pattern, request_uri)
+        if not matches:
+            if self.request.uri == '/favicon.ico':
+                return self._favicon_data
 
-            if not matches:
-                continue
+            raise HTTPError(404)
+
+        pattern_info = ResourceService._patterns[pattern]
 
-            real_path = p.abspath(p.join(
-                base_path,
-                matches.groups()[0]
-            ))
+        base_path = pattern_info['base_path']
+        cachable  = pattern_info['cacheable']
 
-            self._logger.info('Real path: %s' % real_path)
+        self._logger.debug('Matched Pattern: %s' % pattern)
 
-            return self._create_resource_entity(real_path, cachable)
+        real_path = p.abspath(p.join(
+            base_path,
+            matches.groups()[0]
+        ))
 
-        if self.request.uri == '/favicon.ico':
-            return self._favicon_data
+        self._logger.info('Real path: %s' % real_path)
 
-        raise HTTPError(404)
\ No newline at end of file
+        return self._create_resource_entity(real_path, cachable)
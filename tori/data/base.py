@@ -1,3 +1,6 @@
+import gzip
+
+from io        import BytesIO
 from mimetypes import guess_type as get_type
 from os        import path as p
 from imagination.helper import retrieve_module_path
@@ -20,6 +23,24 @@ def resolve_file_path(file_path):
 
     return p.join(module_path, relative_path)
 
+def compress_with_gzip(content, level=9):
+    """
+    Compress the given content with gzip.
+
+    :param content: the content being compressed
+    :type  content: bytes
+    :param level: the compression level
+    :type  level: int
+    :rtype: bytes
+    """
+    buffer = BytesIO()
+
+    # Fix the modification time so that the compressed content is always the same.
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=level, mtime=0) as f:
+        f.write(content)
+
+    return buffer.getvalue()
+
 class ResourceEntity(object):
     """
     Static resource entity representing the real static resource which is already loaded to the memory.
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Asset Bundles
+#############
+
+:Author: Juti Noppornpitak <jnopporn@shiroyuki.com>
+:Stability: Testing
+
+A bundle concatenates a group of CSS or JavaScript files, minifies them through the resource service plugins and
+writes the result to a file whose name contains the hash of the content (e.g., ``app.3f9a1b2c4d.css``). As the
+name changes whenever the content changes, the bundle can be cached by the browser for a year.
+
+The bundles are declared in the resource route and built when the application starts. For example,
+
+.. code-block:: xml
+
+    <resource location="static" pattern="/static(/.*)" cache="true">
+        <bundle name="app.css" output="bundles">
+            <include>css/reset.css</include>
+            <include>css/main.css</include>
+        </bundle>
+    </resource>
+
+The fingerprinted URL is then available to the templates rendered by :class:`tori.template.renderer.DefaultRenderer`:
+
+.. code-block:: html
+
+    <link rel="stylesheet" href="{{ asset_url('/static/bundles/app.css') }}">
+"""
+import codecs
+import hashlib
+import os
+
+from tori.data.base        import ResourceEntity
+from tori.decorator.common import singleton
+from tori.exception        import *
+
+@singleton
+class AssetManifest(object):
+    """ Manifest mapping the URLs of the assets to their fingerprinted URLs """
+
+    def __init__(self):
+        self._map = {}
+
+    def set(self, url, fingerprinted_url):
+        """
+        Register the fingerprinted URL of the asset.
+
+        :param url: the URL of the asset
+        :type  url: str
+        :param fingerprinted_url: the fingerprinted URL
+        :type  fingerprinted_url: str
+        """
+        self._map[url] = fingerprinted_url
+
+    def get(self, url):
+        """
+        Get the fingerprinted URL of the asset.
+
+        :param url: the URL of the asset
+        :type  url: str
+        :return: the fingerprinted URL or the given URL if the asset is not fingerprinted.
+        :rtype: str
+        """
+        return self._map.get(url, url)
+
+    def export(self):
+        """
+        Export the manifest.
+
+        :rtype: dict
+        """
+        return dict(self._map)
+
+class Bundle(object):
+    """
+    Bundle of assets
+
+    :param name: the name of the bundle (e.g., ``app.css``)
+    :type  name: str
+    :param base_path: the location of the static resources
+    :type  base_path: str
+    :param sources: the paths to the bundled files relative to ``base_path``
+    :type  sources: list
+    :param output: the path to the directory of the bundle relative to ``base_path``
+    :type  output: str
+    :param url_prefix: the URL prefix of the static resources (e.g., ``/static``)
+    :type  url_prefix: str
+    """
+
+    fingerprint_length = 10
+
+    def __init__(self, name, base_path, sources, output='', url_prefix=''):
+        if not sources:
+            raise InvalidInput('The bundle {} does not include any files.'.format(name))
+
+        self.name       = name
+        self.base_path  = base_path
+        self.sources    = sources
+        self.output     = output
+        self.url_prefix = url_prefix.rstrip('/')
+
+    @property
+    def url(self):
+        """ The URL of the bundle without the fingerprint """
+        return '/'.join([part for part in [self.url_prefix, self.output.strip('/'), self.name] if part])
+
+    def build(self, plugins=[]):
+        """
+        Build the bundle and register it to :class:`AssetManifest`.
+
+        :param plugins: the resource service plugins (:class:`tori.data.base.ResourceServiceMiddleware`)
+        :type  plugins: list
+        :return: the fingerprinted URL
+        :rtype: str
+        """
+        contents = []
+
+        for source in self.sources:
+            source_path = os.path.join(self.base_path, source)
+
+            if not os.path.exists(source_path):
+                raise InvalidInput('{} (bundled in {}) is not found.'.format(source_path, self.name))
+
+            with codecs.open(source_path, 'r', 'utf-8') as f:
+                contents.append(f.read())
+
+        # Let the plugins decide by the type of the bundle.
+        output_directory = os.path.join(self.base_path, self.output)
+        resource         = ResourceEntity(os.path.join(output_directory, self.name))
+
+        resource.content = '\n'.join(contents)
+
+        for plugin in plugins:
+            if plugin.expect(resource):
+                resource = plugin.execute(resource)
+
+        content     = resource.content.encode('utf-8')
+        fingerprint = hashlib.md5(content).hexdigest()[:self.fingerprint_length]
+
+        stem, extension    = os.path.splitext(self.name)
+        fingerprinted_name = '{}.{}{}'.format(stem, fingerprint, extension)
+        fingerprinted_path = os.path.join(output_directory, fingerprinted_name)
+
+        if not os.path.exists(output_directory):
+            os.makedirs(output_directory)
+
+        # The same name always has the same content.
+        if not os.path.exists(fingerprinted_path):
+            with open(fingerprinted_path, 'wb') as f:
+                f.write(content)
+
+        fingerprinted_url = '{}/{}'.format(self.url.rsplit('/', 1)[0], fingerprinted_name)\
+            if '/' in self.url\
+            else fingerprinted_name
+
+        AssetManifest.instance().set(self.url, fingerprinted_url)
+
+        return fingerprinted_url
@@ -1,41 +1,335 @@
-from re import search, sub, split
+from re import compile as RegExp, IGNORECASE, DOTALL
 
 from tori.data.base import ResourceServiceMiddleware
 
+_css_special_token     = RegExp('\\s*([{};,])\\s*|(\\s*)([:>+~])(\\s*)|\\s+|["\'/()]|url\\(', IGNORECASE)
+_css_at_rule           = RegExp('@([-\\w]+)')
+_css_declaration_rules = ['font-face', 'page', 'viewport', '-ms-viewport']
+_css_simple_block      = RegExp('[^{}"\'/()\\\\]*\\}') # without strings, comments, functions and escapes
+_css_simple_rule       = RegExp('([^{}"\'/()\\\\\\[\\]@;]*)\\{([^{}"\'/()\\\\]*)\\}')
+_css_spaces            = RegExp('\\s+')
+_css_tight_in_blocks   = ':;,'
+_css_tight_in_rules    = ',>+~'
+_css_whitespaces       = ' \t\n\r\f'
+
+_html_preformatted = RegExp('(<(pre|textarea|script|style)\\b.*?</\\2\\s*>)', IGNORECASE | DOTALL)
+_html_line_breaks  = RegExp('[ \t\r\f\v]*\n\\s*')
+_html_spaces       = RegExp('[ \t\r\f\v]+')
+
+def minify_css(content):
+    """
+    Minify the stylesheet in a single pass.
+
+    The comments are removed and the whitespaces are collapsed where they are insignificant. Strings, ``url()`` and
+    the whitespaces in selectors (e.g., ``a :hover``) and in expressions (e.g., ``calc(1px + 2px)``) are preserved.
+
+    The rules and the declaration blocks without strings, comments, functions and attribute selectors (e.g.,
+    ``a > b { color : red ; }``), which are the most of a stylesheet, are minified at once with the regular
+    expressions and the string replacements instead of token by token.
+
+    :param content: the stylesheet
+    :type  content: str
+    :rtype: str
+    """
+    output          = []
+    position        = 0
+    length          = len(content)
+    pending_space   = False
+    last_tight      = True  # Whether the whitespaces after the last token are insignificant
+    contexts        = []    # True for a declaration block or False for a block of rules
+    statement_start = None
+    paren_depth     = 0
+    search          = _css_special_token.search
+    append          = output.append
+
+    while position < length:
+        # Minify the rule at once if both the selectors and the declarations are simple.
+        if statement_start is None and not paren_depth and not (contexts and contexts[-1]):
+            rule = _css_simple_rule.match(content, position)
+
+            if rule:
+                append(_collapse_css_selectors(rule.group(1)))
+                append('{')
+                append(_collapse_css_declarations(rule.group(2)))
+                append('}')
+
+                pending_space = False
+                last_tight    = True
+                position      = rule.end()
+
+                continue
+
+        matches = search(content, position)
+        start   = matches.start() if matches else length
+
+        # Copy the plain text at once.
+        if start > position:
+            if pending_space and not last_tight:
+                append(' ')
+
+            if statement_start is None:
+                statement_start = position
+
+            append(content[position:start])
+
+            pending_space = False
+            last_tight    = False
+            position      = start
+
+        if not matches:
+            break
+
+        token       = matches.group(0)
+        punctuation = matches.group(1)
+
+        # The whitespaces around the braces, semicolons and commas are always insignificant.
+        if punctuation:
+            if punctuation == '{':
+                at_rule = _css_at_rule.match(content, statement_start) if statement_start is not None else None
+
+                contexts.append(not at_rule or at_rule.group(1).lower() in _css_declaration_rules)
+
+                paren_depth = 0
+                block       = _css_simple_block.match(content, matches.end()) if contexts[-1] else None
+
+                if block:
+                    append('{')
+                    append(_collapse_css_declarations(block.group(0)[:-1]))
+                    append('}')
+
+                    contexts.pop()
+
+                    statement_start = None
+                    pending_space   = False
+                    last_tight      = True
+                    position        = block.end()
+
+                    continue
+            elif punctuation == '}':
+                # The last semicolon in a block is optional.
+                if output and output[-1] == ';':
+                    output.pop()
+
+                if contexts:
+                    contexts.pop()
+
+            if punctuation == ',':
+                if statement_start is None:
+                    statement_start = position
+            else:
+                statement_start = None
+
+            append(punctuation)
+
+            pending_space = False
+            last_tight    = True
+            position      = matches.end()
+
+            continue
+
+        in_declaration = bool(contexts) and contexts[-1]
+        operator       = matches.group(3)
+
+        if operator:
+            if operator == ':':
+                tight = in_declaration or paren_depth > 0
+            else:
+                # The combinators in selectors vs. the operators in expressions (e.g., calc(1px + 2px))
+                tight = not in_declaration and paren_depth == 0
+
+            if (pending_space or matches.group(2)) and not tight and not last_tight:
+                append(' ')
+
+            if statement_start is None:
+                statement_start = position
+
+            append(operator)
+
+            pending_space = bool(matches.group(4)) and not tight and operator != ':'
+            last_tight    = tight or operator == ':'
+            position      = matches.end()
+
+            continue
+
+        character = token[0]
+
+        if character in _css_whitespaces:
+            pending_space = bool(output)
+            position      = matches.end()
+
+            continue
+
+        if character == '/' and content.startswith('/*', position):
+            end      = content.find('*/', position + 2)
+            position = length if end < 0 else end + 2
+
+            continue
+
+        if character in '"\'':
+            end = position + 1
+
+            while end < length and content[end] != character:
+                end += 2 if content[end] == '\\' else 1
+
+            end = min(end + 1, length)
+
+            if pending_space and not last_tight:
+                append(' ')
+
+            if statement_start is None:
+                statement_start = position
+
+            append(content[position:end])
+
+            pending_space = False
+            last_tight    = False
+            position      = end
+
+            continue
+
+        if len(token) > 1:
+            # Copy the unquoted URL as it is.
+            end = position + len(token)
+
+            while end < length and content[end] in _css_whitespaces:
+                end += 1
+
+            if end < length and content[end] not in '"\'':
+                end = content.find(')', end)
+                end = length if end < 0 else end + 1
+            else:
+                end         = position + len(token)
+                paren_depth += 1
+
+            if pending_space and not last_tight:
+                append(' ')
+
+            if statement_start is None:
+                statement_start = position
+
+            append(content[position:end])
+
+            pending_space = False
+            last_tight    = end < length and content[end - 1] == '('
+            position      = end
+
+            continue
+
+        if pending_space and not last_tight and character != ')':
+            append(' ')
+
+        if character == '(':
+            paren_depth += 1
+        elif character == ')':
+            paren_depth = max(paren_depth - 1, 0)
+
+        if statement_start is None:
+            statement_start = position
+
+        append(character)
+
+        pending_space = False
+        last_tight    = character == '('
+
+        position     += 1
+
+    return ''.join(output)
+
+def _collapse_css(content, tight_characters):
+    content = _css_spaces.sub(' ', content).strip()
+
+    for character in tight_characters:
+        if character in content:
+            content = content.replace(' ' + character, character).replace(character + ' ', character)
+
+    return content
+
+def _collapse_css_selectors(content):
+    # The whitespace before a pseudo-class is a descendant combinator (e.g., "a :hover").
+    return _collapse_css(content, _css_tight_in_rules).replace(': ', ':')
+
+def _collapse_css_declarations(content):
+    content = _collapse_css(content, _css_tight_in_blocks)
+
+    # The last semicolon in a block is optional.
+    return content[:-1] if content.endswith(';') else content
+
+def collapse_script_whitespaces(content):
+    """
+    Remove the indentation, trailing whitespaces and blank lines from the script.
+
+    The line breaks are kept for the automatic semicolon insertion. A script with template literals is not modified.
+
+    :param content: the script
+    :type  content: str
+    :rtype: str
+    """
+    if '`' in content:
+        return content
+
+    lines        = []
+    continuation = False
+
+    for line in content.split('\n'):
+        # Preserve the whitespaces in a string continued from the previous line.
+        line = line.rstrip() if continuation else line.strip()
+
+        if line or continuation:
+            lines.append(line)
+
+        continuation = line.endswith('\\')
+
+    return '\n'.join(lines)
+
+def collapse_html_whitespaces(content):
+    """
+    Collapse the whitespaces in the HTML document.
+
+    A run of whitespaces becomes either a line break or a space. The content of ``pre``, ``textarea``, ``script`` and
+    ``style`` elements is preserved.
+
+    :param content: the HTML document
+    :type  content: str
+    :rtype: str
+    """
+    blocks = _html_preformatted.split(content)
+    output = []
+
+    # Each preformatted element yields the element and its tag name.
+    for index in range(0, len(blocks), 3):
+        block = _html_line_breaks.sub('\n', blocks[index])
+        block = _html_spaces.sub(' ', block)
+
+        output.append(block)
+
+        if index + 1 < len(blocks):
+            output.append(blocks[index + 1])
+
+    return ''.join(output).strip()
+
 class CSSCompressor(ResourceServiceMiddleware):
     def __init__(self):
         ResourceServiceMiddleware.__init__(self, 'text/css')
 
     def execute(self, data):
-        content = sub('\n+', ' ', data.content)
-
-        # Get rid of comment blocks
-        raw_blocks = split('\*\/', content)
-        blocks     = [sub('\/\*.*$', '', block) for block in raw_blocks]
-        content    = (''.join(blocks)).strip()
+        data.content = minify_css(data.content)
 
-        # Get rid of unnecessary whitespaces per line.
-        lines     = []
-        raw_lines = split('\n', content)
+        return data
 
-        for line in raw_lines:
-            line = line.strip()
+class JSCompressor(ResourceServiceMiddleware):
+    def __init__(self):
+        ResourceServiceMiddleware.__init__(self, 'application/javascript', 'application/x-javascript', 'text/javascript')
 
-            lines.append(line)
+    def execute(self, data):
+        data.content = collapse_script_whitespaces(data.content)
 
-        content = ' '.join(lines)
+        return data
 
-        # Get rid of unnecessary whitespaces as a whole.
-        content = sub('\s*>\s*', ' > ', content)
-        content = sub('\s*\+\s*', ' + ', content)
-        content = sub('\s*~\s*', ' ~ ', content)
-        content = sub('\s*:\s*', ':', content)
-        content = sub('\s*;\s*', ';', content)
-        content = sub('\s*\{\s*', '{', content)
-        content = sub('\s*\}\s*', '}', content)
-        content = sub('\s*,\s*', ',', content)
-        content = sub(' +', ' ', content)
+class HTMLCompressor(ResourceServiceMiddleware):
+    def __init__(self):
+        ResourceServiceMiddleware.__init__(self, 'text/html')
 
-        data.content = content
+    def execute(self, data):
+        data.content = collapse_html_whitespaces(data.content)
 
-        return data
\ No newline at end of file
+        return data
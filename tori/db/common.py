@@ -8,6 +8,7 @@ from bson import ObjectId
 
 from tori.data.serializer import ArraySerializer
 from tori.db.exception import ReadOnlyProxyException
+from tori.db.instrument import Measurement
 
 class Serializer(ArraySerializer):
     def extra_associations(self, data, stack_depth=0):
@@ -144,7 +145,10 @@ class ProxyObject(object):
 
     def __get_object(self):
         if not self.__dict__['_object']:
-            entity = self._collection.get(self.__dict__['_object_id'])
+            collection = self.__dict__['_collection']
+
+            with Measurement(collection._session.profile, 'proxy.dereference', collection=collection.name):
+                entity = collection.get(self.__dict__['_object_id'])
 
             if entity:
                 self.__dict__['_object'] = entity
@@ -188,6 +192,10 @@ class ProxyCollection(list):
 
         self._loaded = True
 
+        with Measurement(self._session.profile, 'proxy_collection.load', collection=self._guide.association_class.collection_name):
+            self._load_list()
+
+    def _load_list(self):
         association_class = self._guide.association_class.cls
         collection        = self._session.collection(association_class)
 
@@ -1,4 +1,11 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from bson import json_util
+from pymongo import ReadPreference
 from imagination.decorator.validator import restrict_type
+from tori.db.exception import InvalidKeysetToken
 
 class Order(object):
     """ Sorting Order Definition """
@@ -7,20 +14,42 @@ class Order(object):
     DESC = -1
     """ Descending Order """
 
+def resolve_read_preference(preference):
+    """ Resolve the read preference
+
+        :param preference: the name of the read preference (e.g., ``secondary_preferred``) or the preference itself
+        :returns: the read preference of PyMongo or ``None`` if the preference is not given
+    """
+    if not hasattr(preference, 'upper'):
+        return preference
+
+    return getattr(ReadPreference, preference.upper()) if preference else None
+
 class Criteria(object):
     """ Criteria
+
+        :param read_preference: the read preference of this query (e.g., ``secondary``) where the default is the
+                                preference of the connection
     """
     @restrict_type(condition=dict, order_by=dict, offset=int, limit=int)
-    def __init__(self, condition={}, order_by={}, offset=0, limit=0):
+    def __init__(self, condition={}, order_by={}, offset=0, limit=0, read_preference=None):
         self.condition = condition
         self.order_by  = order_by
         self.offset    = offset
         self.limit     = limit
+        self.read_preference = resolve_read_preference(read_preference)
         self.index_generated_on_the_fly = False
 
     def build_cursor(self, repository):
-        api    = repository.api
-        cursor = api.find(self.condition)
+        api = repository.api
+
+        if self.read_preference is None:
+            cursor = api.find(self.condition)
+        elif hasattr(api, 'with_options'):
+            # PyMongo 3+ only takes the read preference on the collection.
+            cursor = api.with_options(read_preference=self.read_preference).find(self.condition)
+        else:
+            cursor = api.find(self.condition, read_preference=self.read_preference)
 
         try:
             if self.order_by:
@@ -49,6 +78,106 @@ class Criteria(object):
             (name, self.order_by[name]) for name in self.order_by
         ]
 
+    @property
+    def keyset_sequence(self):
+        """ Ordering sequence for keyset pagination
+
+            The sequence is always ended with ``_id`` so that every document has a unique position.
+
+            :rtype: list
+        """
+        sequence = self.ordering_sequence
+
+        if '_id' not in self.order_by:
+            sequence.append(('_id', sequence[-1][1] if sequence else Order.ASC))
+
+        return sequence
+
+    def after(self, token=None):
+        """ Make the criteria for the page after the given keyset token.
+
+            :param token: the opaque token from :meth:`keyset_token` or ``None`` for the first page
+            :type  token: str
+
+            :rtype: tori.db.criteria.Criteria
+
+            Unlike the offset, the keyset condition lets the database seek to the next page with the index on the
+            sorting keys instead of skipping all previous documents.
+
+            The documents without a sorting key (``null``) are placed like MongoDB sorts them, i.e., first in the
+            ascending order and last in the descending order.
+        """
+        sequence  = self.keyset_sequence
+        condition = self.condition
+
+        if token:
+            values = self._decode_keyset_token(token)
+
+            if len(values) != len(sequence):
+                raise InvalidKeysetToken('The token does not belong to this ordering.')
+
+            alternatives = []
+
+            for index in range(len(sequence)):
+                name, direction = sequence[index]
+                value           = values[index]
+
+                if direction == Order.DESC and value is None:
+                    # Nothing but null comes after null in the descending order.
+                    continue
+
+                alternative = dict([(sequence[i][0], values[i]) for i in range(index)])
+
+                if direction == Order.ASC:
+                    # Null comes before any value in the ascending order.
+                    alternative[name] = {'$gt': value} if value is not None else {'$ne': None}
+                elif name == '_id':
+                    alternative[name] = {'$lt': value}
+                else:
+                    alternative['$or'] = [{name: {'$lt': value}}, {name: None}]
+
+                alternatives.append(alternative)
+
+            condition = {'$and': [condition, {'$or': alternatives}]}\
+                if condition\
+                else {'$or': alternatives}
+
+        return Criteria(condition, OrderedDict(sequence), 0, self.limit, self.read_preference)
+
+    def keyset_token(self, raw_data):
+        """ Make the opaque token pointing right after the given raw data.
+
+            :param raw_data: the raw data of the last document of the page
+            :type  raw_data: dict
+
+            :rtype: str
+        """
+        values = []
+
+        for name, direction in self.keyset_sequence:
+            value = raw_data
+
+            for key in name.split('.'):
+                value = value.get(key) if isinstance(value, dict) else None
+
+            values.append(value)
+
+        encoded_values = json.dumps(values, default=json_util.default).encode('utf-8')
+
+        return base64.urlsafe_b64encode(encoded_values).decode('ascii')
+
+    def _decode_keyset_token(self, token):
+        try:
+            encoded_values = base64.urlsafe_b64decode(token.encode('ascii'))
+            values         = json.loads(encoded_values.decode('utf-8'), object_hook=json_util.object_hook)
+        except (binascii.Error, TypeError, ValueError) as exception:
+            raise InvalidKeysetToken('The token is malformed.')
+
+        if not isinstance(values, list):
+            raise InvalidKeysetToken('The token is malformed.')
+
+        return values
+
     def __str__(self):
         statements = []
 
@@ -64,4 +193,119 @@ class Criteria(object):
         if self.limit:
             statements.append('LIMIT ' + str(self.limit))
 
+        return ' '.join(statements)
+
+    def explain(self, repository):
+        """ Explain how the database would execute this criteria.
+
+            :param repository: the repository the criteria is issued against
+            :type  repository: tori.db.repository.Repository
+
+            :rtype: tori.db.criteria.QueryPlan
+
+            .. warning::
+
+                The database actually executes the query in order to explain it. Avoid calling this method on
+                production traffic.
+        """
+        return QueryPlan(self.build_cursor(repository).explain())
+
+    @property
+    def shape(self):
+        """ Query shape
+
+            The shape is made from the condition and sorting keys but not their values so that queries which only
+            differ by values share the same query plan.
+
+            :rtype: str
+        """
+        return '{}/{}'.format(
+            ','.join(sorted(self.condition.keys())),
+            ','.join(name for name, direction in self.ordering_sequence)
+        )
+
+class QueryPlan(object):
+    """ Query Plan Summary
+
+        :param raw_plan: the output of the ``explain`` command
+        :type  raw_plan: dict
+
+        This summarizes the raw plan from both the legacy format (MongoDB 2.x) and the query-planner format
+        (MongoDB 3.0+).
+    """
+    def __init__(self, raw_plan):
+        self.raw                = raw_plan
+        self.index_name         = None
+        self.scanned_keys       = 0
+        self.scanned_documents  = 0
+        self.returned_documents = 0
+        self.sorted_in_memory   = False
+        self.duration           = 0
+
+        if 'executionStats' in raw_plan or 'queryPlanner' in raw_plan:
+            self._summarize_query_planner(raw_plan)
+        else:
+            self._summarize_legacy_plan(raw_plan)
+
+    @property
+    def uses_index(self):
+        """ Flag whether the query is answered with an index (instead of a collection scan).
+
+            :rtype: bool
+        """
+        return self.index_name is not None
+
+    @property
+    def efficiency(self):
+        """ Ratio between the number of returned documents and the number of scanned documents.
+
+            :rtype: float
+        """
+        if not self.scanned_documents:
+            return 1.0
+
+        return float(self.returned_documents) / self.scanned_documents
+
+    def _summarize_legacy_plan(self, raw_plan):
+        cursor_type = raw_plan.get('cursor', 'BasicCursor')
+
+        if cursor_type.startswith('BtreeCursor'):
+            self.index_name = cursor_type[len('BtreeCursor'):].strip() or None
+
+        self.scanned_keys       = raw_plan.get('nscanned', 0)
+        self.scanned_documents  = raw_plan.get('nscannedObjects', 0)
+        self.returned_documents = raw_plan.get('n', 0)
+        self.sorted_in_memory   = raw_plan.get('scanAndOrder', False)
+        self.duration           = raw_plan.get('millis', 0)
+
+    def _summarize_query_planner(self, raw_plan):
+        stats = raw_plan.get('executionStats', {})
+        stage = raw_plan.get('queryPlanner', {}).get('winningPlan', {})
+
+        while stage:
+            if stage.get('stage') == 'IXSCAN':
+                self.index_name = stage.get('indexName')
+            elif stage.get('stage') == 'SORT':
+                self.sorted_in_memory = True
+
+            stage = stage.get('inputStage')
+
+        self.scanned_keys       = stats.get('totalKeysExamined', 0)
+        self.scanned_documents  = stats.get('totalDocsExamined', 0)
+        self.returned_documents = stats.get('nReturned', 0)
+        self.duration           = stats.get('executionTimeMillis', 0)
+
+    def __str__(self):
+        statements = [
+            'INDEX ' + self.index_name if self.uses_index else 'COLLECTION SCAN',
+            'SCANNED {} KEYS'.format(self.scanned_keys),
+            'SCANNED {} DOCUMENTS'.format(self.scanned_documents),
+            'RETURNED {} DOCUMENTS'.format(self.returned_documents)
+        ]
+
+        if self.sorted_in_memory:
+            statements.append('SORTED IN MEMORY')
+
+        statements.append('IN {} MS'.format(self.duration))
+
         return ' '.join(statements)
\ No newline at end of file
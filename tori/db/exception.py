@@ -25,6 +25,9 @@ class ReadOnlyProxyException(Exception):
 class IntegrityConstraintError(RuntimeError):
     """ Runtime Error raised when the given value violates a integrity constraint. """
 
+class InvalidKeysetToken(ValueError):
+    """ Error raised when the keyset token for pagination is malformed or made for another ordering. """
+
 class NonRefreshableEntity(Exception):
     """ Exception thrown when the UOW attempts to refresh a non-refreshable entity """
 
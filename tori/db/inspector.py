@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Query Inspector
+###############
+
+:Author: Juti Noppornpitak <jnopporn@shiroyuki.com>
+:Stability: Testing
+
+The query inspector is designed to catch slow queries and collection scans during development. When it is given to
+:class:`tori.db.manager.Manager` or :class:`tori.db.session.Session`, every query issued through
+:meth:`tori.db.repository.Repository.find` and :meth:`tori.db.repository.Repository.count` is reported to the
+inspector.
+
+For example,
+
+.. code-block:: python
+
+    manager = Manager('sample', query_inspector=QueryInspector(slow_threshold=50))
+
+.. warning::
+
+    With ``explain_queries`` enabled, the inspector asks the database to explain every new shape of queries. This is
+    meant for development only.
+"""
+import logging
+
+from tori.common import get_logger
+
+class QueryInspector(object):
+    """ Query Inspector
+
+        :param slow_threshold: the minimum duration (in milliseconds) of a query to be reported as slow
+        :type  slow_threshold: int
+        :param explain_queries: the flag to explain each query shape once and report the unindexed ones
+        :type  explain_queries: bool
+    """
+    def __init__(self, slow_threshold=100, explain_queries=True):
+        self._logger          = get_logger('{}.{}'.format(__name__, self.__class__.__name__), logging.WARNING)
+        self._slow_threshold  = slow_threshold
+        self._explain_queries = explain_queries
+        self._explained_plans = {} # collection name/query shape => tori.db.criteria.QueryPlan
+
+    @property
+    def explained_plans(self):
+        """ The explained plans keyed by the collection name and the query shape.
+
+            :rtype: dict
+        """
+        return self._explained_plans
+
+    def inspect(self, repository, criteria, duration):
+        """ Inspect the query issued to the repository.
+
+            :param repository: the repository
+            :type  repository: tori.db.repository.Repository
+            :param criteria: the criteria of the query
+            :type  criteria: tori.db.criteria.Criteria
+            :param duration: the duration of the query in milliseconds
+            :type  duration: float
+        """
+        if duration >= self._slow_threshold:
+            self._logger.warning('Slow query on {} ({:.1f} ms): {}'.format(repository.name, duration, criteria))
+
+        # A query without any conditions and sorting is meant to scan the whole collection.
+        if not self._explain_queries or not (criteria.condition or criteria.order_by):
+            return
+
+        key = '{}/{}'.format(repository.name, criteria.shape)
+
+        if key in self._explained_plans:
+            return
+
+        plan = criteria.explain(repository)
+
+        self._explained_plans[key] = plan
+
+        if not plan.uses_index:
+            self._logger.warning('Unindexed query on {}: {} ({})'.format(repository.name, criteria, plan))
+        elif plan.sorted_in_memory:
+            self._logger.warning('In-memory sorting on {}: {} ({})'.format(repository.name, criteria, plan))
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation
+###############
+
+:Author: Juti Noppornpitak <jnopporn@shiroyuki.com>
+:Stability: Testing
+
+This module measures the database operations of :mod:`tori.db` with a low overhead so that it can stay enabled in
+production to find hotspots like N+1 queries.
+
+Every :class:`tori.db.session.Session` aggregates the measurements in its own :class:`Profile`. Additionally, the
+measurements are aggregated into the profile activated for the current thread, e.g., by
+:class:`tori.controller.Controller` for each request, and reported to the registered listeners.
+
+==================================== ==============================================================
+Event                                Description
+==================================== ==============================================================
+``repository.find``                  :meth:`tori.db.repository.Repository.find` (query)
+``repository.get``                   :meth:`tori.db.repository.Repository.get` (query)
+``repository.count``                 :meth:`tori.db.repository.Repository.count` (query)
+``repository.page``                  :meth:`tori.db.repository.Repository.page` (query)
+``proxy.dereference``                Loading the entity of :class:`tori.db.common.ProxyObject`
+``proxy_collection.load``            Loading the list of :class:`tori.db.common.ProxyCollection`
+``commit``                           :meth:`tori.db.uow.UnitOfWork.commit`
+``commit.graph``                     Building the dependency graph
+``commit.order``                     Ordering the dependency graph
+``commit.change_set``                Computing the change sets
+``commit.synchronize``               Writing the changes (write)
+``commit.records``                   Synchronizing the records of the unit of work
+==================================== ==============================================================
+
+For example,
+
+.. code-block:: python
+
+    def log_slow_operation(event, duration, details):
+        if duration > 100:
+            logger.warning('{} took {:.1f} ms'.format(event, duration))
+
+    instrument.add_listener(log_slow_operation)
+"""
+from threading import local
+from time import time
+
+database_events = ('repository.find', 'repository.get', 'repository.count', 'repository.page', 'commit.synchronize')
+""" Events which actually communicate with the database """
+
+_listeners = []
+_context   = local()
+
+class Profile(object):
+    """ Profile of database operations
+
+        The number of occurrences and the total duration (in milliseconds) are kept per event.
+    """
+    def __init__(self):
+        self.counters  = {}
+        self.durations = {}
+
+    def record(self, event, duration):
+        """ Record an occurrence of the event
+
+            :param event: the name of the event
+            :type  event: str
+            :param duration: the duration in milliseconds
+            :type  duration: float
+        """
+        if event not in self.counters:
+            self.counters[event]  = 0
+            self.durations[event] = 0
+
+        self.counters[event]  += 1
+        self.durations[event] += duration
+
+    def count(self, event):
+        """ The number of occurrences of the event """
+        return self.counters.get(event, 0)
+
+    def duration(self, event):
+        """ The total duration of the event in milliseconds """
+        return self.durations.get(event, 0)
+
+    @property
+    def query_count(self):
+        """ The number of operations communicating with the database
+
+            :rtype: int
+        """
+        return sum([self.count(event) for event in database_events])
+
+    @property
+    def query_time(self):
+        """ The total duration of the operations communicating with the database in milliseconds
+
+            :rtype: float
+        """
+        return sum([self.duration(event) for event in database_events])
+
+    def merge(self, other):
+        """ Merge the other profile into this profile
+
+            :param other: the other profile
+            :type  other: tori.db.instrument.Profile
+        """
+        for event in other.counters:
+            if event not in self.counters:
+                self.counters[event]  = 0
+                self.durations[event] = 0
+
+            self.counters[event]  += other.counters[event]
+            self.durations[event] += other.durations[event]
+
+    def reset(self):
+        self.counters  = {}
+        self.durations = {}
+
+    def __str__(self):
+        return '{} queries in {:.1f} ms'.format(self.query_count, self.query_time)
+
+class Measurement(object):
+    """ Measurement of an operation
+
+        :param profile: the profile of the session
+        :type  profile: tori.db.instrument.Profile
+        :param event: the name of the event
+        :type  event: str
+        :param details: the details given to the listeners
+
+        .. code-block:: python
+
+            with Measurement(session.profile, 'repository.find', collection='users'):
+                ...
+    """
+    def __init__(self, profile, event, **details):
+        self.profile    = profile
+        self.event      = event
+        self.details    = details
+        self.started_at = None
+        self.duration   = None
+
+    def __enter__(self):
+        self.started_at = time()
+
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.duration = (time() - self.started_at) * 1000
+
+        record(self.profile, self.event, self.duration, **self.details)
+
+def record(profile, event, duration, **details):
+    """ Record an occurrence of the event
+
+        :param profile: the profile of the session
+        :type  profile: tori.db.instrument.Profile
+        :param event: the name of the event
+        :type  event: str
+        :param duration: the duration in milliseconds
+        :type  duration: float
+        :param details: the details given to the listeners
+    """
+    profile.record(event, duration)
+
+    active_profile = getattr(_context, 'profile', None)
+
+    if active_profile is not None and active_profile is not profile:
+        active_profile.record(event, duration)
+
+    for listener in _listeners:
+        listener(event, duration, details)
+
+def activate(profile):
+    """ Activate the profile for the current thread
+
+        All measurements in this thread are also aggregated into the given profile until another profile is
+        activated or the profile is deactivated.
+
+        :param profile: the profile
+        :type  profile: tori.db.instrument.Profile
+    """
+    _context.profile = profile
+
+def deactivate():
+    """ Deactivate the profile of the current thread """
+    _context.profile = None
+
+def active_profile():
+    """ Retrieve the profile of the current thread
+
+        :rtype: tori.db.instrument.Profile
+    """
+    return getattr(_context, 'profile', None)
+
+def add_listener(listener):
+    """ Register a listener
+
+        :param listener: a callable taking the name of the event, the duration in milliseconds and the details
+        :type  listener: callable
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def remove_listener(listener):
+    """ Unregister a listener """
+    if listener in _listeners:
+        _listeners.remove(listener)
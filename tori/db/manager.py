@@ -1,27 +1,133 @@
-from pymongo import Connection
+import pymongo
 from bson.objectid import ObjectId
+from tori.common import get_logger
+from tori.db.criteria import resolve_read_preference
 from tori.db.session import Session
 
+_logger = get_logger(__name__)
+
+def connection_options(version=None, pool_size=None, wait_queue_timeout=None, wait_queue_multiple=None,
+                       connect_timeout=None, socket_timeout=None, read_preference=None):
+    """ Map the connection options to the keyword arguments supported by the given version of PyMongo
+
+        :param version: the version of PyMongo (by default, the installed version)
+        :type  version: tuple
+        :rtype: dict
+
+        The options not supported by the version (e.g., the wait queue before PyMongo 2.6) are ignored with a
+        warning. See :class:`Manager` for the options.
+    """
+    version = tuple(version or pymongo.version_tuple)[:2]
+    options = {
+        # Renamed in PyMongo 3.0
+        'max_pool_size' if version < (3, 0) else 'maxPoolSize': (pool_size, (0, 0), None),
+        # Added in PyMongo 2.6 where waitQueueMultiple is removed in PyMongo 4.0
+        'waitQueueTimeoutMS':                                   (wait_queue_timeout, (2, 6), None),
+        'waitQueueMultiple':                                    (wait_queue_multiple, (2, 6), (4, 0)),
+        'connectTimeoutMS':                                     (connect_timeout, (0, 0), None),
+        'socketTimeoutMS':                                      (socket_timeout, (0, 0), None),
+        'read_preference':                                      (resolve_read_preference(read_preference), (0, 0), None)
+    }
+    supported_options = {}
+
+    for name in options:
+        value, since, until = options[name]
+
+        if value is None:
+            continue
+
+        if version < since or (until and version >= until):
+            _logger.warning('The option {} is not supported by PyMongo {}.{} and ignored.'.format(name, *version))
+
+            continue
+
+        supported_options[name] = value
+
+    return supported_options
+
 class Manager(object):
-    def __init__(self, name, connection=None, document_types=[]):
+    def __init__(self, name, connection=None, document_types=[], query_inspector=None, host='localhost', port=27017,
+                 replica_set=None, pool_size=None, wait_queue_timeout=None, wait_queue_multiple=None,
+                 connect_timeout=None, socket_timeout=None, read_preference=None):
         """Entity Manager
 
         :param name: the name of the database
         :type  name: str
-        :param connection: the connection object
-        :type  connection: pymongo.Connection
+        :param connection: the connection object (if given, all connection options are ignored)
+        :type  connection: pymongo.MongoClient
         :param document_types: the list of document classes/types
         :type  document_types: list
+        :param query_inspector: the query inspector shared by all sessions (for development)
+        :type  query_inspector: tori.db.inspector.QueryInspector
+        :param host: the host name or the MongoDB URI
+        :type  host: str
+        :param port: the port number
+        :type  port: int
+        :param replica_set: the name of the replica set (required to route reads to secondaries)
+        :type  replica_set: str
+        :param pool_size: the maximum number of connections in the pool
+        :type  pool_size: int
+        :param wait_queue_timeout: the maximum time (in milliseconds) to wait for a connection from the pool
+        :type  wait_queue_timeout: int
+        :param wait_queue_multiple: the multiple of ``pool_size`` limiting the number of threads waiting for a connection
+        :type  wait_queue_multiple: int
+        :param connect_timeout: the timeout (in milliseconds) to establish a connection
+        :type  connect_timeout: int
+        :param socket_timeout: the timeout (in milliseconds) of each socket operation
+        :type  socket_timeout: int
+        :param read_preference: the default read preference of the connection (e.g., ``secondary_preferred``)
+        :type  read_preference: str
+
+        The connection options can be set from the service configuration. For example,
+
+        .. code-block:: xml
+
+            <entity id="db" class="tori.db.manager.Manager">
+                <param name="name" type="unicode">sample</param>
+                <param name="replica_set" type="unicode">rs0</param>
+                <param name="pool_size" type="int">50</param>
+                <param name="wait_queue_timeout" type="int">1000</param>
+            </entity>
+
+        .. note::
+
+            The read preference given here is the default for the whole connection. To only route heavy queries to
+            secondaries, leave it as the primary and set ``read_preference`` on :class:`tori.db.criteria.Criteria`
+            instead. The unit of work always writes to the primary.
+
+        .. note::
+
+            The options are mapped to the names used by the installed PyMongo (see :func:`connection_options`). The
+            wait queue requires PyMongo 2.6+ and ``wait_queue_multiple`` is not supported since PyMongo 4.0.
         """
         self._name             = name
-        self._connection       = connection or Connection()
+        self._connection       = connection or self._connect(
+            host, port, replica_set,
+            connection_options(
+                pool_size           = pool_size,
+                wait_queue_timeout  = wait_queue_timeout,
+                wait_queue_multiple = wait_queue_multiple,
+                connect_timeout     = connect_timeout,
+                socket_timeout      = socket_timeout,
+                read_preference     = read_preference
+            )
+        )
         self._database         = self._connection[self._name]
         self._session_map      = {}
         self._registered_types = {}
+        self._query_inspector  = query_inspector
 
         for document_type in document_types:
             self._registered_types[document_type.__collection_name__] = document_type
 
+    @property
+    def connection(self):
+        """ Connection
+
+        :rtype: pymongo.MongoClient
+        """
+        return self._connection
+
     @property
     def db(self):
         """ Database-level API
@@ -36,9 +142,22 @@ class Manager(object):
         """
         return self._database
 
+    def _connect(self, host, port, replica_set, options):
+        if not replica_set:
+            return pymongo.MongoClient(host, port, **options)
+
+        # Only the replica-set client is able to route reads to secondaries with PyMongo 2.x. As the client only
+        # takes the seed list (or the URI), the port is folded into the seed.
+        client_class = pymongo.MongoReplicaSetClient\
+            if pymongo.version_tuple[0] < 3 and 'MongoReplicaSetClient' in dir(pymongo)\
+            else pymongo.MongoClient
+        seed         = host if '://' in host or ':' in host else '{}:{}'.format(host, port)
+
+        return client_class(seed, replicaSet=replica_set, **options)
+
     def open_session(self, id=None, supervised=False):
         if not supervised:
-            return Session(0, self.db, self._registered_types)
+            return Session(0, self.db, self._registered_types, self._query_inspector)
 
         if not id:
             id = ObjectId()
@@ -46,7 +165,7 @@ class Manager(object):
         if id in self._session_map:
             return self._session_map[id]
 
-        session = Session(id, self.db, self._registered_types)
+        session = Session(id, self.db, self._registered_types, self._query_inspector)
 
         if supervised:
             self._session_map[id] = session
@@ -5,32 +5,257 @@ Mochi Non-relational Database Library
 :Author: Juti Noppornpitak <jnopporn@shiroyuki.com>
 
 This library is designed to work like SQLite but be compatible with MongoDB instructions (and PyMongo interfaces).
+
+Without the location, the data only lives in the memory. This makes Mochi a stand-in for PyMongo where a MongoDB
+server is not available, e.g., for testing and benchmarking.
+
+.. code-block:: python
+
+    session = Session(0, Mochi()['sample'])
+
+.. note::
+
+    Only the subset of the instructions used by :mod:`tori.db` is supported, i.e., the query operators ``$gt``,
+    ``$gte``, ``$lt``, ``$lte``, ``$ne``, ``$in``, ``$nin``, ``$exists``, ``$and`` and ``$or`` and the update
+    operators ``$set`` and ``$unset``.
 """
 
 import codecs
+import copy
 import json
+from bson import ObjectId
 
 class Mochi(dict):
     def __init__(self, location=None):
         self.__location = location
 
+        if not self.__location:
+            return
+
         with codecs.open(self.__location, 'r', 'utf-8') as fp:
             db_map = json.load(fp)
 
         for id in db_map:
             self[id] = Database(db_map[id])
 
+    def __missing__(self, name):
+        self[name] = Database()
+
+        return self[name]
+
 class Database(dict):
     def __init__(self, initial_data_map={}):
         for id in initial_data_map:
             self[id] = Collection(initial_data_map[id])
 
+    def __missing__(self, name):
+        self[name] = Collection()
+
+        return self[name]
+
 class Collection(dict):
-    def insert(self, data_set={}):
-        pass
+    def __init__(self, initial_data_list=[]):
+        self._indexes = []
+
+        for data in initial_data_list:
+            self.insert(data)
+
+    def insert(self, data_set={}, **options):
+        if isinstance(data_set, list):
+            return [self.insert(data, **options) for data in data_set]
+
+        data = copy.deepcopy(data_set)
+
+        if '_id' not in data:
+            data['_id'] = ObjectId()
+
+        self[data['_id']] = data
+
+        return data['_id']
+
+    def find(self, criteria={}, fields=None, **options):
+        return Cursor([data for data in self.values() if _match(data, criteria or {})], fields)
+
+    def find_one(self, criteria={}, fields=None, **options):
+        if isinstance(criteria, dict) and list(criteria.keys()) == ['_id']:
+            data = self.get(criteria['_id'])
+
+            return _project(copy.deepcopy(data), fields) if data else None
+
+        for data in self.find(criteria, fields):
+            return data
+
+        return None
+
+    def count(self):
+        return len(self)
+
+    def remove(self, criteria={}, **options):
+        for data in list(self.find(criteria)):
+            del self[data['_id']]
+
+    def update(self, criteria={}, update_instructions={}, upsert=False, multi=False, **options):
+        data_list = [self[data['_id']] for data in self.find(criteria)]
+
+        if not data_list and upsert:
+            data = dict([(key, criteria[key]) for key in criteria if key[0] != '$'])
+
+            _apply(data, update_instructions)
+
+            self.insert(data)
+
+            return
+
+        for data in data_list if multi else data_list[:1]:
+            _apply(data, update_instructions)
+
+    def create_index(self, key_or_list, **options):
+        self._indexes.append((key_or_list, options))
+
+    def ensure_index(self, key_or_list, **options):
+        if (key_or_list, options) not in self._indexes:
+            self.create_index(key_or_list, **options)
+
+class Cursor(object):
+    def __init__(self, data_list, fields=None):
+        self._data_list = data_list
+        self._fields    = fields
+        self._offset    = 0
+        self._limit     = 0
+        self._sorted    = False
+
+    def sort(self, key_or_list, direction=1):
+        sequence = key_or_list if isinstance(key_or_list, list) else [(key_or_list, direction)]
+
+        # Stable sorting from the least significant key.
+        for name, direction in reversed(sequence):
+            self._data_list.sort(key=lambda data: _sorting_key(_resolve(data, name)), reverse=direction < 0)
+
+        self._sorted = True
+
+        return self
+
+    def skip(self, offset):
+        self._offset = offset
+
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+
+        return self
+
+    def count(self):
+        return len(self._data_list)
+
+    def explain(self):
+        returned = len(self._sliced())
+
+        return {
+            'cursor':          'BasicCursor',
+            'n':               returned,
+            'nscanned':        len(self._data_list),
+            'nscannedObjects': len(self._data_list),
+            'scanAndOrder':    self._sorted,
+            'millis':          0
+        }
+
+    def _sliced(self):
+        end = self._offset + self._limit if self._limit else None
+
+        return self._data_list[self._offset:end]
+
+    def __iter__(self):
+        for data in self._sliced():
+            yield _project(copy.deepcopy(data), self._fields)
+
+def _project(data, fields):
+    if not fields:
+        return data
+
+    return dict([(name, data[name]) for name in data if name == '_id' or name in fields])
+
+def _resolve(data, name):
+    value = data
+
+    for key in name.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+
+    return value
+
+def _sorting_key(value):
+    # Mimic the BSON comparison order enough to sort mixed and missing values.
+    return (value is not None, str(type(value)), value)
+
+def _match(data, criteria):
+    for name in criteria:
+        expected = criteria[name]
+
+        if name == '$and':
+            if not all([_match(data, sub_criteria) for sub_criteria in expected]):
+                return False
+
+            continue
+
+        if name == '$or':
+            if not any([_match(data, sub_criteria) for sub_criteria in expected]):
+                return False
+
+            continue
+
+        if not _match_value(_resolve(data, name), expected):
+            return False
+
+    return True
+
+def _match_value(actual, expected):
+    if not isinstance(expected, dict) or not [key for key in expected if key[0] == '$']:
+        return actual == expected or (isinstance(actual, list) and expected in actual)
+
+    for operator in expected:
+        operand = expected[operator]
+
+        if operator == '$exists':
+            matched = (actual is not None) == bool(operand)
+        elif operator == '$ne':
+            matched = not _match_value(actual, operand)
+        elif operator == '$in':
+            matched = any([_match_value(actual, item) for item in operand])
+        elif operator == '$nin':
+            matched = not any([_match_value(actual, item) for item in operand])
+        elif actual is None:
+            matched = False
+        elif operator == '$gt':
+            matched = actual > operand
+        elif operator == '$gte':
+            matched = actual >= operand
+        elif operator == '$lt':
+            matched = actual < operand
+        elif operator == '$lte':
+            matched = actual <= operand
+        else:
+            raise NotImplementedError('Mochi does not support the operator {}.'.format(operator))
+
+        if not matched:
+            return False
+
+    return True
+
+def _apply(data, update_instructions):
+    if not [key for key in update_instructions if key[0] == '$']:
+        object_id = data['_id'] if '_id' in data else None
+
+        data.clear()
+        data.update(copy.deepcopy(update_instructions))
+
+        if object_id:
+            data['_id'] = object_id
+
+        return
 
-    def remove(self, criteria={}):
-        pass
+    for name, value in update_instructions.get('$set', {}).items():
+        data[name] = copy.deepcopy(value)
 
-    def update(self, criteria={}, update_instructions={}, upsert=False):
-        pass
+    for name in update_instructions.get('$unset', {}):
+        if name in data:
+            del data[name]
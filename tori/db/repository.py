@@ -7,9 +7,13 @@ import inspect
 from tori.db.common import PseudoObjectId
 from tori.db.criteria import Criteria
 from tori.db.exception import MissingObjectIdException, EntityAlreadyRecognized, EntityNotRecognized
+from tori.db.instrument import Measurement
 from tori.db.mapper import AssociationType, CascadingType
 from tori.db.uow import Record
 
+# inspect.getargspec is removed from Python 3.11.
+get_argument_spec = inspect.getfullargspec if 'getfullargspec' in dir(inspect) else inspect.getargspec
+
 class Repository(object):
     """
     Repository (Entity AbstractRepository) for Mongo DB
@@ -53,7 +57,7 @@ class Repository(object):
             This method deal with data mapping
 
         """
-        spec = inspect.getargspec(self._class.__init__) # constructor contract
+        spec = get_argument_spec(self._class.__init__) # constructor contract
         rmap = self._class.__relational_map__ # relational map
 
         # Default missing argument to NULL or LIST
@@ -82,7 +86,8 @@ class Repository(object):
         return self._class(**attributes)
 
     def get(self, id):
-        data = self._api.find_one({'_id': id})
+        with Measurement(self._session.profile, 'repository.get', collection=self.name):
+            data = self._api.find_one({'_id': id})
 
         if not data:
             return None
@@ -98,11 +103,14 @@ class Repository(object):
             :returns: the result based on the given criteria
             :rtype: object or list of objects
         """
-        cursor = criteria.build_cursor(self)
+        with Measurement(self._session.profile, 'repository.find', collection=self.name) as measurement:
+            data_list = list(criteria.build_cursor(self))
+
+        self._inspect(criteria, measurement.duration)
 
         entity_list = []
 
-        for data in cursor:
+        for data in data_list:
             entity = self._dehydrate_object(data)
             record = self._session.find_record(id, self._class)
 
@@ -116,6 +124,53 @@ class Repository(object):
 
         return entity_list
 
+    def page(self, criteria, after=None):
+        """ Retrieve a page of entities with keyset (cursor-based) pagination
+
+            :param criteria: the search criteria where ``limit`` is the page size and ``offset`` is ignored
+            :type  criteria: tori.db.criteria.Criteria
+            :param after: the token of the previous page or ``None`` for the first page
+            :type  after: str
+
+            :returns: the list of entities and the token of the next page (or ``None`` on the last page)
+            :rtype: tuple
+
+            For example,
+
+            .. code-block:: python
+
+                criteria = repository.new_criteria(order_by={'created': Order.DESC}, limit=50)
+
+                entities, token = repository.page(criteria)
+                entities, token = repository.page(criteria, after=token)
+
+            As with :meth:`find`, the entities deleted in the session are excluded so a page may be shorter than
+            ``limit`` while there are more pages.
+        """
+        page_criteria = criteria.after(after)
+
+        with Measurement(self._session.profile, 'repository.page', collection=self.name) as measurement:
+            data_list = list(page_criteria.build_cursor(self))
+
+        self._inspect(page_criteria, measurement.duration)
+
+        entity_list = []
+
+        for data in data_list:
+            entity = self._dehydrate_object(data)
+            record = self._session.find_record(entity.id, self._class)
+
+            if record and record.status in [Record.STATUS_DELETED, Record.STATUS_IGNORED]:
+                continue
+
+            entity_list.append(entity)
+
+        # The token is taken from the last fetched document so that the next page starts after the skipped ones.
+        if not data_list or not criteria.limit or len(data_list) < criteria.limit:
+            return entity_list, None
+
+        return entity_list, criteria.keyset_token(data_list[-1])
+
     def count(self, criteria):
         """ Count the number of entities satisfied the given criteria
 
@@ -124,15 +179,30 @@ class Repository(object):
 
             :rtype: int
         """
-        return criteria.build_cursor(self).count()
+        with Measurement(self._session.profile, 'repository.count', collection=self.name) as measurement:
+            count = criteria.build_cursor(self).count()
+
+        self._inspect(criteria, measurement.duration)
+
+        return count
+
+    def explain(self, criteria):
+        """ Explain how the database would execute the query with the given criteria
+
+            :param criteria: the search criteria
+            :type  criteria: tori.db.criteria.Criteria
+
+            :rtype: tori.db.criteria.QueryPlan
+        """
+        return criteria.explain(self)
 
-    def filter(self, condition={}, order_by={}, offset=0, limit=0):
-        criteria  = Criteria(condition, order_by, offset, limit)
+    def filter(self, condition={}, order_by={}, offset=0, limit=0, read_preference=None):
+        criteria  = Criteria(condition, order_by, offset, limit, read_preference)
 
         return self.find(criteria)
 
-    def filter_one(self, condition={}, order_by={}, offset=0):
-        criteria  = Criteria(condition, order_by, offset, 1)
+    def filter_one(self, condition={}, order_by={}, offset=0, read_preference=None):
+        criteria  = Criteria(condition, order_by, offset, 1, read_preference)
 
         return self.find(criteria)
 
@@ -161,8 +231,29 @@ class Repository(object):
     def persist(self, entity):
         self._session.persist(entity)
 
-    def commit(self):
-        self._session.flush()
+    def commit(self, write_concern=None):
+        """ Commit all changes of the session
+
+            :param write_concern: the write concern (or the name of the profile) where the default is the one of
+                                  the connection
+            :type  write_concern: tori.db.uow.WriteConcern or str
+
+            See :class:`tori.db.uow.WriteConcern` for the predefined profiles.
+        """
+        if not write_concern:
+            self._session.flush()
+
+            return
+
+        self._session.flush(write_concern)
+
+    def _inspect(self, criteria, duration):
+        inspector = self._session.query_inspector
+
+        if not inspector:
+            return
+
+        inspector.inspect(self, criteria, duration)
 
     def _recognize_entity(self, entity):
         if not entity.id or not entity.__session__ or isinstance(entity.id, PseudoObjectId):
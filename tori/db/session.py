@@ -1,7 +1,7 @@
-from pymongo import Connection
 from tori.db.common import ProxyObject, ProxyFactory, ProxyCollection
 from tori.db.repository import Repository
 from tori.db.exception import IntegrityConstraintError
+from tori.db.instrument import Measurement, Profile
 from tori.db.mapper import AssociationType
 from tori.db.uow import UnitOfWork
 
@@ -12,18 +12,38 @@ class Session(object):
         :type  id: int or bson.objectid.ObjectId
         :param database: the database connection
         :type  database:
+        :param query_inspector: the (optional) query inspector
+        :type  query_inspector: tori.db.inspector.QueryInspector
     """
-    def __init__(self, id, database, registered_types={}):
+    def __init__(self, id, database, registered_types={}, query_inspector=None):
         self._id  = id
         self._uow = UnitOfWork(self)
         self._database = database
         self._repository_map   = {}
         self._registered_types = registered_types
+        self._query_inspector  = query_inspector
+        self._profile          = Profile()
 
     @property
     def id(self):
         return self._id
 
+    @property
+    def profile(self):
+        """ Profile of the database operations of this session
+
+        :rtype: tori.db.instrument.Profile
+        """
+        return self._profile
+
+    @property
+    def query_inspector(self):
+        """ Query Inspector
+
+        :rtype: tori.db.inspector.QueryInspector
+        """
+        return self._query_inspector
+
     @property
     def db(self):
         """ Database-level API
@@ -131,10 +151,14 @@ class Session(object):
     def recognize(self, entity):
         self._uow.register_clean(entity)
 
-    def flush(self):
+    def flush(self, write_concern=None):
         """ Flush all changes of the session.
+
+            :param write_concern: the write concern (or the name of the profile) where the default is the one of
+                                  the connection
+            :type  write_concern: tori.db.uow.WriteConcern or str
         """
-        self._uow.commit()
+        self._uow.commit(write_concern)
 
     def find_record(self, id, cls):
         return self._uow.find_recorded_entity(id, cls)
@@ -150,13 +174,17 @@ class Session(object):
                 collection = self.collection(guide.target_class)
 
                 if guide.association in [AssociationType.ONE_TO_ONE, AssociationType.MANY_TO_ONE]:
-                    target = collection._api.find_one({guide.inverted_by: entity.id})
+                    with Measurement(self._profile, 'repository.find', collection=collection.name):
+                        target = collection._api.find_one({guide.inverted_by: entity.id})
 
                     entity.__setattr__(property_name, ProxyFactory.make(self, target['_id'], guide))
                 elif guide.association == AssociationType.ONE_TO_MANY:
+                    with Measurement(self._profile, 'repository.find', collection=collection.name):
+                        target_list = list(collection._api.find({guide.inverted_by: entity.id}))
+
                     proxy_list = [
                         ProxyFactory.make(self, target['_id'], guide)
-                        for target in collection._api.find({guide.inverted_by: entity.id})
+                        for target in target_list
                     ]
 
                     entity.__setattr__(property_name, proxy_list)
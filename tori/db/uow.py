@@ -8,6 +8,7 @@ from threading import Lock as ThreadLock
 from tori.db.common    import Serializer, PseudoObjectId, ProxyObject
 from tori.db.entity    import BasicAssociation
 from tori.db.exception import UOWRepeatedRegistrationError, UOWUpdateError, UOWUnknownRecordError, IntegrityConstraintError
+from tori.db.instrument import Measurement
 from tori.db.mapper    import CascadingType
 
 class Record(object):
@@ -45,6 +46,78 @@ class Record(object):
 
         self.mark_as(Record.STATUS_CLEAN)
 
+class WriteConcern(object):
+    """ Write Concern Profile
+
+    :param w: the number of servers (or ``majority``) acknowledging each write where ``0`` means fire-and-forget
+    :type  w: int or str
+    :param journaled: the flag to wait until each write is committed to the journal
+    :type  journaled: bool
+    :param timeout: the time limit (in milliseconds) to wait for the acknowledgement
+    :type  timeout: int
+    :param ordered: the flag to write new records one by one where ``False`` lets the unit of work insert new records
+                    without any dependencies in one unordered batch per collection
+    :type  ordered: bool
+
+    The predefined profiles are available by name with :meth:`resolve`.
+
+    ============== ===================================================================
+    Profile        Usage
+    ============== ===================================================================
+    unacknowledged Fire-and-forget (e.g., analytics)
+    acknowledged   The default of the driver
+    journaled      Acknowledged by the primary after committing to the journal
+    majority       Acknowledged by the majority of the replica set (e.g., payments)
+    bulk           Fire-and-forget with unordered batches for independent records
+    ============== ===================================================================
+    """
+    profiles = {}
+
+    def __init__(self, w=1, journaled=False, timeout=None, ordered=True):
+        self.w         = w
+        self.journaled = journaled
+        self.timeout   = timeout
+        self.ordered   = ordered
+
+    @property
+    def options(self):
+        """ Options for the write operations of PyMongo
+
+        :rtype: dict
+        """
+        options = {'w': self.w}
+
+        if self.journaled:
+            options['j'] = True
+
+        if self.timeout:
+            options['wtimeout'] = self.timeout
+
+        return options
+
+    @staticmethod
+    def resolve(write_concern):
+        """ Resolve the write concern
+
+        :param write_concern: the name of a predefined profile or the write concern itself
+        :rtype: tori.db.uow.WriteConcern
+        """
+        if isinstance(write_concern, WriteConcern):
+            return write_concern
+
+        if write_concern not in WriteConcern.profiles:
+            raise ValueError('Unknown write concern: {}'.format(write_concern))
+
+        return WriteConcern.profiles[write_concern]
+
+WriteConcern.profiles.update({
+    'unacknowledged': WriteConcern(w=0),
+    'acknowledged':   WriteConcern(w=1),
+    'journaled':      WriteConcern(w=1, journaled=True),
+    'majority':       WriteConcern(w='majority'),
+    'bulk':           WriteConcern(w=0, ordered=False)
+})
+
 class DependencyNode(object):
     """ Dependency Node
 
@@ -127,6 +200,7 @@ class UnitOfWork(object):
         self._record_map    = {} # Object Hash => Record
         self._object_id_map = {} # str(ObjectID) => Object Hash
         self._dependency_map = None
+        self._write_concern  = None
 
         # Locks
         self._blocker_activated = False
@@ -343,28 +417,42 @@ class UnitOfWork(object):
     def hydrate_entity(self, reference):
         return reference._actual if isinstance(reference, ProxyObject) else reference
 
-    def commit(self):
+    def commit(self, write_concern=None):
+        """ Commit all changes
+
+        :param write_concern: the write concern (or the name of the profile) of this commit where the default is the
+                              one of the connection
+        :type  write_concern: tori.db.uow.WriteConcern or str
+        """
+        # Resolve first as an unknown profile must not leave the session locked.
+        write_concern = WriteConcern.resolve(write_concern) if write_concern else None
+
         self._blocking_lock.acquire()
 
         self._blocker_activated = True
+        self._write_concern     = write_concern
 
         self._freeze()
 
-        # Make changes on the normal entities.
-        self._commit_changes()
+        try:
+            with Measurement(self._em.profile, 'commit'):
+                # Make changes on the normal entities.
+                self._commit_changes()
 
-        # Then, make changes on external associations.
-        self._add_or_remove_associations()
-        self._commit_changes(BasicAssociation)
+                # Then, make changes on external associations.
+                self._add_or_remove_associations()
+                self._commit_changes(BasicAssociation)
 
-        # Synchronize all records
-        self._synchronize_records()
+                # Synchronize all records
+                with Measurement(self._em.profile, 'commit.records'):
+                    self._synchronize_records()
+        finally:
+            self._unfreeze()
 
-        self._unfreeze()
+            self._blocker_activated = False
+            self._write_concern     = None
 
-        self._blocker_activated = False
-
-        self._blocking_lock.release()
+            self._blocking_lock.release()
 
     def _commit_changes(self, expected_class=None):
         # Load the sub graph of supervised collections.
@@ -375,6 +463,8 @@ class UnitOfWork(object):
             c.filter()
 
         commit_order = self._compute_order()
+        batch_map    = {} # Collection Name => (Collection, Entity List, Change Set List)
+        use_batches  = self._write_concern and not self._write_concern.ordered
 
         # Commit changes to nodes.
         for commit_node in commit_order:
@@ -385,9 +475,19 @@ class UnitOfWork(object):
                 continue
 
             collection = self._em.collection(record.entity.__class__)
-            change_set = self._compute_change_set(record)
 
-            if record.status == Record.STATUS_NEW:
+            with Measurement(self._em.profile, 'commit.change_set'):
+                change_set = self._compute_change_set(record)
+
+            is_independent = not commit_node.adjacent_nodes and not commit_node.reverse_edges
+
+            if record.status == Record.STATUS_NEW and use_batches and is_independent:
+                if collection.name not in batch_map:
+                    batch_map[collection.name] = (collection, [], [])
+
+                batch_map[collection.name][1].append(record.entity)
+                batch_map[collection.name][2].append(change_set)
+            elif record.status == Record.STATUS_NEW:
                 self._synchronize_new(
                     collection,
                     record.entity,
@@ -407,9 +507,35 @@ class UnitOfWork(object):
             elif record.status == Record.STATUS_DELETED and commit_node.score > 0:
                 record.mark_as(Record.STATUS_CLEAN)
 
+        # Insert the independent new records (without any dependency edges) per collection.
+        for collection, entities, change_sets in batch_map.values():
+            self._synchronize_new_batch(collection, entities, change_sets)
+
+    @property
+    def _write_options(self):
+        return self._write_concern.options if self._write_concern else {}
+
     def _synchronize_new(self, collection, entity, change_set):
+        with Measurement(self._em.profile, 'commit.synchronize', collection=collection.name, action='insert'):
+            object_id = collection._api.insert(change_set, **self._write_options)
+
+        self._update_object_id(entity, object_id)
+
+    def _synchronize_new_batch(self, collection, entities, change_sets):
+        """Synchronize the new data in one unordered batch
+
+        :param collection: the target collection
+        :param entities: the list of new entities
+        :param change_sets: the list of change sets in the same order as the entities
+        """
+        with Measurement(self._em.profile, 'commit.synchronize', collection=collection.name, action='insert'):
+            object_ids = collection._api.insert(change_sets, continue_on_error=True, **self._write_options)
+
+        for index in range(len(entities)):
+            self._update_object_id(entities[index], object_ids[index])
+
+    def _update_object_id(self, entity, object_id):
         pseudo_key = self._convert_object_id_to_str(entity.id, entity)
-        object_id  = collection._api.insert(change_set)
         entity.id  = object_id # update the entity ID
         actual_key = self._convert_object_id_to_str(object_id, entity)
 
@@ -424,14 +550,17 @@ class UnitOfWork(object):
         :param new_data_set: the updated data
         """
 
-        collection._api.update(
-            {'_id': object_id},
-            new_data_set,
-            upsert=False
-        )
+        with Measurement(self._em.profile, 'commit.synchronize', collection=collection.name, action='update'):
+            collection._api.update(
+                {'_id': object_id},
+                new_data_set,
+                upsert=False,
+                **self._write_options
+            )
 
     def _synchronize_delete(self, collection, object_id):
-        collection._api.remove({'_id': object_id})
+        with Measurement(self._em.profile, 'commit.synchronize', collection=collection.name, action='remove'):
+            collection._api.remove({'_id': object_id}, **self._write_options)
 
     def _synchronize_records(self):
         writing_statuses = [Record.STATUS_NEW, Record.STATUS_DIRTY]
@@ -478,16 +607,18 @@ class UnitOfWork(object):
         return None
 
     def _compute_order(self):
-        self._construct_dependency_graph()
+        with Measurement(self._em.profile, 'commit.graph'):
+            self._construct_dependency_graph()
 
         # After constructing the dependency graph (as a supposedly directed acyclic
         # graph), do the topological sorting from the dependency graph.
         final_order = []
 
-        for id in self._dependency_map:
-            node = self._dependency_map[id]
+        with Measurement(self._em.profile, 'commit.order'):
+            for id in self._dependency_map:
+                node = self._dependency_map[id]
 
-            self._retrieve_dependency_order(node, final_order)
+                self._retrieve_dependency_order(node, final_order)
 
         return final_order
 
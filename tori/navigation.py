@@ -15,6 +15,7 @@ Additionally, the parameter *route* for any methods mentioned on this page is an
 # Standard libraries
 from os import path
 from re import compile as RegExp
+from re import escape, split
 
 # Third-party libraries
 from imagination.loader import Loader
@@ -22,8 +23,9 @@ from kotoba.kotoba      import Kotoba
 from tornado.web        import RedirectHandler
 
 # Internal libraries
-from tori.common    import get_logger
-from tori.exception import *
+from tori.common      import get_logger
+from tori.data.bundle import Bundle
+from tori.exception   import *
 
 class RoutingMap(object):
     """ Routing Map """
@@ -229,6 +231,7 @@ class StaticRoute(Route):
     """
     _base_path       = None
     _default_service = None
+    _logger          = get_logger('{}.StaticRoute'.format(__name__))
 
     def __init__(self, route, base_path):
         super(self.__class__, self).__init__(route)
@@ -241,6 +244,8 @@ class StaticRoute(Route):
         # Map the routing pattern to the actual location.
         self.service().add_pattern(self.pattern, self.location(), self.cache_enabled())
 
+        self.build_bundles()
+
     def location(self):
         """ Get the location of the static resource/content. """
 
@@ -265,6 +270,44 @@ class StaticRoute(Route):
 
         return _cache_enabled and _cache_enabled.lower() == 'true' or False
 
+    def url_prefix(self):
+        """ Get the literal URL prefix of the routing pattern (e.g., ``/static`` for ``/static(/.*)``). """
+        return split('[\\\\.^$*+?{}\\[\\]|()]', self.pattern)[0].rstrip('/')
+
+    def bundles(self):
+        """ Get the asset bundles declared in the route.
+
+        :rtype: list of :class:`tori.data.bundle.Bundle`
+        """
+        bundles = []
+
+        for bundle_data in self.source().children('bundle'):
+            bundles.append(Bundle(
+                bundle_data.attribute('name'),
+                self.location(),
+                [inclusion.data() for inclusion in bundle_data.children('include')],
+                bundle_data.attribute('output') or '',
+                self.url_prefix()
+            ))
+
+        return bundles
+
+    def build_bundles(self):
+        """ Build the asset bundles with the resource service plugins. """
+        bundles = self.bundles()
+
+        if not bundles:
+            return
+
+        from tori.centre import services
+
+        plugins = services.find_by_tag(StaticRoute.default_service()._plugins_tag_name)
+
+        for bundle in bundles:
+            fingerprinted_url = bundle.build(plugins)
+
+            self._logger.info('Built the bundle {} ({})'.format(bundle.url, fingerprinted_url))
+
     def service(self):
         """ Get the resource service. """
         service = self.bean_class() or StaticRoute.default_service()
@@ -316,3 +359,247 @@ class RelayRoute(Route):
                 'permanent': self.is_permanent()
             }
         )
+
+class RoutingEngine(object):
+    """ Routing Engine
+
+    The engine finds the first registered routing pattern matching the given path without testing the patterns one by
+    one. The literal patterns (e.g., ``/about``) are looked up directly. The other patterns are grouped by their leading
+    literal path segments in a prefix tree (e.g., ``/blog/(\\d+)`` is under ``/blog/``) and each group is compiled into
+    a few alternation regular expressions. Regardless of the grouping, the first registered pattern always wins.
+
+    :param anchored: the flag to require the patterns to match the whole path (like Tornado) instead of the beginning
+    :type  anchored: bool
+
+    .. code-block:: python
+
+        engine = RoutingEngine()
+        engine.add('/blog/(\\d+)', BlogController)
+
+        target, matches = engine.match('/blog/123') # => (BlogController, <match object>)
+    """
+
+    _max_group_count   = 99 # Limited by Python 2.7.
+    _meta_characters   = '.^$*+?{}[]\\|()'
+    _quantifiers       = '*+?{'
+    _re_named_group    = RegExp('\\(\\?P(<|=)([^>)]+)(>|\\))')
+    _re_standalone     = RegExp('\\\\[1-9]|\\(\\?[aiLmsux]')
+
+    def __init__(self, anchored=True):
+        self._anchored = anchored
+        self._entries  = [] # index => (target, compiled pattern)
+        self._literals = {} # literal path => index
+        self._root     = RoutingNode()
+        self._compiled = False
+
+    def add(self, pattern, target):
+        """ Register a routing pattern.
+
+        :param pattern: the routing pattern
+        :type  pattern: str
+        :param target: the object returned when the pattern is the first match (e.g., a controller)
+        """
+        if self._anchored and not pattern.endswith('$'):
+            pattern += '$'
+
+        index = len(self._entries)
+
+        self._entries.append((target, RegExp(pattern)))
+        self._compiled = False
+
+        if self._anchored and self._is_literal(pattern[:-1]):
+            self._literals.setdefault(pattern[:-1], index)
+
+            return
+
+        node = self._root
+
+        for segment in self._literal_segments(pattern):
+            node = node.child(segment)
+
+        node.indices.append(index)
+
+    def match(self, path):
+        """ Find the first registered pattern matching the given path.
+
+        :param path: the requested path
+        :type  path: str
+        :returns: the target and the match object of the pattern or ``(None, None)`` if nothing matches
+        :rtype: tuple
+        """
+        if not self._compiled:
+            self._compile()
+
+        index = self._literals.get(path)
+
+        for node in self._root.walk(path):
+            for first_index, expression, index_map in node.chunks:
+                # The chunks are in the registration order.
+                if index is not None and first_index > index:
+                    break
+
+                matches = expression.match(path)
+
+                if not matches:
+                    continue
+
+                candidate = index_map[matches.lastgroup] if index_map else first_index
+
+                if index is None or candidate < index:
+                    index = candidate
+
+                break
+
+        if index is None:
+            return (None, None)
+
+        target, expression = self._entries[index]
+
+        return (target, expression.match(path))
+
+    def _compile(self):
+        for node in self._root.nodes():
+            node.chunks = []
+            members     = []
+            group_count = 0
+
+            for index in node.indices:
+                expression = self._entries[index][1]
+
+                # The patterns with back references or inline flags cannot be combined.
+                if self._re_standalone.search(expression.pattern):
+                    self._add_chunk(node, members)
+                    node.chunks.append((index, expression, None))
+
+                    members     = []
+                    group_count = 0
+
+                    continue
+
+                if members and group_count + expression.groups + 1 > self._max_group_count:
+                    self._add_chunk(node, members)
+
+                    members     = []
+                    group_count = 0
+
+                members.append(index)
+                group_count += expression.groups + 1
+
+            self._add_chunk(node, members)
+
+        self._compiled = True
+
+    def _add_chunk(self, node, indices):
+        if not indices:
+            return
+
+        alternatives = []
+        index_map    = {}
+
+        for index in indices:
+            group_name = '_r{}'.format(index)
+            pattern    = self._re_named_group.sub(
+                lambda m: '(?P{}{}_{}{}'.format(m.group(1), group_name, m.group(2), m.group(3)),
+                self._entries[index][1].pattern
+            )
+
+            index_map[group_name] = index
+
+            alternatives.append('(?P<{}>{})'.format(group_name, pattern))
+
+        node.chunks.append((indices[0], RegExp('|'.join(alternatives)), index_map))
+
+    def _is_literal(self, pattern):
+        for character in pattern:
+            if character in self._meta_characters:
+                return False
+
+        return True
+
+    def _literal_segments(self, pattern):
+        """ Get the leading path segments which the given pattern only matches literally. """
+        prefix   = ''
+        depth    = 0
+        in_class = False
+        position = 0
+
+        # Any top-level alternation makes the prefix unreliable. The escaped characters and the characters in the
+        # character classes (e.g., "[^)|]") are literal.
+        while position < len(pattern):
+            character = pattern[position]
+
+            if character == '\\':
+                position += 1
+            elif in_class:
+                in_class = character != ']'
+            elif character == '[':
+                in_class = True
+
+                # "]" right after "[" or "[^" is a member of the class.
+                if pattern[position + 1:position + 2] == '^':
+                    position += 1
+
+                if pattern[position + 1:position + 2] == ']':
+                    position += 1
+            elif character == '(':
+                depth += 1
+            elif character == ')':
+                depth -= 1
+            elif character == '|' and depth == 0:
+                return []
+
+            position += 1
+
+        for position, character in enumerate(pattern):
+            if character in self._meta_characters:
+                # The character right before a quantifier is optional or repeated.
+                if character in self._quantifiers:
+                    prefix = prefix[:-1]
+
+                break
+
+            prefix += character
+
+        if not prefix.startswith('/'):
+            return []
+
+        return prefix.split('/')[1:-1]
+
+class RoutingNode(object):
+    """ Node of the prefix tree used by :class:`RoutingEngine` """
+
+    def __init__(self):
+        self.children = {}
+        self.indices  = []
+        self.chunks   = []
+
+    def child(self, segment):
+        if segment not in self.children:
+            self.children[segment] = RoutingNode()
+
+        return self.children[segment]
+
+    def walk(self, path):
+        """ Iterate through the nodes whose leading path segments match the given path. """
+        node = self
+
+        yield node
+
+        if not path.startswith('/'):
+            return
+
+        for segment in path.split('/')[1:-1]:
+            if segment not in node.children:
+                return
+
+            node = node.children[segment]
+
+            yield node
+
+    def nodes(self):
+        """ Iterate through all nodes. """
+        yield self
+
+        for child in self.children.values():
+            for node in child.nodes():
+                yield node
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Session Codecs
+##############
+
+:Author: Juti Noppornpitak <jnopporn@shiroyuki.com>
+:Stability: Testing
+
+The session repositories storing the data outside the process (e.g., :class:`tori.session.repository.xredis.Redis`)
+encode each session data with :class:`Serializer`. The encoded data starts with a header of two bytes, the format
+version and the codec ID, so that the codec can be changed without invalidating the existing sessions. The data
+larger than the threshold is compressed with zlib.
+
+================================= ====== ===============================================================
+Codec                             ID     Supported data
+================================= ====== ===============================================================
+:class:`JSONCodec`                1      JSON-compatible data (the tuples are decoded as lists)
+:class:`MessagePackCodec`         2      MessagePack-compatible data (PIP: msgpack)
+:class:`PickleCodec`              3      any picklable data (only for the trusted storages)
+================================= ====== ===============================================================
+
+The data encoded directly with :mod:`pickle` by the previous versions is rejected unless ``legacy_pickle`` is
+explicitly enabled, e.g., ``Serializer(legacy_pickle=True)`` while migrating the existing sessions.
+"""
+import json
+import zlib
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from tori.exception import *
+
+class Codec(object):
+    """ Abstract Codec """
+    id = None
+
+    def encode(self, content):
+        """
+        Encode the content.
+
+        :param content: the content
+        :rtype: bytes
+        """
+        raise FutureFeatureException
+
+    def decode(self, data):
+        """
+        Decode the data.
+
+        :param data: the encoded data
+        :type  data: bytes
+        :return: the content
+        """
+        raise FutureFeatureException
+
+class JSONCodec(Codec):
+    id = 1
+
+    def encode(self, content):
+        return json.dumps(content, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data):
+        return json.loads(data.decode('utf-8'))
+
+class MessagePackCodec(Codec):
+    id = 2
+
+    def __init__(self):
+        if not msgpack:
+            raise SessionError('MessagePackCodec requires msgpack (PIP: msgpack).')
+
+    def encode(self, content):
+        return msgpack.packb(content, use_bin_type=True)
+
+    def decode(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+class PickleCodec(Codec):
+    id = 3
+
+    def encode(self, content):
+        return pickle.dumps(content, pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data):
+        return pickle.loads(data)
+
+class Serializer(object):
+    """ Session Data Serializer
+
+        :param codec: the codec used to encode the data (by default, :class:`MessagePackCodec` if msgpack is
+                      available or :class:`JSONCodec` otherwise)
+        :type  codec: tori.session.codec.Codec
+        :param compression_threshold: the minimum size of the encoded data in bytes to compress (disabled if ``None``)
+        :type  compression_threshold: int
+        :param legacy_pickle: the flag to decode the data pickled by the previous versions (only to migrate the
+                              existing sessions in the trusted storages)
+        :type  legacy_pickle: bool
+
+        The data encoded by any known codec is decoded regardless of the codec used for encoding except that
+        :class:`PickleCodec` is only used to decode if it is the codec of the serializer.
+    """
+    version         = 1
+    compressed_flag = 0x80
+
+    def __init__(self, codec=None, compression_threshold=1024, legacy_pickle=False):
+        self.codec                 = codec or (MessagePackCodec() if msgpack else JSONCodec())
+        self.compression_threshold = compression_threshold
+        self.legacy_pickle         = legacy_pickle
+
+        self._decoders = {JSONCodec.id: JSONCodec()}
+
+        if msgpack:
+            self._decoders[MessagePackCodec.id] = MessagePackCodec()
+
+        self._decoders[self.codec.id] = self.codec
+
+    def encode(self, content):
+        """
+        Encode the content with the header.
+
+        :param content: the content
+        :rtype: bytes
+        """
+        data  = self.codec.encode(content)
+        flags = self.codec.id
+
+        if self.compression_threshold is not None and len(data) >= self.compression_threshold:
+            data   = zlib.compress(data)
+            flags |= self.compressed_flag
+
+        return bytes(bytearray([self.version, flags]) + data)
+
+    def decode(self, data):
+        """
+        Decode the data.
+
+        :param data: the encoded data
+        :type  data: bytes
+        :return: the content
+        """
+        data = bytes(data)
+
+        if data[:1] != bytearray([self.version]):
+            if not self.legacy_pickle:
+                raise SessionError('The session data is not encoded by any supported codecs.')
+
+            return pickle.loads(data)
+
+        flags    = bytearray(data[1:2])[0]
+        codec_id = flags & ~self.compressed_flag
+
+        if codec_id not in self._decoders:
+            raise SessionError('The session data is encoded by the unsupported codec {}.'.format(codec_id))
+
+        data = data[2:]
+
+        if flags & self.compressed_flag:
+            data = zlib.decompress(data)
+
+        return self._decoders[codec_id].decode(data)
+
+class LazyData(MutableMapping):
+    """ Dictionary of the session data decoded on the first access to each key
+
+        :param encoded_data: the dictionary of the encoded data
+        :type  encoded_data: dict
+        :param serializer: the serializer
+        :type  serializer: tori.session.codec.Serializer
+
+        The encoded data is never exposed as every access (including :meth:`pop`, :meth:`copy` and ``dict(data)``)
+        goes through :meth:`__getitem__`.
+    """
+    def __init__(self, encoded_data, serializer):
+        self._encoded    = dict(encoded_data)
+        self._decoded    = {}
+        self._serializer = serializer
+
+    def __getitem__(self, key):
+        if key in self._decoded:
+            return self._decoded[key]
+
+        content = self._serializer.decode(self._encoded[key])
+
+        del self._encoded[key]
+
+        self._decoded[key] = content
+
+        return content
+
+    def __setitem__(self, key, content):
+        self._encoded.pop(key, None)
+        self._decoded[key] = content
+
+    def __delitem__(self, key):
+        if key in self._decoded:
+            del self._decoded[key]
+
+            return
+
+        del self._encoded[key]
+
+    def __contains__(self, key):
+        return key in self._decoded or key in self._encoded
+
+    def __iter__(self):
+        for key in list(self._decoded) + list(self._encoded):
+            yield key
+
+    def __len__(self):
+        return len(self._decoded) + len(self._encoded)
+
+    def __repr__(self):
+        return '<LazyData {} decoded, {} encoded>'.format(len(self._decoded), len(self._encoded))
+
+    def copy(self):
+        """ Decode all data.
+
+            :rtype: dict
+        """
+        return dict([(key, self[key]) for key in self])
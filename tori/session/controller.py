@@ -5,16 +5,34 @@ This package contains the session controller used with the web controller and so
 """
 
 from imagination.decorator.validator import restrict_type
+from tori.exception                  import FutureFeatureException
 from tori.session.repository.base    import Base
 
 class Controller(object):
     """
     A session controller for the controller (request handler).
+
+    :param session_repository: the session repository
+    :type  session_repository: tori.session.repository.base.Base
+    :param id: session ID
+    :type  id: str
+    :param write_back: the flag to keep the changes in the memory until :meth:`flush` is called
+    :type  write_back: bool
+
+    The data of the session is loaded from the repository once on the first access and then served from the memory.
+    With ``write_back``, the changes are saved by :meth:`flush` at once, which is done by
+    :class:`tori.controller.Controller` when the request is finished. Otherwise, the changes are saved immediately.
     """
     @restrict_type(Base)
-    def __init__(self, session_repository, id):
-        self._repository = session_repository
-        self._id         = id
+    def __init__(self, session_repository, id, write_back=True):
+        self._repository   = session_repository
+        self._id           = id
+        self._write_back   = write_back
+        self._data         = {}
+        self._loaded       = False
+        self._complete     = False # whether all data is in the memory
+        self._dirty_keys   = set()
+        self._deleted_keys = set()
 
     @property
     def id(self):
@@ -24,12 +42,44 @@ class Controller(object):
         """
         return self._id
 
+    @property
+    def modified(self):
+        """ The flag indicating if there are unsaved changes
+
+        :rtype: bool
+        """
+        return bool(self._dirty_keys or self._deleted_keys)
+
+    def _load(self):
+        if self._loaded:
+            return
+
+        self._loaded = True
+
+        try:
+            data = self._repository.load(self._id)
+        except FutureFeatureException:
+            # The data is then loaded by key.
+            return
+
+        data.update(self._data)
+
+        self._data     = data
+        self._complete = True
+
     def delete(self, key):
         """ Delete the data
         :param key: data key
         :type  key: str
         """
-        self._repository.delete(self._id, key)
+        if key in self._data:
+            del self._data[key]
+
+        self._dirty_keys.discard(key)
+        self._deleted_keys.add(key)
+
+        if not self._write_back:
+            self.flush()
 
     def get(self, key):
         """ Retrieve the data
@@ -38,7 +88,23 @@ class Controller(object):
         :type  key: str
         :return: the data stored by the given key
         """
-        return self._repository.get(self._id, key)
+        if key in self._deleted_keys:
+            return None
+
+        self._load()
+
+        if key not in self._data:
+            if self._complete:
+                return None
+
+            content = self._repository.get(self._id, key)
+
+            if content is None:
+                return None
+
+            self._data[key] = content
+
+        return self._data[key]
 
     def set(self, key, content):
         """ Define the data
@@ -47,8 +113,38 @@ class Controller(object):
         :type  key: str
         :param content: data content
         """
-        self._repository.set(self._id, key, content)
+        self._data[key] = content
+
+        self._deleted_keys.discard(key)
+        self._dirty_keys.add(key)
+
+        if not self._write_back:
+            self.flush()
 
     def reset(self):
         """ Clear out all data of the administrated session """
         self._repository.reset(self._id)
+
+        self._data     = {}
+        self._loaded   = True
+        self._complete = True
+
+        self._dirty_keys.clear()
+        self._deleted_keys.clear()
+
+    def flush(self):
+        """ Save the changes to the repository
+
+        Nothing is saved if there is no change. The changes are no longer pending even if the repository fails to
+        save them so that the error is raised only once.
+        """
+        if not self.modified:
+            return
+
+        data         = dict([(key, self._data[key]) for key in self._dirty_keys])
+        deleted_keys = list(self._deleted_keys)
+
+        self._dirty_keys.clear()
+        self._deleted_keys.clear()
+
+        self._repository.save(self._id, data, deleted_keys)
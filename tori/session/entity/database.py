@@ -1,5 +1,7 @@
-from sqlalchemy       import Column
-from sqlalchemy.types import Integer, PickleType, String
+from datetime import datetime
+
+from sqlalchemy       import Column, Index
+from sqlalchemy.types import DateTime, Integer, LargeBinary, String
 
 from tori.db.wrapper           import Entity
 from tori.session.entity.base import Base
@@ -9,9 +11,13 @@ class Database(Base, Entity):
     DB Session Entity is made to use with a DB session repository.
     """
 
-    __tablename__ = 'tori_session'
+    __tablename__  = 'tori_session'
+    __table_args__ = (
+        Index('ix_tori_session_session_id_key', '_session_id', 'key', unique=True),
+    )
 
     id          = Column(Integer, primary_key=True)
-    _session_id = Column(String(128), index=True)
-    key         = Column(String(128), index=True)
-    content     = Column(PickleType)
\ No newline at end of file
+    _session_id = Column(String(128))
+    key         = Column(String(128))
+    content     = Column(LargeBinary) # encoded by tori.session.codec.Serializer
+    updated_at  = Column(DateTime, default=datetime.utcnow, index=True)
@@ -6,6 +6,18 @@ class Base(object):
     def __init__(self):
         pass
 
+    def bind(self, handler):
+        """
+        Bind the repository to the request handler.
+
+        :param `handler`: the request handler (:class:`tori.controller.Controller`)
+        :return:          the repository used to handle the request (by default, this repository)
+
+        The repositories keeping the data in the request (e.g., :class:`tori.session.repository.cookie.Cookie`)
+        override this method.
+        """
+        return self
+
     def delete(self, id, key):
         """
         Delete a session key.
@@ -53,7 +65,18 @@ class Base(object):
         :param `key`: session data key
         :return:      ``True`` if there exists the data.
         """
-        return self.get(session_id, key) is not None
+        return self.get(id, key) is not None
+
+    def load(self, id):
+        """
+        Retrieve all data of the session at once.
+
+        :param `id`: session ID
+        :return:     the dictionary of the session data
+
+        .. note:: This method is not implemented in :class:`tori.session.repository.base.Base`.
+        """
+        raise FutureFeatureException
 
     def registered(self, id):
         """
@@ -76,6 +99,23 @@ class Base(object):
         """
         raise FutureFeatureException
 
+    def save(self, id, data, deleted_keys=[]):
+        """
+        Save the changes of the session at once.
+
+        :param `id`:           session ID
+        :param `data`:         the dictionary of the changed session data
+        :param `deleted_keys`: the list of the deleted session data keys
+
+        By default, the changes are saved with :meth:`delete` and :meth:`set`. The repositories should override this
+        method to save the changes in a single operation.
+        """
+        for key in deleted_keys:
+            self.delete(id, key)
+
+        for key in data:
+            self.set(id, key, data[key])
+
     def set(self, id, key, content):
         """
         Set the given content to a session key.
@@ -3,14 +3,19 @@
 :Status: Testing
 """
 
-from tori.session.entity.document import Document
+from datetime import datetime
+
+from pymongo.errors import OperationFailure
+
 from tori.session.repository.base import Base
 
 class Collection(Base):
     """
     Session Controller using MongoDB
 
-    :param `collection`: :class:`tori.db.odm.collection.Repository`
+    :param `collection`: the repository of :class:`tori.session.entity.document.Document`
+                         (:class:`tori.db.repository.Repository`)
+    :param `ttl`:        the lifespan of the session since the last change in seconds (unlimited if ``None``)
 
     .. note::
 
@@ -18,42 +23,85 @@ class Collection(Base):
         non-implementing methods in the parent class are implemented. This is
         only compatible with :class:`tori.session.entity.document.Document`.
 
+    Each session data is a document identified by the session ID and the key with the unique compound index. Each
+    write is done with a single upsert without going through the unit of work. With ``ttl``, the expired sessions are
+    removed by MongoDB with the TTL index on ``updated_at`` and each change extends the lifespan of the whole session.
+
+    .. note::
+
+        With ``ttl``, each change costs one more write (a multi-document update of the rest of the session) so that
+        the other data of the session is not expired before the changed one. Without ``ttl``, it is one upsert.
+
+    If ``ttl`` is changed, the lifespan of the existing TTL index is updated with ``collMod`` once MongoDB reports the
+    conflict (2.6+). The earlier versions silently keep the existing index, which then has to be updated manually.
     """
 
-    def __init__(self, collection):
+    def __init__(self, collection, ttl=None):
         Base.__init__(self)
 
         self.collection = collection
+        self.ttl        = int(ttl) if ttl else None
+
+        self.collection.api.ensure_index([('session_id', 1), ('key', 1)], unique=True)
+
+        if self.ttl:
+            self.__ensure_ttl_index()
 
-    def __get(self, id, key):
-        return self.collection.filter_one(session_id=id, key=key)
+    def __ensure_ttl_index(self):
+        api = self.collection.api
+
+        try:
+            api.ensure_index('updated_at', expireAfterSeconds=self.ttl)
+        except OperationFailure:
+            # The index exists with another lifespan.
+            api.database.command(
+                'collMod',
+                api.name,
+                index={'keyPattern': {'updated_at': 1}, 'expireAfterSeconds': self.ttl}
+            )
 
     def delete(self, id, key):
-        self.collection.delete_by_criteria(session_id=id, key=key)
+        self.collection.api.remove({'session_id': id, 'key': key})
 
     def get(self, id, key):
-        data = self.__get(session_id=id, key=key)
+        data = self.collection.api.find_one({'session_id': id, 'key': key}, ['content'])
 
-        return data and data.content or None
+        return data['content'] if data else None
 
-    def registered(self, id):
-        data = self.collection.filter_one(session_id=id)
+    def load(self, id):
+        data_list = list(self.collection.api.find({'session_id': id}, ['key', 'content']))
 
-        return len(data) > 0
+        return dict([(data['key'], data['content']) for data in data_list])
 
-    def reset(self, id):
-        self.collection.delete_by_criteria(session_id=id)
+    def registered(self, id):
+        return self.collection.api.find_one({'session_id': id}, ['_id']) is not None
 
-    def set(self, id, key, content):
-        data = self.__get(id, key)
+    def reset(self, id):
+        self.collection.api.remove({'session_id': id})
 
-        if not data:
-            data = Document(id, key, content)
+    def save(self, id, data, deleted_keys=[]):
+        updated_at = datetime.utcnow()
 
-            self.collection.post(data)
+        if deleted_keys:
+            self.collection.api.remove({'session_id': id, 'key': {'$in': list(deleted_keys)}})
 
-            return
+        for key in data:
+            self.__upsert(id, key, data[key], updated_at)
 
-        data.content = content
+        # Extend the lifespan of the rest of the session. The upserted data is already up to date.
+        if self.ttl:
+            self.collection.api.update(
+                {'session_id': id, 'key': {'$nin': list(data)}},
+                {'$set': {'updated_at': updated_at}},
+                multi=True
+            )
 
-        self.collection.put(data)
\ No newline at end of file
+    def set(self, id, key, content):
+        self.save(id, {key: content})
+
+    def __upsert(self, id, key, content, updated_at):
+        self.collection.api.update(
+            {'session_id': id, 'key': key},
+            {'$set': {'content': content, 'updated_at': updated_at}},
+            upsert=True
+        )
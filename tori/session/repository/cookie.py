@@ -0,0 +1,213 @@
+"""
+:Author: Juti Noppornpitak
+:Status: Testing
+"""
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    Fernet = None
+
+from tori.common                  import get_logger
+from tori.exception               import *
+from tori.session.codec           import Serializer
+from tori.session.repository.base import Base
+
+class Cookie(Base):
+    """
+    Session Repository keeping the data in a signed cookie
+
+    :param `cookie_name`:    the name of the cookie
+    :param `max_size`:       the maximum size of the cookie value in bytes
+    :param `fallback`:       the repository used when the data exceeds ``max_size`` (optional)
+    :param `serializer`:     the serializer of the session data (by default, :class:`tori.session.codec.Serializer`).
+                            Never enable ``legacy_pickle`` as the data comes from the client.
+    :param `encryption_key`: the key to encrypt the data with Fernet (PIP: cryptography) (optional)
+    :param `max_age_days`:   the lifespan of the cookie in days
+
+    The data is kept by the browser and signed with the setting ``cookie_secret`` so that no server-side storage is
+    involved unless the data is too large. In that case, the data is kept in the fallback repository and the cookie
+    only refers to it. Without the fallback, :class:`tori.exception.SessionError` is raised.
+
+    .. note::
+
+        The repository is bound to each request by :class:`tori.controller.Controller` (see :meth:`bind`). As the
+        cookie is sent with the headers, the session must be changed before the output is flushed (e.g., by
+        :meth:`tori.controller.Controller.render_stream`).
+
+    .. warning::
+
+        Without ``encryption_key``, the data is signed but readable by the client.
+    """
+
+    def __init__(self, cookie_name='session', max_size=3800, fallback=None, serializer=None, encryption_key=None,
+                 max_age_days=31):
+        Base.__init__(self)
+
+        if encryption_key and not Fernet:
+            raise SessionError('The encryption requires cryptography (PIP: cryptography).')
+
+        self.cookie_name  = cookie_name
+        self.max_size     = max_size
+        self.fallback     = fallback
+        self.serializer   = serializer or Serializer()
+        self.encryption   = Fernet(encryption_key) if encryption_key else None
+        self.max_age_days = max_age_days
+
+    def bind(self, handler):
+        return BoundCookie(self, handler)
+
+    def delete(self, id, key):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def get(self, id, key):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def load(self, id):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def registered(self, id):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def reset(self, id):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def save(self, id, data, deleted_keys=[]):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def set(self, id, key, content):
+        raise SessionError('The cookie session repository must be bound to a request handler.')
+
+    def encode(self, data):
+        """
+        Encode the session data for the cookie.
+
+        :param data: the session data or ``None`` to refer to the fallback repository
+        :rtype: bytes
+        """
+        payload = self.serializer.encode(data)
+
+        return self.encryption.encrypt(payload) if self.encryption else payload
+
+    def decode(self, payload):
+        """
+        Decode the cookie.
+
+        :param payload: the value of the cookie
+        :type  payload: bytes
+        :return: the session data or ``None`` if the data is kept in the fallback repository
+        """
+        if self.encryption:
+            payload = self.encryption.decrypt(payload)
+
+        return self.serializer.decode(payload)
+
+class BoundCookie(Base):
+    """
+    Cookie Session Repository bound to a request handler
+
+    :param `repository`: the cookie session repository
+    :param `handler`:    the request handler
+
+    .. note:: This is made by :meth:`Cookie.bind`.
+    """
+
+    _logger = get_logger('{}.BoundCookie'.format(__name__))
+
+    def __init__(self, repository, handler):
+        Base.__init__(self)
+
+        self._repository  = repository
+        self._handler     = handler
+        self._data        = None
+        self._in_fallback = False
+
+    def _load(self, id):
+        if self._data is not None:
+            return self._data
+
+        repository = self._repository
+        payload    = self._handler.get_secure_cookie(repository.cookie_name, max_age_days=repository.max_age_days)
+        self._data = {}
+
+        if not payload:
+            return self._data
+
+        try:
+            data = repository.decode(payload)
+        except Exception as exception:
+            # The session is discarded if the cookie is made with another key or codec.
+            self._logger.warning('Unable to decode the session cookie ({}).'.format(exception))
+
+            return self._data
+
+        if data is None and repository.fallback:
+            self._data        = repository.fallback.load(id)
+            self._in_fallback = True
+        elif isinstance(data, dict):
+            self._data = data
+
+        return self._data
+
+    def _store(self, id, data):
+        repository = self._repository
+
+        if getattr(self._handler, '_headers_written', False):
+            raise SessionError('The session cookie cannot be updated after the headers are sent.')
+
+        data    = dict([(key, data[key]) for key in data])
+        payload = repository.encode(data)
+
+        # The size after the Base64 encoding done by the secure cookie
+        if (len(payload) + 2) // 3 * 4 > repository.max_size:
+            if not repository.fallback:
+                raise SessionError('The session data exceeds the cookie limit ({} bytes).'.format(repository.max_size))
+
+            repository.fallback.reset(id)
+            repository.fallback.save(id, data)
+
+            self._in_fallback = True
+
+            payload = repository.encode(None)
+        elif self._in_fallback:
+            repository.fallback.reset(id)
+
+            self._in_fallback = False
+
+        self._handler.set_secure_cookie(repository.cookie_name, payload, expires_days=repository.max_age_days)
+
+    def delete(self, id, key):
+        self.save(id, {}, [key])
+
+    def get(self, id, key):
+        return self._load(id).get(key)
+
+    def load(self, id):
+        data = self._load(id)
+
+        return dict([(key, data[key]) for key in data])
+
+    def registered(self, id):
+        return bool(self._load(id))
+
+    def reset(self, id):
+        if self._in_fallback:
+            self._repository.fallback.reset(id)
+
+        self._data        = {}
+        self._in_fallback = False
+
+        self._handler.clear_cookie(self._repository.cookie_name)
+
+    def save(self, id, data, deleted_keys=[]):
+        current = self._load(id)
+
+        for key in deleted_keys:
+            current.pop(key, None)
+
+        current.update(data)
+
+        self._store(id, current)
+
+    def set(self, id, key, content):
+        self.save(id, {key: content})
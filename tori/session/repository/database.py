@@ -1,79 +1,259 @@
 """
 :Author: Juti Noppornpitak
-:Status: Testing/Unstable
+:Status: Testing
 """
 
+from datetime import datetime, timedelta
+
+from sqlalchemy     import text
+from tornado.ioloop import PeriodicCallback
+
+try:
+    from sqlalchemy import inspect
+except ImportError: # SQLAlchemy 0.7
+    from sqlalchemy.engine.reflection import Inspector
+
+    inspect = Inspector.from_engine
+
+from tori.session.codec           import LazyData, Serializer
 from tori.session.entity.database import Database as Entity
 from tori.session.repository.base import Base
 
 class Database(Base):
     """
-    Session Controller using SQLAlchemy's ORM
+    Session Controller using SQLAlchemy
 
-    :param `url`: SQLAlchemy-compatible connection URL
+    :param `db`:             the relational database service (:class:`tori.db.wrapper.Repository`)
+    :param `serializer`:     the serializer of the session data (by default, :class:`tori.session.codec.Serializer`)
+    :param `ttl`:            the lifespan of the session since the last change in seconds (unlimited if ``None``)
+    :param `sweep_interval`: the interval to remove the expired sessions in seconds (disabled if ``None``)
 
     .. note::
 
-        This is based on :class:`AbstractSession`. All non-implementing methods
-        in the parent class are implemented. This is only compatible with
-        :class:`DbEntity`.
+        This is based on :class:`tori.session.repository.base.Base`. All
+        non-implementing methods in the parent class are implemented. This is
+        only compatible with :class:`tori.session.entity.database.Database`.
+
+    Each operation is a single statement run on a pooled connection of the engine (without the ORM session).
+    The write is an upsert with ``INSERT ... ON CONFLICT`` (SQLite 3.24+ and PostgreSQL 9.5+) or
+    ``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL). Other databases fall back to ``UPDATE`` and then ``INSERT``.
+
+    With ``ttl``, the expired sessions are ignored and removed by :meth:`sweep`, which is scheduled on the I/O loop
+    if ``sweep_interval`` is given. Each change also extends the lifespan of the whole session.
 
+    The table made by the previous versions (without ``updated_at`` and the unique index on the session ID and the
+    key) is migrated on the first use (see :meth:`migrate`).
     """
 
-    def __init__(self, db):
+    def __init__(self, db, serializer=None, ttl=None, sweep_interval=None):
         Base.__init__(self)
 
-        self.db = db
+        self.db         = db
+        self.serializer = serializer or Serializer()
+        self.ttl        = int(ttl) if ttl else None
 
-    def base_filter(self, id):
-        return self.db.\
-            query(Entity).\
-            filter(Entity.session_id==id)
+        self._table      = Entity.__table__
+        self._statements = None
+        self._sweeper    = None
 
-    def commit(self):
-        self.db.session.commit()
+        if self.ttl and sweep_interval:
+            self._sweeper = PeriodicCallback(self.sweep, sweep_interval * 1000)
+            self._sweeper.start()
 
-    def delete(self, id, key):
-        data = self.base_filter(id).\
-            filter(Entity.key==key).\
-            first()
+    def _prepare(self):
+        """ Create the table if necessary and compose the statements for the dialect. """
+        if self._statements:
+            return self._statements
 
-        if not data:
-            return
+        engine = self.db.engine
+
+        self._table.create(engine, checkfirst=True)
+        self.migrate()
+
+        quote   = engine.dialect.identifier_preparer.quote
+        names   = {
+            'table':      quote(self._table.name),
+            'session_id': quote('_session_id'),
+            'key':        quote('key'),
+            'content':    quote('content'),
+            'updated_at': quote('updated_at')
+        }
+        session = '{session_id} = :session_id'
+        expiry  = ' AND {updated_at} >= :expired_at' if self.ttl else ''
+
+        statements = {
+            'select':       'SELECT {key}, {content} FROM {table} WHERE ' + session + expiry,
+            'select_key':   'SELECT {content} FROM {table} WHERE ' + session + ' AND {key} = :key' + expiry,
+            'delete':       'DELETE FROM {table} WHERE ' + session,
+            'delete_keys':  'DELETE FROM {table} WHERE ' + session + ' AND {key} IN ({keys})',
+            'delete_since': 'DELETE FROM {table} WHERE {updated_at} < :expired_at',
+            'touch':        'UPDATE {table} SET {updated_at} = :updated_at WHERE ' + session,
+            'update':       'UPDATE {table} SET {content} = :content, {updated_at} = :updated_at WHERE '
+                            + session + ' AND {key} = :key',
+            'insert':       'INSERT INTO {table} ({session_id}, {key}, {content}, {updated_at})'
+                            ' VALUES (:session_id, :key, :content, :updated_at)'
+        }
+
+        dialect = engine.dialect.name
+        version = engine.dialect.server_version_info or ()
+
+        if dialect == 'postgresql' and version >= (9, 5) or dialect == 'sqlite' and version >= (3, 24):
+            statements['upsert'] = statements['insert']\
+                + ' ON CONFLICT ({session_id}, {key})'\
+                + ' DO UPDATE SET {content} = excluded.{content}, {updated_at} = excluded.{updated_at}'
+        elif dialect == 'mysql':
+            statements['upsert'] = statements['insert']\
+                + ' ON DUPLICATE KEY UPDATE {content} = VALUES({content}), {updated_at} = VALUES({updated_at})'
+
+        # The placeholders of the deleted keys are composed on execution.
+        self._statements = dict([
+            (name, statements[name].format(keys='{keys}', **names))
+            for name in statements
+        ])
+
+        return self._statements
+
+    def migrate(self):
+        """ Migrate the table made by the previous versions
+
+        The missing column ``updated_at`` is added (the existing data is considered updated now) and the missing
+        indexes are created. The duplicate data of the same key is removed except the latest one before the unique
+        index is created.
+        """
+        engine    = self.db.engine
+        inspector = inspect(engine)
+        table     = self._table
+        quote     = engine.dialect.identifier_preparer.quote
+        columns   = [column['name'] for column in inspector.get_columns(table.name)]
+        indexes   = [index['name'] for index in inspector.get_indexes(table.name)]
+
+        with engine.begin() as connection:
+            if 'updated_at' not in columns:
+                connection.execute(text('ALTER TABLE {} ADD COLUMN {} {}'.format(
+                    quote(table.name),
+                    quote('updated_at'),
+                    table.c.updated_at.type.compile(dialect=engine.dialect)
+                )))
+                connection.execute(
+                    text('UPDATE {} SET {} = :updated_at'.format(quote(table.name), quote('updated_at'))),
+                    {'updated_at': datetime.utcnow()}
+                )
+
+            for index in table.indexes:
+                if index.name in indexes:
+                    continue
+
+                if index.unique:
+                    # The derived table is required by MySQL to select from the table being changed.
+                    connection.execute(text(
+                        'DELETE FROM {table} WHERE {id} NOT IN ('
+                        'SELECT {id} FROM (SELECT MAX({id}) AS {id} FROM {table} GROUP BY {session_id}, {key}) latest'
+                        ')'.format(table=quote(table.name), id=quote('id'), session_id=quote('_session_id'),
+                                   key=quote('key'))
+                    ))
+
+                index.create(connection)
+
+    def _parameters(self, id, **parameters):
+        parameters['session_id'] = id
 
-        self.session.delete(data)
-        self.commit()
+        if self.ttl:
+            parameters['expired_at'] = datetime.utcnow() - timedelta(seconds=self.ttl)
+
+        return parameters
+
+    def delete(self, id, key):
+        self.save(id, {}, [key])
 
     def get(self, id, key):
-        data = self.base_filter(id).\
-            filter(Entity.key==key).\
-            first()
+        statements = self._prepare()
+
+        with self.db.engine.begin() as connection:
+            row = connection.execute(text(statements['select_key']), self._parameters(id, key=key)).first()
+
+        if row is None or row[0] is None:
+            return None
+
+        return self.serializer.decode(row[0])
 
-        return data and data.content or None
+    def load(self, id):
+        statements = self._prepare()
+
+        with self.db.engine.begin() as connection:
+            rows = connection.execute(text(statements['select']), self._parameters(id)).fetchall()
+
+        return LazyData(dict([(row[0], row[1]) for row in rows]), self.serializer)
 
     def registered(self, id):
-        data = self.base_filter(id).all()
+        statements = self._prepare()
 
-        return len(data) > 0
+        with self.db.engine.begin() as connection:
+            return connection.execute(text(statements['select']), self._parameters(id)).first() is not None
 
     def reset(self, id):
-        data_list = self.base_filter(id).all()
+        statements = self._prepare()
+
+        with self.db.engine.begin() as connection:
+            connection.execute(text(statements['delete']), {'session_id': id})
+
+    def save(self, id, data, deleted_keys=[]):
+        statements = self._prepare()
+        updated_at = datetime.utcnow()
+
+        # Save all changes in one transaction.
+        with self.db.engine.begin() as connection:
+            if deleted_keys:
+                parameters = {'session_id': id}
 
-        for data in data_list:
-            self.session.delete(data)
+                for index, key in enumerate(deleted_keys):
+                    parameters['key_{}'.format(index)] = key
 
-        self.commit()
+                placeholders = ', '.join([':key_{}'.format(index) for index in range(len(deleted_keys))])
+
+                connection.execute(text(statements['delete_keys'].format(keys=placeholders)), parameters)
+
+            if data:
+                self._upsert(connection, [
+                    {'session_id': id, 'key': key, 'content': self.serializer.encode(data[key]), 'updated_at': updated_at}
+                    for key in data
+                ])
+
+            # Extend the lifespan of the rest of the session.
+            if self.ttl:
+                connection.execute(text(statements['touch']), {'session_id': id, 'updated_at': updated_at})
 
     def set(self, id, key, content):
-        data = self.base_filter(id).\
-            filter(Entity.key==key).\
-            first()
+        self.save(id, {key: content})
+
+    def sweep(self):
+        """ Remove the expired sessions
+
+            :return: the number of the removed session data
+            :rtype: int
+        """
+        if not self.ttl:
+            return 0
+
+        statements = self._prepare()
 
-        if not data:
-            data = Entity(id, key, content)
+        with self.db.engine.begin() as connection:
+            result = connection.execute(
+                text(statements['delete_since']),
+                {'expired_at': datetime.utcnow() - timedelta(seconds=self.ttl)}
+            )
+
+        return result.rowcount
+
+    def _upsert(self, connection, parameters_list):
+        statements = self._statements
+
+        if 'upsert' in statements:
+            connection.execute(text(statements['upsert']), parameters_list)
+
+            return
 
-            self.session.add(data)
-        else:
-            data.content = content
+        for parameters in parameters_list:
+            if connection.execute(text(statements['update']), parameters).rowcount:
+                continue
 
-        self.commit()
\ No newline at end of file
+            connection.execute(text(statements['insert']), parameters)
@@ -1,34 +1,196 @@
+import sys
+
+from collections import OrderedDict
+from threading   import RLock
+from time        import time
+
+from tornado.ioloop import PeriodicCallback
+
 from tori.session.repository.base import Base
 
 class Memory(Base):
-    """ In-memory Session AbstractRepository """
+    """ In-memory Session AbstractRepository
+
+        :param idle_ttl: the lifespan of the session since the last access in seconds (unlimited if ``None``)
+        :type  idle_ttl: int
+        :param absolute_ttl: the lifespan of the session since the creation in seconds (unlimited if ``None``)
+        :type  absolute_ttl: int
+        :param max_count: the maximum number of the sessions (unlimited if ``None``)
+        :type  max_count: int
+        :param max_size: the maximum total size of the sessions in bytes (unlimited if ``None``)
+        :type  max_size: int
+        :param sweep_interval: the interval to remove the expired sessions in seconds (disabled if ``None``)
+        :type  sweep_interval: int
+
+        When the limits are exceeded, the least recently used sessions are removed. The size of a session is
+        estimated with :func:`sys.getsizeof` of its keys and data.
+
+        The expired sessions are removed on access and by :meth:`sweep`, which is scheduled on the I/O loop when
+        either TTL is given.
+    """
 
-    def __init__(self):
-        self._storage = {}
+    def __init__(self, idle_ttl=None, absolute_ttl=None, max_count=None, max_size=None, sweep_interval=60):
+        Base.__init__(self)
+
+        self._idle_ttl     = idle_ttl
+        self._absolute_ttl = absolute_ttl
+        self._max_count    = max_count
+        self._max_size     = max_size
+        self._size         = 0
+        self._storage      = OrderedDict() # id => data from the least recently used
+        self._metadata     = {}            # id => [creation time, access time, size]
+        self._lock         = RLock()
+        self._expirations  = 0
+        self._evictions    = 0
+        self._sweeper      = None
+
+        if sweep_interval and (idle_ttl or absolute_ttl):
+            self._sweeper = PeriodicCallback(self.sweep, sweep_interval * 1000)
+            self._sweeper.start()
+
+    @property
+    def statistics(self):
+        """ Statistics of the repository
+
+            :rtype: dict
+        """
+        return {
+            'count':       len(self._storage),
+            'size':        self._size,
+            'expirations': self._expirations,
+            'evictions':   self._evictions
+        }
 
     def delete(self, id, key):
-        if not self.has(id, key):
-            return
+        with self._lock:
+            if not self.has(id, key):
+                return
+
+            del self._storage[id][key]
 
-        del self._storage[id][key]
+            self._resize(id)
 
     def get(self, id, key, auto_close=True):
-        if not self.has(id, key):
-            return None
+        with self._lock:
+            if not self.has(id, key):
+                return None
+
+            self._touch(id)
 
-        return self._storage[id][key]
+            return self._storage[id][key]
 
     def has(self, id, key):
-        return id in self._storage and key in self._storage[id]
+        return self.registered(id) and key in self._storage[id]
+
+    def load(self, id):
+        with self._lock:
+            if not self.registered(id):
+                return {}
+
+            self._touch(id)
+
+            return dict(self._storage[id])
 
     def registered(self, id):
-        return id in self._storage
+        with self._lock:
+            if id not in self._storage:
+                return False
+
+            if self._is_expired(id, time()):
+                self._remove(id)
+
+                self._expirations += 1
+
+                return False
+
+            return True
 
     def reset(self, id):
-        del self._storage[id]
+        with self._lock:
+            if id in self._storage:
+                self._remove(id)
+
+    def save(self, id, data, deleted_keys=[]):
+        with self._lock:
+            storage = self._open(id)
+
+            for key in deleted_keys:
+                storage.pop(key, None)
+
+            storage.update(data)
+
+            self._resize(id)
 
     def set(self, id, key, content):
+        with self._lock:
+            self._open(id)[key] = content
+
+            self._resize(id)
+
+    def sweep(self):
+        """ Remove the expired sessions
+
+            :return: the number of the removed sessions
+            :rtype: int
+        """
+        now   = time()
+        count = 0
+
+        with self._lock:
+            for id in list(self._storage.keys()):
+                if not self._is_expired(id, now):
+                    continue
+
+                self._remove(id)
+
+                count += 1
+
+            self._expirations += count
+
+        return count
+
+    def _is_expired(self, id, now):
+        created_at, accessed_at, size = self._metadata[id]
+
+        return (self._idle_ttl and accessed_at + self._idle_ttl <= now)\
+            or (self._absolute_ttl and created_at + self._absolute_ttl <= now)
+
+    def _open(self, id):
+        """ Retrieve the data of the session (created if necessary) and mark it as the most recently used. """
         if not self.registered(id):
-            self._storage[id] = {}
+            now = time()
+
+            self._storage[id]  = {}
+            self._metadata[id] = [now, now, 0]
+
+            return self._storage[id]
+
+        self._touch(id)
+
+        return self._storage[id]
+
+    def _touch(self, id):
+        self._metadata[id][1] = time()
+
+        # Mark the session as the most recently used.
+        self._storage[id] = self._storage.pop(id)
+
+    def _resize(self, id):
+        data = self._storage[id]
+        size = sum([sys.getsizeof(key) + sys.getsizeof(data[key]) for key in data])
+
+        self._size            += size - self._metadata[id][2]
+        self._metadata[id][2]  = size
+
+        while self._storage and (
+            (self._max_size is not None and self._size > self._max_size)
+            or (self._max_count is not None and len(self._storage) > self._max_count)
+        ):
+            self._remove(next(iter(self._storage)))
+
+            self._evictions += 1
+
+    def _remove(self, id):
+        del self._storage[id]
 
-        self._storage[id][key] = content
\ No newline at end of file
+        self._size -= self._metadata.pop(id)[2]
@@ -1,20 +1,39 @@
-try:
-    import cPickle as pickle
-except:
-    import pickle
-
 import redis
-from time import time
 
 from tori.exception               import *
+from tori.session.codec           import LazyData, Serializer
 from tori.session.repository.base import Base
 
+# The mapping of HSET is supported since redis-py 3.5 (Redis 4.0) where HMSET is deprecated.
+_hset_with_mapping = tuple([int(part) for part in redis.__version__.split('.')[:2]]) >= (3, 5)
+
 class Redis(Base):
-    def __init__(self, prefix='tori/session', redis_client=None, use_localhost_as_fallback=True):
+    """ Redis Session Repository
+
+        :param prefix: the prefix of the keys
+        :type  prefix: str
+        :param redis_client: the Redis client (PIP: redis)
+        :type  redis_client: redis.Redis
+        :param use_localhost_as_fallback: the flag to connect to the local server if the client is not given
+        :type  use_localhost_as_fallback: bool
+        :param ttl: the idle lifespan of the session in seconds (unlimited if ``None``)
+        :type  ttl: int
+        :param serializer: the serializer of the session data (by default, :class:`tori.session.codec.Serializer`)
+        :type  serializer: tori.session.codec.Serializer
+
+        Each session is stored as a single hash (``prefix/id``) whose fields are the session data keys. Each
+        operation is done in one round trip, including the refresh of the lifespan of the session. :meth:`load` and
+        :meth:`save` read and write the whole session at once. The data loaded by :meth:`load` is decoded on the
+        first access to each key.
+    """
+    def __init__(self, prefix='tori/session', redis_client=None, use_localhost_as_fallback=True, ttl=None, serializer=None):
         Base.__init__(self)
 
-        self._redis = redis_client
+        self._redis  = redis_client
         self._prefix = prefix
+        self._ttl    = int(ttl) if ttl else None
+
+        self._serializer = serializer or Serializer()
 
         self._use_localhost_as_fallback = use_localhost_as_fallback
 
@@ -28,32 +47,77 @@ class Redis(Base):
 
         return self._redis
 
-    def __compose_key(self, id, key):
-        return '/'.join([self._prefix, id, key])
+    def __compose_key(self, id):
+        return '/'.join([self._prefix, id])
+
+    def __execute(self, pipeline, actual_key):
+        """ Execute the pipeline and refresh the lifespan of the session in the same round trip. """
+        if self._ttl:
+            pipeline.expire(actual_key, self._ttl)
+
+        return pipeline.execute()
 
     def delete(self, id, key):
-        actual_key = self.__compose_key(id, key)
+        actual_key = self.__compose_key(id)
+        pipeline   = self.__api.pipeline(transaction=False)
 
-        self.__api.delete(actual_key)
+        pipeline.hdel(actual_key, key)
+
+        self.__execute(pipeline, actual_key)
 
     def get(self, id, key):
-        actual_key = self.__compose_key(id, key)
-        content    = self.__api.get(actual_key)
+        actual_key = self.__compose_key(id)
+        pipeline   = self.__api.pipeline(transaction=False)
 
-        if content:
-            content = pickle.loads(content)
+        pipeline.hget(actual_key, key)
 
-        return content
+        content = self.__execute(pipeline, actual_key)[0]
 
-    def registered(self, id):
-        actual_key = self.__compose_key(id, '*')
+        if content is None:
+            return None
+
+        return self._serializer.decode(content)
+
+    def load(self, id):
+        actual_key = self.__compose_key(id)
+        pipeline   = self.__api.pipeline(transaction=False)
+
+        pipeline.hgetall(actual_key)
 
-        return self.__api.keys(actual_key)
+        data = self.__execute(pipeline, actual_key)[0] or {}
+
+        return LazyData(
+            dict([(key.decode('utf-8') if isinstance(key, bytes) else key, data[key]) for key in data]),
+            self._serializer
+        )
+
+    def registered(self, id):
+        return bool(self.__api.exists(self.__compose_key(id)))
 
     def reset(self, id):
-        self.delete(id, '*')
+        self.__api.delete(self.__compose_key(id))
+
+    def save(self, id, data, deleted_keys=[]):
+        actual_key = self.__compose_key(id)
+        pipeline   = self.__api.pipeline()
+
+        if deleted_keys:
+            pipeline.hdel(actual_key, *deleted_keys)
+
+        if data:
+            mapping = dict([(key, self._serializer.encode(data[key])) for key in data])
+
+            if _hset_with_mapping:
+                pipeline.hset(actual_key, mapping=mapping)
+            else:
+                pipeline.hmset(actual_key, mapping)
+
+        self.__execute(pipeline, actual_key)
 
     def set(self, id, key, content):
-        actual_key = self.__compose_key(id, key)
+        actual_key = self.__compose_key(id)
+        pipeline   = self.__api.pipeline(transaction=False)
+
+        pipeline.hset(actual_key, key, self._serializer.encode(content))
 
-        self.__api.set(actual_key, pickle.dumps(content))
\ No newline at end of file
+        self.__execute(pipeline, actual_key)
@@ -48,6 +48,10 @@ class WebSocket(BaseWebSocket):
         """ Session Controller
 
         :rtype: tori.session.controller.Controller
+
+        The session repository is bound to the handler as done by :class:`tori.controller.Controller`. As the cookies
+        are only exchanged with the handshake, the session kept by :class:`tori.session.repository.cookie.Cookie` can
+        be read but not changed through the socket.
         """
         if not self.component('session'):
             return None
@@ -69,7 +73,8 @@ class WebSocket(BaseWebSocket):
             else:
                 self.set_cookie(cookie_key, ssid)
 
-        self._session = SessionController(self.component('session'), ssid)
+        # The connection may live long. Hence, the changes are saved immediately.
+        self._session = SessionController(self.component('session').bind(self), ssid, False)
 
         return self._session
 
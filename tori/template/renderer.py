@@ -6,12 +6,15 @@
 This package is used for rendering.
 """
 
-from os import path
+from os import path, makedirs
 import re
 
-from jinja2         import Environment, FileSystemLoader, PackageLoader
-from tori.centre    import settings as AppSettings
-from tori.exception import *
+from jinja2           import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, PackageLoader
+from jinja2           import TemplateError
+from tori.centre      import settings as AppSettings
+from tori.common      import get_logger
+from tori.data.bundle import AssetManifest
+from tori.exception   import *
 
 from tori.template.repository import Repository
 
@@ -44,6 +47,25 @@ class Renderer(object):
         """
         raise FutureFeatureException("Need to implement.")
 
+    def stream(self, template_path, **contexts):
+        """
+        Render a template with context variables progressively.
+
+        :param template_path: a path to the template
+        :type template_path: string or unicode
+        :param contexts: a dictionary of context variables.
+        :return: the generator of the chunks of the output
+        :rtype: generator
+
+        Example::
+
+            for chunk in renderer.stream('dummy.html', appname='ikayaki', version=1.0):
+                handler.write(chunk)
+                handler.flush()
+
+        """
+        raise FutureFeatureException("Need to implement.")
+
 class DefaultRenderer(Renderer):
     """
     The default renderer with Jinja2
@@ -52,6 +74,9 @@ class DefaultRenderer(Renderer):
                         or multiple base paths of Jinja templates based on the
                         current working directory.
 
+    The manifest of the asset bundles (:class:`tori.data.bundle.AssetManifest`) is available to the templates as
+    ``assets`` and its method ``get`` as ``asset_url``.
+
     For example::
 
         # Instantiate with the module path.
@@ -60,7 +85,18 @@ class DefaultRenderer(Renderer):
         # Instantiate with multiple base paths of Jinja templates.
         renderer = DefaultRenderer('/opt/app/ui/template', '/usr/local/tori/module/template')
 
+    The compilation of the templates is configurable with the following settings.
+
+    =========================== ================================================================================
+    Setting                     Description
+    =========================== ================================================================================
+    ``template_bytecode_cache`` the directory to keep the compiled templates across restarts (or an instance of
+                                :class:`jinja2.BytecodeCache`, e.g., :class:`jinja2.MemcachedBytecodeCache`)
+    ``template_cache_size``     the number of the compiled templates kept in the memory (``-1`` for unlimited)
+    ``template_precompile``     the flag to compile all templates on instantiation (see :meth:`precompile`)
+    =========================== ================================================================================
     """
+    _logger = get_logger('{}.DefaultRenderer'.format(__name__))
 
     def __init__(self, *referers):
         if len(referers) == 0:
@@ -74,11 +110,60 @@ class DefaultRenderer(Renderer):
             and self._get_package_loader() \
             or  self._get_filesystem_loader()
         self.storage  = Environment(
-            loader      = self.loader,
-            trim_blocks = not debug_mode,
-            auto_reload = debug_mode
+            loader         = self.loader,
+            trim_blocks    = not debug_mode,
+            auto_reload    = debug_mode,
+            cache_size     = int(AppSettings.get('template_cache_size', 50)),
+            bytecode_cache = self._get_bytecode_cache()
         )
 
+        # Let the templates refer to the fingerprinted assets.
+        self.storage.globals['assets']    = AssetManifest.instance()
+        self.storage.globals['asset_url'] = AssetManifest.instance().get
+
+        if str(AppSettings.get('template_precompile', False)).lower() == 'true':
+            self.precompile()
+
+    def _get_bytecode_cache(self):
+        """
+        Get the bytecode cache for the renderer.
+
+        :rtype: jinja2.BytecodeCache
+        """
+        bytecode_cache = AppSettings.get('template_bytecode_cache')
+
+        if not bytecode_cache or isinstance(bytecode_cache, BytecodeCache):
+            return bytecode_cache or None
+
+        if not path.exists(bytecode_cache):
+            makedirs(bytecode_cache)
+
+        return FileSystemBytecodeCache(bytecode_cache)
+
+    def precompile(self, extensions=None):
+        """
+        Compile all templates available to the loader.
+
+        The compiled templates are kept in the memory (up to the cache size) and in the bytecode cache so that the
+        first requests after a restart or a deployment do not have to compile the templates.
+
+        :param extensions: the list of the file extensions of the templates (e.g., ``['html']``, all files by default)
+        :type  extensions: list
+        :return: the number of the compiled templates
+        :rtype: int
+        """
+        count = 0
+
+        for template_path in self.storage.list_templates(extensions):
+            try:
+                self.storage.get_template(template_path)
+
+                count += 1
+            except TemplateError as exception:
+                self._logger.warning('Unable to compile {} ({})'.format(template_path, exception))
+
+        return count
+
     def _get_filesystem_loader(self):
         """
         Get the file-system loader for the renderer.
@@ -114,4 +199,13 @@ class DefaultRenderer(Renderer):
 
         template = self.storage.get_template(template_path)
 
-        return template.render(**contexts)
\ No newline at end of file
+        return template.render(**contexts)
+
+    def stream(self, template_path, **contexts):
+        """
+        See :meth:`Renderer.stream` for more information.
+        """
+
+        template = self.storage.get_template(template_path)
+
+        return template.generate(**contexts)
@@ -7,8 +7,10 @@
 This package contains the rendering service. This is a module automatically loaded by :class:`tori.application.Application`.
 """
 
+from threading import RLock
+
 from tori.exception           import *
-from tori.template.renderer   import Renderer
+from tori.template.renderer   import DefaultRenderer, Renderer
 from tori.template.repository import Repository
 
 class RenderingService(object):
@@ -24,6 +26,7 @@ class RenderingService(object):
 
     def __init__(self, renderer_class=Renderer, repository_class=Repository):
         self._repository = repository_class(renderer_class)
+        self._lock       = RLock()
 
     def register(self, renderer):
         """
@@ -37,6 +40,31 @@ class RenderingService(object):
 
         return self
 
+    def obtain(self, repository_name, renderer_class=None):
+        """ Retrieve the renderer by name or instantiate and register it if it is not yet registered
+
+        The renderer is only instantiated once even if the concurrent requests need it at the same time.
+
+        :param repository_name: the name of the repository (e.g., the template base path of a controller)
+        :type  repository_name: str
+        :param renderer_class: the class of the renderer (by default, :class:`tori.template.renderer.DefaultRenderer`)
+        :type  renderer_class: type
+        :rtype: tori.template.renderer.Renderer
+        """
+        if repository_name in self._repository:
+            return self._repository[repository_name]
+
+        with self._lock:
+            if repository_name not in self._repository:
+                renderer = (renderer_class or DefaultRenderer)(repository_name)
+
+                self.register(renderer)
+
+                # The name of a custom renderer may differ from the repository name.
+                self._repository[repository_name] = renderer
+
+        return self._repository[repository_name]
+
     def use(self, repository_name):
         """ Retrieve the renderer by name
 
@@ -55,3 +83,12 @@ class RenderingService(object):
         :rtype: string
         """
         return self.use(repository_name).render(template_path, **contexts)
+
+    def stream(self, repository_name, template_path, **contexts):
+        """ Render a template from a repository *repository_name* progressively.
+
+        See :meth:`tori.template.renderer.Renderer.stream` for more information.
+
+        :rtype: generator
+        """
+        return self.use(repository_name).stream(template_path, **contexts)